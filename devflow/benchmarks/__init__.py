@@ -0,0 +1,14 @@
+"""Performance benchmarks for DevFlow.
+
+Run from the ``devflow`` directory, e.g. ``python -m benchmarks.status``.
+The ``src`` layout is put on ``sys.path`` here so the benchmarks work
+without an editable install.
+"""
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
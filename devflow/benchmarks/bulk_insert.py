@@ -0,0 +1,89 @@
+"""Time-entry insert throughput: per-row create_time_entry vs. the batch API.
+
+Inserts chronological synthetic entries into an in-memory database,
+``--repeat`` times per variant, and fails if the best ``create_time_entries``
+run stays under the target rows/second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow.db import queries
+from devflow.db.connection import get_memory_connection
+from devflow.db.timestamps import from_epoch
+
+TARGET_ROWS_PER_SECOND = 100_000
+
+
+def _rows(conn, count: int) -> list[queries.NewTimeEntry]:
+    tasks = [queries.create_task(conn, p.id, "Bench") for p in queries.list_projects(conn)]
+    categories = queries.list_categories(conn)
+    start = datetime(2020, 1, 1, 8, 0, 0)
+    rows = []
+    for i in range(count):
+        begin = start + timedelta(minutes=20 * i)
+        end = begin + timedelta(minutes=15)
+        rows.append(queries.new_time_entry(
+            tasks[i % len(tasks)].id, categories[i % len(categories)].id, begin, end
+        ))
+    return rows
+
+
+def _rate(label: str, count: int, fn, repeat: int) -> float:
+    """Best of ``repeat`` runs, each into a fresh database."""
+    elapsed = float("inf")
+    for _ in range(repeat):
+        conn = get_memory_connection()
+        rows = _rows(conn, count)
+        t0 = time.perf_counter()
+        fn(conn, rows)
+        elapsed = min(elapsed, time.perf_counter() - t0)
+        assert queries.check_daily_rollups(conn) == []
+        conn.close()
+    rate = count / elapsed
+    print(f"{label:<40} {count:>9} rows  {elapsed:7.3f} s  {rate:>10,.0f} rows/s")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--single-rows", type=int, default=20_000)
+    parser.add_argument("--target", type=float, default=TARGET_ROWS_PER_SECOND)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    def single(conn, rows):
+        for task_id, category_id, start_ts, end_ts, _ in rows:
+            queries.create_time_entry(
+                conn, task_id, category_id, from_epoch(start_ts), from_epoch(end_ts)
+            )
+
+    _rate("create_time_entry (per row)", args.single_rows, single, args.repeat)
+    _rate(
+        "create_time_entries(return_entries=True)",
+        args.rows,
+        lambda conn, rows: queries.create_time_entries(conn, rows, return_entries=True),
+        args.repeat,
+    )
+    rate = _rate(
+        "create_time_entries",
+        args.rows,
+        lambda conn, rows: queries.create_time_entries(conn, rows),
+        args.repeat,
+    )
+
+    if rate < args.target:
+        print(f"FAIL: below target of {args.target:,.0f} rows/s")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
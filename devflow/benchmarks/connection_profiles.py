@@ -0,0 +1,132 @@
+"""Commit latency and reader concurrency for each connection profile.
+
+For every profile in ``devflow.db.connection.PROFILES`` (plus the old
+rollback-journal defaults as a baseline) this measures:
+
+* commit latency: one ``set_active_session``-style write + commit, repeated;
+* reader concurrency: a writer commits continuously while a reader runs the
+  ``--status`` query in a loop, counting completed reads and lock errors.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow.cli import print_status
+from devflow.db import queries
+from devflow.db.connection import PROFILES, ConnectionProfile, apply_profile, get_connection
+
+LEGACY = ConnectionProfile(
+    journal_mode="DELETE",
+    synchronous="FULL",
+    busy_timeout_ms=0,
+    cache_size=-2000,
+    mmap_size=0,
+    temp_store="DEFAULT",
+)
+
+
+def _open(path: Path, profile: ConnectionProfile) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), check_same_thread=False, timeout=0)
+    apply_profile(conn, profile)
+    return conn
+
+
+def _prepare(path: Path) -> tuple[int, int]:
+    conn = get_connection(path)
+    project = queries.list_projects(conn)[0]
+    task = queries.create_task(conn, project.id, "Bench")
+    category = queries.list_categories(conn)[0]
+    conn.close()
+    return task.id, category.id
+
+
+def _commit_latency(conn, task_id: int, category_id: int, count: int) -> list[float]:
+    samples = []
+    for i in range(count):
+        t0 = time.perf_counter()
+        conn.execute("DELETE FROM active_session")
+        conn.execute(
+            "INSERT INTO active_session (id, task_id, category_id, start_ts) "
+            "VALUES (1, ?, ?, ?)",
+            (task_id, category_id, 1705309200 + i % 60 * 60),
+        )
+        conn.commit()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _reader_concurrency(
+    path: Path, profile: ConnectionProfile, task_id: int, category_id: int, seconds: float
+) -> tuple[int, int, int]:
+    writer = _open(path, profile)
+    reader = _open(path, profile)
+    stop = threading.Event()
+    writes = 0
+
+    def write_loop() -> None:
+        nonlocal writes
+        while not stop.is_set():
+            try:
+                _commit_latency(writer, task_id, category_id, 1)
+                writes += 1
+            except sqlite3.OperationalError:
+                writer.rollback()
+
+    thread = threading.Thread(target=write_loop)
+    thread.start()
+    reads = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            print_status(reader)
+            reads += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    stop.set()
+    thread.join()
+    writer.close()
+    reader.close()
+    return reads, errors, writes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    profiles = {"legacy (rollback journal)": LEGACY, **PROFILES}
+    print(
+        f"{'profile':<26} {'commit p50 ms':>13} {'commit p95 ms':>13} "
+        f"{'reads/s':>9} {'read errors':>11} {'writes/s':>9}"
+    )
+    for name, profile in profiles.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "devflow.db"
+            task_id, category_id = _prepare(path)
+            conn = _open(path, profile)
+            samples = sorted(_commit_latency(conn, task_id, category_id, args.commits))
+            conn.close()
+            reads, errors, writes = _reader_concurrency(
+                path, profile, task_id, category_id, args.seconds
+            )
+        p50 = statistics.median(samples)
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(
+            f"{name:<26} {p50:>13.3f} {p95:>13.3f} "
+            f"{reads / args.seconds:>9.0f} {errors:>11} {writes / args.seconds:>9.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Daily report refresh latency: N+1 lookups vs. the joined detail query.
+
+Fills one day with 50, 500 and 5,000 entries and times the data work done
+by ``DailyReportScreen._refresh`` both the old way (list the entries, then
+``get_task`` / ``get_category`` / ``get_project`` per row) and with
+``list_time_entry_details_for_date``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow.db import queries
+from devflow.db.connection import get_memory_connection
+
+MIDNIGHT = datetime(2024, 1, 15)
+DATE = MIDNIGHT.date()
+
+
+def _fill(conn, count: int) -> None:
+    projects = queries.list_projects(conn)
+    categories = queries.list_categories(conn)
+    tasks = [queries.create_task(conn, p.id, f"Task {p.id}") for p in projects]
+    rows = []
+    for i in range(count):
+        start = MIDNIGHT + timedelta(seconds=i * 86400 // count)
+        task = tasks[i % len(tasks)]
+        category = categories[i % len(categories)]
+        rows.append(queries.new_time_entry(task.id, category.id, start, start))
+    queries.create_time_entries(conn, rows)
+
+
+def _n_plus_one(conn) -> int:
+    rows = 0
+    for e in queries.list_time_entries_for_date(conn, DATE):
+        task = queries.get_task(conn, e.task_id)
+        queries.get_category(conn, e.category_id)
+        if task:
+            queries.get_project(conn, task.project_id)
+        rows += 1
+    return rows
+
+
+def _joined(conn) -> int:
+    return len(queries.list_time_entry_details_for_date(conn, DATE))
+
+
+def _median_ms(fn, conn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(conn)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8}  {'N+1 (ms)':>10}  {'joined (ms)':>12}  {'speedup':>8}")
+    for size in args.sizes:
+        conn = get_memory_connection()
+        _fill(conn, size)
+        assert _n_plus_one(conn) == _joined(conn) == size
+        old = _median_ms(_n_plus_one, conn, args.repeat)
+        new = _median_ms(_joined, conn, args.repeat)
+        print(f"{size:>8}  {old:>10.2f}  {new:>12.2f}  {old / new:>7.1f}x")
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Database size and aggregate speed: text timestamps (v3) vs epoch seconds (v4).
+
+Generates ``--rows`` synthetic entries, writes them into a schema-v3
+database (text ``start``/``end`` plus ``duration_seconds``), measures it,
+then opens it with ``get_connection`` so the real v3 -> v4 migration runs,
+and measures again. Sizes are taken after ``VACUUM``. The queries are the
+aggregates the two layouts answer from raw ``time_entries``:
+
+* per-day totals over the whole history;
+* a month's total, range-scanned through ``idx_time_entries_start``;
+* the ``daily_rollups`` rebuild aggregate (``GROUP BY day, project, category``);
+* a week's entries materialized as Python datetimes, as the query layer
+  returns them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow.db import migrations
+from devflow.db.connection import get_connection, get_memory_connection
+from devflow.db.timestamps import day_key, from_epoch, to_epoch
+from devflow.synthetic import SyntheticConfig, generate_history
+
+END = date(2024, 6, 30)
+ENTRIES_PER_DAY = 20
+
+# Schema v1 as shipped; migrations 1 and 2 bring it to v3.
+_V1_SCHEMA = """
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, archived_at TEXT
+);
+CREATE TABLE projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, archived_at TEXT
+);
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    name TEXT NOT NULL,
+    archived_at TEXT
+);
+CREATE TABLE time_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL REFERENCES tasks(id),
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    duration_seconds INTEGER NOT NULL
+);
+CREATE TABLE active_session (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    task_id INTEGER NOT NULL REFERENCES tasks(id),
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    start_time TEXT NOT NULL
+);
+CREATE INDEX idx_time_entries_start ON time_entries(start);
+CREATE INDEX idx_time_entries_task_id ON time_entries(task_id);
+CREATE INDEX idx_time_entries_category_id ON time_entries(category_id);
+CREATE INDEX idx_tasks_project_id ON tasks(project_id);
+"""
+
+_MONTH = (datetime(2024, 5, 1), datetime(2024, 6, 1))
+_WEEK = (datetime(2024, 6, 24), datetime(2024, 7, 1))
+
+
+def _text(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _build_v3(path: Path, rows: int) -> int:
+    """Write ``rows`` synthetic entries into a schema-v3 database at ``path``."""
+    source = get_memory_connection()
+    generate_history(
+        source,
+        SyntheticConfig(
+            days=max(rows // ENTRIES_PER_DAY, 1),
+            end=END,
+            entries_per_day=ENTRIES_PER_DAY,
+            weekends=True,
+            midnight_ratio=0.0,
+        ),
+    )
+    conn = sqlite3.connect(str(path))
+    conn.executescript(_V1_SCHEMA)
+    for table, columns in (
+        ("categories", "id, name, archived_at"),
+        ("projects", "id, name, archived_at"),
+        ("tasks", "id, project_id, name, archived_at"),
+    ):
+        conn.executemany(
+            f"INSERT INTO {table} ({columns}) VALUES ({', '.join('?' * len(columns.split(',')))})",
+            source.execute(f"SELECT {columns} FROM {table}").fetchall(),
+        )
+    conn.executemany(
+        "INSERT INTO time_entries (id, task_id, category_id, start, end, duration_seconds) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (entry_id, task_id, category_id, _text(from_epoch(start)), _text(from_epoch(end)),
+             end - start)
+            for entry_id, task_id, category_id, start, end in source.execute(
+                "SELECT id, task_id, category_id, start_ts, end_ts FROM time_entries"
+            )
+        ),
+    )
+    source.close()
+    conn.commit()
+    conn.execute("BEGIN")
+    for migrate in migrations.MIGRATIONS[:2]:  # v1 -> v3
+        migrate(conn)
+    migrations.set_version(conn, 3)
+    conn.execute("COMMIT")
+    (count,) = conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()
+    conn.close()
+    return count
+
+
+def _size_mb(path: Path) -> float:
+    conn = sqlite3.connect(str(path))
+    conn.execute("VACUUM")
+    conn.close()
+    return os.path.getsize(path) / 1e6
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _text_cases(conn: sqlite3.Connection) -> dict[str, object]:
+    month = tuple(_text(m) for m in _MONTH)
+    week = tuple(_text(m) for m in _WEEK)
+    return {
+        "per-day totals": lambda: conn.execute(
+            "SELECT date(start), SUM(duration_seconds) FROM time_entries GROUP BY 1"
+        ).fetchall(),
+        "month total": lambda: conn.execute(
+            "SELECT SUM(duration_seconds) FROM time_entries WHERE start >= ? AND start < ?",
+            month,
+        ).fetchone(),
+        "rollup aggregate": lambda: conn.execute(
+            "SELECT date(te.start), t.project_id, te.category_id, "
+            "SUM(te.duration_seconds), COUNT(*) "
+            "FROM time_entries te JOIN tasks t ON te.task_id = t.id GROUP BY 1, 2, 3"
+        ).fetchall(),
+        "week as datetimes": lambda: [
+            (datetime.fromisoformat(start), datetime.fromisoformat(end))
+            for start, end in conn.execute(
+                "SELECT start, end FROM time_entries WHERE start >= ? AND start < ?", week
+            )
+        ],
+    }
+
+
+def _epoch_cases(conn: sqlite3.Connection) -> dict[str, object]:
+    month = tuple(to_epoch(m) for m in _MONTH)
+    week = tuple(to_epoch(m) for m in _WEEK)
+    return {
+        "per-day totals": lambda: conn.execute(
+            "SELECT day, SUM(end_ts - start_ts) FROM time_entries GROUP BY day"
+        ).fetchall(),
+        "month total": lambda: conn.execute(
+            "SELECT SUM(end_ts - start_ts) FROM time_entries "
+            "WHERE start_ts >= ? AND start_ts < ?",
+            month,
+        ).fetchone(),
+        "rollup aggregate": lambda: conn.execute(
+            "SELECT te.day, t.project_id, te.category_id, "
+            "SUM(te.end_ts - te.start_ts), COUNT(*) "
+            "FROM time_entries te JOIN tasks t ON te.task_id = t.id GROUP BY 1, 2, 3"
+        ).fetchall(),
+        "week as datetimes": lambda: [
+            (from_epoch(start), from_epoch(end))
+            for start, end in conn.execute(
+                "SELECT start_ts, end_ts FROM time_entries WHERE start_ts >= ? AND start_ts < ?",
+                week,
+            )
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "devflow.db"
+        count = _build_v3(path, args.rows)
+        size_before = _size_mb(path)
+        conn = sqlite3.connect(str(path))
+        before = {name: _median_ms(fn, args.repeat) for name, fn in _text_cases(conn).items()}
+        conn.close()
+
+        t0 = time.perf_counter()
+        conn = get_connection(path, profile="bulk")
+        migration_s = time.perf_counter() - t0
+        assert conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0] == count
+        assert conn.execute(
+            "SELECT COUNT(*) FROM time_entries WHERE day = ?", (day_key(END),)
+        ).fetchone()[0] == ENTRIES_PER_DAY
+        conn.close()
+        size_after = _size_mb(path)
+        conn = sqlite3.connect(str(path))
+        after = {name: _median_ms(fn, args.repeat) for name, fn in _epoch_cases(conn).items()}
+        conn.close()
+
+    print(f"{count:,} entries; v3 -> v4 migration took {migration_s:.1f} s")
+    print(f"{'':<20} {'text (v3)':>12} {'epoch (v4)':>12} {'ratio':>7}")
+    print(
+        f"{'database size':<20} {size_before:>9.1f} MB {size_after:>9.1f} MB "
+        f"{size_after / size_before:>6.2f}x"
+    )
+    for name in before:
+        print(
+            f"{name:<20} {before[name]:>9.1f} ms {after[name]:>9.1f} ms "
+            f"{after[name] / before[name]:>6.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
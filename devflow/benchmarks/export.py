@@ -0,0 +1,93 @@
+"""``devflow export`` throughput and memory: time and max RSS by export size.
+
+Generates ``--rows`` synthetic entries into a file database with
+``devflow generate``, then runs ``python -m devflow export`` for each format
+over roughly 1%, 10% and 100% of the history, writing to a temporary file.
+Every step is a child process, so this one stays small, and each export's
+peak RSS comes from ``os.wait4``: a streaming export shows the same RSS at
+every size. Fails if the full export runs slower than
+``--target`` rows/second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks import SRC_DIR
+
+END = date(2024, 6, 30)
+ENTRIES_PER_DAY = 20
+TARGET_ROWS_PER_SECOND = 100_000
+
+
+def _devflow(*args: str) -> list[str]:
+    return [sys.executable, "-m", "devflow", *args]
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+
+
+def _export(db: Path, out: Path, fmt: str, since: date | None) -> tuple[float, float]:
+    """Run one export; returns (seconds, peak RSS in MB)."""
+    cmd = _devflow("export", "--db", str(db), "-o", str(out), "--format", fmt)
+    if since is not None:
+        cmd += ["--since", since.isoformat()]
+    t0 = time.perf_counter()
+    child = subprocess.Popen(cmd, env=_env(), stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(child.pid, 0)
+    elapsed = time.perf_counter() - t0
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise SystemExit(f"export failed: {' '.join(cmd)}")
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return elapsed, usage.ru_maxrss * scale / 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--target", type=float, default=TARGET_ROWS_PER_SECOND)
+    args = parser.parse_args()
+
+    days = max(args.rows // ENTRIES_PER_DAY, 1)
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "devflow.db"
+        generated = subprocess.run(
+            _devflow(
+                "generate", "--db", str(db), "--days", str(days), "--end", END.isoformat(),
+                "--entries-per-day", str(ENTRIES_PER_DAY), "--weekends",
+            ),
+            env={**_env(), "HOME": tmp},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        print(generated.stdout.strip())
+        print(f"{'format':<7} {'rows':>10} {'time':>9} {'rows/s':>11} {'max RSS':>10}")
+        for fmt in ("csv", "jsonl"):
+            for share in (1, 10, 100):
+                span = max(days * share // 100, 1)
+                since = None if share == 100 else END - timedelta(days=span - 1)
+                out = Path(tmp) / f"export.{fmt}"
+                elapsed, rss = _export(db, out, fmt, since)
+                with out.open("rb") as f:
+                    rows = sum(1 for _ in f) - (fmt == "csv")
+                rate = rows / elapsed
+                print(f"{fmt:<7} {rows:>10,} {elapsed:>7.2f} s {rate:>11,.0f} {rss:>7.1f} MB")
+                if share == 100 and rate < args.target:
+                    print(f"  FAIL: under the {args.target:,.0f} rows/s target")
+                    ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""``devflow ics`` cost: a full calendar export vs. an incremental one.
+
+Generates ``--rows`` synthetic entries into a file database, exports the
+whole history as iCalendar, then makes a night's worth of changes (edits,
+deletions and new entries) and times the incremental export that picks
+them up, plus one with nothing to send. Output goes to ``os.devnull``.
+Fails if an incremental export takes longer than ``--target-ms``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow import ics
+from devflow.db import queries
+from devflow.db.connection import get_connection
+from devflow.synthetic import SyntheticConfig, generate_history
+
+END = date(2024, 6, 30)
+ENTRIES_PER_DAY = 20
+CHANGES = 50  # per kind: edited, deleted and added entries
+TARGET_MS = 50.0
+
+
+def _export(conn, after_seq: int | None) -> tuple[float, int, int]:
+    """One export to /dev/null; returns (milliseconds, events, watermark)."""
+    with open(os.devnull, "w", encoding="utf-8", newline="") as out:
+        t0 = time.perf_counter()
+        count, seq = ics.export_calendar(conn, out, after_seq=after_seq)
+        return (time.perf_counter() - t0) * 1000, count, seq
+
+
+def _change(conn) -> None:
+    """Edit, delete and add ``CHANGES`` entries each, as a day of tracking would."""
+    ids = [row[0] for row in conn.execute(
+        "SELECT id FROM time_entries ORDER BY id DESC LIMIT ?", (CHANGES * 2,)
+    )]
+    for entry_id in ids[:CHANGES]:
+        entry = queries.get_time_entry(conn, entry_id)
+        queries.update_time_entry(conn, entry_id, end=entry.end + timedelta(minutes=5))
+    for entry_id in ids[CHANGES:]:
+        queries.delete_time_entry(conn, entry_id)
+    entry = queries.get_time_entry(conn, ids[0])
+    start = datetime(END.year, END.month, END.day, 8)
+    for i in range(CHANGES):
+        moment = start + timedelta(minutes=5 * i)
+        queries.create_time_entry(
+            conn, entry.task_id, entry.category_id, moment, moment + timedelta(minutes=4)
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = get_connection(Path(tmp) / "devflow.db", profile="bulk")
+        summary = generate_history(
+            conn,
+            SyntheticConfig(
+                days=max(args.rows // ENTRIES_PER_DAY, 1),
+                end=END,
+                entries_per_day=ENTRIES_PER_DAY,
+                weekends=True,
+            ),
+        )
+        print(f"{summary.entries:,} entries")
+
+        elapsed, count, seq = _export(conn, None)
+        print(f"{'full':<22} {count:>10,} events {elapsed:>10.1f} ms")
+        _change(conn)
+        ok = True
+        for label, after in (("incremental, changes", seq), ("incremental, none", None)):
+            if after is None:
+                after = queries.time_entry_change_seq(conn)
+            samples = [_export(conn, after) for _ in range(args.repeat)]
+            elapsed = statistics.median(ms for ms, _, _ in samples)
+            count = samples[0][1]
+            print(f"{label:<22} {count:>10,} events {elapsed:>10.1f} ms")
+            if elapsed > args.target_ms:
+                print(f"  FAIL: over the {args.target_ms:.0f} ms target")
+                ok = False
+        conn.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""``devflow import`` throughput: a first import, then the no-op re-run.
+
+Generates ``--rows`` synthetic entries with ``devflow generate``, exports
+them to CSV and JSONL with ``devflow export``, and imports each file into a
+fresh database twice with ``python -m devflow import``. The first run
+creates every project, task and category by name and inserts every row;
+the second must insert nothing. Every step is a child process. Fails if a
+first import runs slower than ``--target`` records/second, or if a re-run
+inserts anything.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import SRC_DIR
+
+END = "2024-06-30"
+ENTRIES_PER_DAY = 20
+TARGET_ROWS_PER_SECOND = 40_000
+
+
+def _devflow(*args: str) -> list[str]:
+    return [sys.executable, "-m", "devflow", *args]
+
+
+def _run(cmd: list[str], home: str) -> tuple[float, str]:
+    t0 = time.perf_counter()
+    result = subprocess.run(
+        cmd,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR), "HOME": home},
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - t0
+    if result.returncode != 0:
+        raise SystemExit(f"failed: {' '.join(cmd)}\n{result.stdout}{result.stderr}")
+    return elapsed, (result.stdout + result.stderr).strip()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--target", type=float, default=TARGET_ROWS_PER_SECOND)
+    args = parser.parse_args()
+
+    days = max(args.rows // ENTRIES_PER_DAY, 1)
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.db"
+        _, generated = _run(
+            _devflow(
+                "generate", "--db", str(source), "--days", str(days), "--end", END,
+                "--entries-per-day", str(ENTRIES_PER_DAY), "--weekends",
+            ),
+            tmp,
+        )
+        print(generated)
+        print(f"{'format':<7} {'run':<8} {'rows':>10} {'time':>9} {'rows/s':>11}  result")
+        for fmt in ("csv", "jsonl"):
+            data = Path(tmp) / f"entries.{fmt}"
+            _run(_devflow("export", "--db", str(source), "-o", str(data)), tmp)
+            with data.open("rb") as f:
+                rows = sum(1 for _ in f) - (fmt == "csv")
+            target = Path(tmp) / f"import-{fmt}.db"
+            for run in ("first", "re-run"):
+                elapsed, output = _run(_devflow("import", str(data), "--db", str(target)), tmp)
+                rate = rows / elapsed
+                summary = output.splitlines()[0]
+                print(f"{fmt:<7} {run:<8} {rows:>10,} {elapsed:>7.2f} s {rate:>11,.0f}  {summary}")
+                if run == "first" and rate < args.target:
+                    print(f"  FAIL: under the {args.target:,.0f} rows/s target")
+                    ok = False
+                if run == "re-run" and not summary.startswith("Imported 0 "):
+                    print("  FAIL: the re-run inserted rows")
+                    ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
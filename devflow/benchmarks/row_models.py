@@ -0,0 +1,127 @@
+"""Memory and time to load a year of time entries, by row representation.
+
+Loads every entry of a synthetic year three ways:
+
+* ``Row + dict``: the previous pattern, ``Model(**dict(row))`` over
+  ``sqlite3.Row`` into a plain (unslotted) dataclass;
+* ``row_factory``: ``queries.list_time_entries_for_range``, slotted
+  ``TimeEntry`` objects built by the cursor's row factory;
+* ``columns``: ``queries.list_time_entry_columns_for_range``, parallel
+  integer arrays.
+
+Time is the median of ``--repeat`` untraced loads. Memory comes from
+``tracemalloc``: the peak while loading, and what the returned listing
+still holds afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow.db import queries
+from devflow.db.connection import get_memory_connection
+from devflow.db.timestamps import from_epoch
+from devflow.synthetic import SyntheticConfig, generate_history
+
+END = date(2024, 12, 31)
+_YEAR = (datetime(2024, 1, 1), datetime(2025, 1, 1))
+
+
+@dataclass
+class _PlainTimeEntry:
+    id: int
+    task_id: int
+    category_id: int
+    start: datetime
+    end: datetime
+    duration_seconds: int
+
+
+def _row_dict(conn: sqlite3.Connection, start: datetime, end: datetime) -> list[_PlainTimeEntry]:
+    rows = conn.execute(
+        "SELECT id, task_id, category_id, start_ts AS start, end_ts AS end, "
+        "end_ts - start_ts AS duration_seconds "
+        "FROM time_entries WHERE start_ts >= ? AND start_ts < ? ORDER BY start_ts ASC",
+        (int(start.timestamp()), int(end.timestamp())),
+    ).fetchall()
+    entries = []
+    for row in rows:
+        fields = dict(row)
+        fields["start"] = from_epoch(fields["start"])
+        fields["end"] = from_epoch(fields["end"])
+        entries.append(_PlainTimeEntry(**fields))
+    return entries
+
+
+LOADERS = {
+    "Row + dict": _row_dict,
+    "row_factory": queries.list_time_entries_for_range,
+    "columns": queries.list_time_entry_columns_for_range,
+}
+
+
+def _median_ms(load, conn: sqlite3.Connection, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        load(conn, *_YEAR)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _memory_mb(load, conn: sqlite3.Connection) -> tuple[float, float]:
+    """(peak while loading, retained by the result) in MB."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = load(conn, *_YEAR)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(result) > 0
+    return (peak - baseline) / 1e6, (retained - baseline) / 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries-per-day", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = get_memory_connection()
+    summary = generate_history(
+        conn,
+        SyntheticConfig(
+            days=(END - date(2024, 1, 1)).days + 1,
+            end=END,
+            entries_per_day=args.entries_per_day,
+            weekends=True,
+            midnight_ratio=0.0,
+        ),
+    )
+    counts = {len(load(conn, *_YEAR)) for load in LOADERS.values()}
+    assert counts == {summary.entries}, counts
+
+    print(f"{summary.entries:,} entries (2024)")
+    print(f"{'':<14} {'time':>10} {'peak':>10} {'retained':>10} {'per entry':>10}")
+    for name, load in LOADERS.items():
+        ms = _median_ms(load, conn, args.repeat)
+        peak, retained = _memory_mb(load, conn)
+        print(
+            f"{name:<14} {ms:>7.1f} ms {peak:>7.2f} MB {retained:>7.2f} MB "
+            f"{retained * 1e6 / summary.entries:>8.0f} B"
+        )
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
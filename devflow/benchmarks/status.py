@@ -0,0 +1,80 @@
+"""Startup benchmark for ``devflow --status``.
+
+Spawns ``python -m devflow --status`` repeatedly against a throwaway HOME
+with a running timer. Interpreter startup (``python -c pass``) is measured
+alongside and subtracted, and the run fails if the median devflow-specific
+overhead exceeds the budget, so the gate does not depend on how fast the
+host starts a bare interpreter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks import SRC_DIR
+
+DEFAULT_BUDGET_MS = 20.0
+
+
+def _prepare_home(home: Path) -> None:
+    from devflow.db import queries
+    from devflow.db.connection import get_connection
+
+    conn = get_connection(home / ".farhost" / "devflow" / "devflow.db")
+    project = queries.list_projects(conn)[0]
+    task = queries.create_task(conn, project.id, "Benchmark")
+    category = queries.list_categories(conn)[0]
+    queries.set_active_session(conn, task.id, category.id, datetime.now() - timedelta(hours=1))
+    conn.close()
+
+
+def _time_runs(cmd: list[str], env: dict[str, str], runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        _prepare_home(home)
+        env = dict(os.environ, HOME=str(home), PYTHONPATH=str(SRC_DIR))
+
+        # Warm the page cache and bytecode before measuring.
+        _time_runs([sys.executable, "-m", "devflow", "--status"], env, 3)
+
+        baseline = _time_runs([sys.executable, "-c", "pass"], env, args.runs)
+        status = _time_runs([sys.executable, "-m", "devflow", "--status"], env, args.runs)
+
+    base_ms = statistics.median(baseline)
+    status_ms = statistics.median(status)
+    print(f"python -c pass        median {base_ms:7.2f} ms")
+    print(f"devflow --status      median {status_ms:7.2f} ms")
+    print(f"devflow overhead      median {status_ms - base_ms:7.2f} ms")
+    print(f"budget                       {args.budget_ms:7.2f} ms")
+
+    if status_ms - base_ms > args.budget_ms:
+        print("FAIL: devflow --status exceeded its startup budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""Benchmark suite: every public query function and the timer engine.
+
+Each data size gets its own in-memory database filled by
+``devflow.synthetic.generate_history``; every case in ``CASES`` is then
+timed ``--repeat`` times against it. Per-call setup (e.g. creating the
+entry a delete will remove) runs outside the timed region.
+
+    python -m benchmarks.suite run --sizes 1000 10000 100000 --out base.json
+    python -m benchmarks.suite compare base.json new.json --threshold 0.2
+
+``compare`` prints the median ratio of every case present in both runs and
+exits 1 if any slowed down by more than ``--threshold`` (and by more than
+``--min-delta-ms``, so sub-millisecond noise is not a regression).
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, NamedTuple
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow.db import queries
+from devflow.db.connection import get_memory_connection
+from devflow.synthetic import SyntheticConfig, generate_history
+from devflow.timer import engine
+
+END = date(2024, 6, 30)  # a Sunday, so the last full week is Mon 24th - Sun 30th
+ENTRIES_PER_DAY = 20
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+@dataclass
+class Fixture:
+    """A populated database plus ids and dates the cases run against."""
+
+    conn: sqlite3.Connection
+    day: date
+    week: tuple[date, date]
+    project_id: int
+    task_id: int
+    category_id: int
+    counter: itertools.count = field(default_factory=itertools.count)
+
+    def name(self, prefix: str) -> str:
+        return f"{prefix} {next(self.counter)}"
+
+    def entry(self) -> tuple[int, int, datetime, datetime]:
+        start = self.at(self.day, 12)
+        return (self.task_id, self.category_id, start, start + timedelta(minutes=30))
+
+    def at(self, day: date, hour: int, minute: int = 0) -> datetime:
+        return datetime(day.year, day.month, day.day, hour, minute)
+
+
+def build_fixture(size: int) -> Fixture:
+    """Generate roughly ``size`` entries ending at ``END``."""
+    conn = get_memory_connection()
+    days = max(size // ENTRIES_PER_DAY, 7)
+    generate_history(
+        conn,
+        SyntheticConfig(
+            days=days,
+            end=END,
+            entries_per_day=min(ENTRIES_PER_DAY, size) or 1,
+            weekends=True,
+            midnight_ratio=0.02,
+        ),
+    )
+    task_id, project_id = conn.execute(
+        "SELECT t.id, t.project_id FROM tasks t JOIN projects p ON t.project_id = p.id "
+        "WHERE t.archived_at IS NULL AND p.archived_at IS NULL ORDER BY t.id LIMIT 1"
+    ).fetchone()
+    category_id = queries.list_categories(conn)[0].id
+    monday = END - timedelta(days=6)
+    return Fixture(
+        conn=conn,
+        day=monday + timedelta(days=2),
+        week=(monday, END + timedelta(days=1)),
+        project_id=project_id,
+        task_id=task_id,
+        category_id=category_id,
+    )
+
+
+class Case(NamedTuple):
+    setup: Callable[[Fixture], tuple[Any, ...]]  # untimed; returns the call's args
+    run: Callable[..., Any]  # run(conn, *args)
+
+
+def _none(fx: Fixture) -> tuple[Any, ...]:
+    return ()
+
+
+def _new_entry(fx: Fixture) -> tuple[Any, ...]:
+    return (queries.create_time_entry(fx.conn, *fx.entry()).id,)
+
+
+def _started_ago(hours: float) -> Callable[[Fixture], tuple[Any, ...]]:
+    def setup(fx: Fixture) -> tuple[Any, ...]:
+        start = datetime.now() - timedelta(hours=hours)
+        queries.set_active_session(fx.conn, fx.task_id, fx.category_id, start)
+        return ()
+
+    return setup
+
+
+def _archived(kind: str) -> Callable[[Fixture], tuple[Any, ...]]:
+    def setup(fx: Fixture) -> tuple[Any, ...]:
+        if kind == "project":
+            return (queries.create_project(fx.conn, fx.name("Bench project")).id,)
+        if kind == "task":
+            return (queries.create_task(fx.conn, fx.project_id, "Bench task").id,)
+        return (queries.create_category(fx.conn, fx.name("Bench category")).id,)
+
+    def archived(fx: Fixture) -> tuple[Any, ...]:
+        (item_id,) = setup(fx)
+        getattr(queries, f"archive_{kind}")(fx.conn, item_id)
+        return (item_id,)
+
+    return archived
+
+
+CASES: dict[str, Case] = {
+    # Projects, tasks, categories
+    "queries.list_projects": Case(_none, queries.list_projects),
+    "queries.get_project": Case(lambda fx: (fx.project_id,), queries.get_project),
+    "queries.create_project": Case(
+        lambda fx: (fx.name("Bench project"),), queries.create_project
+    ),
+    "queries.update_project": Case(
+        lambda fx: (queries.create_project(fx.conn, fx.name("Bench project")).id,
+                    fx.name("Renamed project")),
+        queries.update_project,
+    ),
+    "queries.archive_project": Case(
+        lambda fx: (queries.create_project(fx.conn, fx.name("Bench project")).id,),
+        queries.archive_project,
+    ),
+    "queries.restore_project": Case(_archived("project"), queries.restore_project),
+    "queries.list_tasks": Case(lambda fx: (fx.project_id,), queries.list_tasks),
+    "queries.get_task": Case(lambda fx: (fx.task_id,), queries.get_task),
+    "queries.create_task": Case(
+        lambda fx: (fx.project_id, fx.name("Bench task")), queries.create_task
+    ),
+    "queries.update_task": Case(
+        lambda fx: (fx.task_id, fx.name("Task")), queries.update_task
+    ),
+    "queries.archive_task": Case(
+        lambda fx: (queries.create_task(fx.conn, fx.project_id, "Bench task").id,),
+        queries.archive_task,
+    ),
+    "queries.restore_task": Case(_archived("task"), queries.restore_task),
+    "queries.list_categories": Case(_none, queries.list_categories),
+    "queries.get_category": Case(lambda fx: (fx.category_id,), queries.get_category),
+    "queries.create_category": Case(
+        lambda fx: (fx.name("Bench category"),), queries.create_category
+    ),
+    "queries.update_category": Case(
+        lambda fx: (queries.create_category(fx.conn, fx.name("Bench category")).id,
+                    fx.name("Renamed category")),
+        queries.update_category,
+    ),
+    "queries.archive_category": Case(
+        lambda fx: (queries.create_category(fx.conn, fx.name("Bench category")).id,),
+        queries.archive_category,
+    ),
+    "queries.restore_category": Case(_archived("category"), queries.restore_category),
+    # Time entries
+    "queries.list_time_entries_for_date": Case(
+        lambda fx: (fx.day,), queries.list_time_entries_for_date
+    ),
+    "queries.list_time_entry_details_for_date": Case(
+        lambda fx: (fx.day,), queries.list_time_entry_details_for_date
+    ),
+    "queries.list_time_entries_for_range": Case(
+        lambda fx: (fx.at(fx.week[0], 0), fx.at(fx.week[1], 0)),
+        queries.list_time_entries_for_range,
+    ),
+    "queries.list_time_entry_columns_for_range": Case(
+        lambda fx: (fx.at(fx.week[0], 0), fx.at(fx.week[1], 0)),
+        queries.list_time_entry_columns_for_range,
+    ),
+    "queries.iter_time_entries_for_export": Case(
+        lambda fx: (fx.at(fx.week[0], 0), fx.at(fx.week[1], 0)),
+        lambda conn, *args: sum(1 for _ in queries.iter_time_entries_for_export(conn, *args)),
+    ),
+    "queries.iter_time_entries_for_calendar": Case(
+        lambda fx: (fx.at(fx.week[0], 0), fx.at(fx.week[1], 0)),
+        lambda conn, *args: sum(1 for _ in queries.iter_time_entries_for_calendar(conn, *args)),
+    ),
+    "queries.time_entry_change_seq": Case(_none, queries.time_entry_change_seq),
+    "queries.get_export_watermark": Case(
+        lambda fx: (fx.name("watermark"),), queries.get_export_watermark
+    ),
+    "queries.set_export_watermark": Case(
+        lambda fx: (fx.name("watermark"), next(fx.counter)), queries.set_export_watermark
+    ),
+    "queries.new_time_entry": Case(
+        lambda fx: fx.entry(), lambda conn, *entry: queries.new_time_entry(*entry)
+    ),
+    "queries.create_time_entry": Case(lambda fx: fx.entry(), queries.create_time_entry),
+    "queries.create_time_entries": Case(
+        lambda fx: ([queries.new_time_entry(*fx.entry())] * 1000,),
+        queries.create_time_entries,
+    ),
+    "queries.import_time_entries": Case(
+        # Fresh hashes every call, so each run inserts all 1000 rows.
+        lambda fx: (
+            [(*queries.new_time_entry(*fx.entry()), next(fx.counter)) for _ in range(1000)],
+        ),
+        queries.import_time_entries,
+    ),
+    "queries.update_time_entry": Case(
+        lambda fx: (*_new_entry(fx), fx.at(fx.day, 12, 45)),
+        lambda conn, entry_id, end: queries.update_time_entry(conn, entry_id, end=end),
+    ),
+    "queries.get_time_entry": Case(_new_entry, queries.get_time_entry),
+    "queries.delete_time_entry": Case(_new_entry, queries.delete_time_entry),
+    # Reports and rollups
+    "queries.daily_totals_by_project": Case(
+        lambda fx: (fx.day,), queries.daily_totals_by_project
+    ),
+    "queries.daily_totals_by_category": Case(
+        lambda fx: (fx.day,), queries.daily_totals_by_category
+    ),
+    "queries.weekly_totals_by_day": Case(lambda fx: fx.week, queries.weekly_totals_by_day),
+    "queries.weekly_totals_by_project": Case(
+        lambda fx: fx.week, queries.weekly_totals_by_project
+    ),
+    "queries.weekly_totals_by_category": Case(
+        lambda fx: fx.week, queries.weekly_totals_by_category
+    ),
+    "queries.rebuild_daily_rollups": Case(_none, queries.rebuild_daily_rollups),
+    "queries.check_daily_rollups": Case(_none, queries.check_daily_rollups),
+    # Active session
+    "queries.get_active_session": Case(_started_ago(1), queries.get_active_session),
+    "queries.get_active_session_detail": Case(
+        _started_ago(1), queries.get_active_session_detail
+    ),
+    "queries.set_active_session": Case(
+        lambda fx: (fx.task_id, fx.category_id, fx.at(fx.day, 9)),
+        queries.set_active_session,
+    ),
+    "queries.clear_active_session": Case(_started_ago(1), queries.clear_active_session),
+    # Timer engine
+    "engine.stop_timer": Case(_started_ago(2), engine.stop_timer),
+    "engine.check_midnight_split": Case(_started_ago(72), engine.check_midnight_split),
+}
+
+
+def time_case(fx: Fixture, case: Case, repeat: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        args = case.setup(fx)
+        t0 = time.perf_counter()
+        case.run(fx.conn, *args)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def run_suite(
+    sizes: list[int], repeat: int, only: list[str] | None = None, out=sys.stdout
+) -> dict[str, Any]:
+    names = [n for n in CASES if not only or any(part in n for part in only)]
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for size in sizes:
+        fx = build_fixture(size)
+        entries = fx.conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0]
+        print(f"size {size} ({entries} entries)", file=out)
+        results[str(size)] = {}
+        for name in names:
+            timing = time_case(fx, CASES[name], repeat)
+            results[str(size)][name] = timing
+            print(f"  {name:<42} {timing['median_ms']:>10.3f} ms", file=out)
+        fx.conn.close()
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    old: dict[str, Any], new: dict[str, Any], threshold: float, min_delta_ms: float
+) -> list[tuple[str, str, float, float, bool]]:
+    """Return (size, case, old_ms, new_ms, regressed) for cases in both runs."""
+    rows = []
+    for size, cases in new["results"].items():
+        for name, timing in cases.items():
+            before = old["results"].get(size, {}).get(name)
+            if before is None:
+                continue
+            old_ms, new_ms = before["median_ms"], timing["median_ms"]
+            regressed = (
+                new_ms > old_ms * (1 + threshold) and new_ms - old_ms > min_delta_ms
+            )
+            rows.append((size, name, old_ms, new_ms, regressed))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Time every case and write JSON results")
+    run.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--only", nargs="+", help="Substrings selecting which cases to run")
+    run.add_argument("--out", help="Write results to this JSON file")
+
+    cmp = commands.add_parser("compare", help="Flag regressions between two result files")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    cmp.add_argument("--min-delta-ms", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.sizes, args.repeat, args.only)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    rows = compare(old, new, args.threshold, args.min_delta_ms)
+    for size, name, old_ms, new_ms, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{size:>8}  {name:<42} {old_ms:>10.3f} {new_ms:>10.3f}  "
+              f"{new_ms / old_ms if old_ms else float('inf'):>6.2f}x  {flag}")
+    regressions = sum(row[4] for row in rows)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
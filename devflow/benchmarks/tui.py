@@ -0,0 +1,198 @@
+"""Keystroke-to-paint latency of the TUI, driven headlessly by Textual Pilot.
+
+Generates a synthetic database (years of history ending today), runs
+``DevFlowApp`` against it under ``App.run_test`` and replays each scenario
+in ``SCENARIOS`` many times. One sample is the time from sending the keys
+until every widget on the screen has drained its message queue (twice, so
+widgets mounted by the action are included) and the screen's compositor
+has been updated, i.e. the next frame is painted.
+
+``pilot.press`` is not used inside the timed region: it waits for CPU
+idleness after every key by polling in 20 ms steps, which would swamp the
+numbers. Keys are posted to the app as ``Key`` events instead and settled
+with ``pilot.pause(0)``, and ``pilot.pause()`` only separates samples.
+Only public Textual API is used, so the benchmark keeps working across the
+``textual>=0.89`` releases the package allows.
+
+Reports p50/p95/p99 per action and exits 1 if any p95 is over its budget
+in ``BUDGETS_MS`` (scaled by ``--budget-scale`` for slow machines).
+
+    python -m benchmarks.tui --entries 200000 --samples 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from textual import events
+from textual.keys import key_to_character
+from textual.worker import WorkerCancelled
+
+import benchmarks  # noqa: F401  (puts src/ on sys.path)
+from devflow.app import DevFlowApp
+from devflow.db.connection import get_connection
+from devflow.synthetic import SyntheticConfig, generate_history
+
+ENTRIES_PER_DAY = 20
+
+# screen -> [(action, keys)]; each action is replayed --samples times, and
+# the keys of one screen's actions cancel out (h then l) so the view stays
+# on data around today.
+SCENARIOS: dict[str, list[tuple[str, tuple[str, ...]]]] = {
+    "daily": [
+        ("h (previous day)", ("h",)),
+        ("l (next day)", ("l",)),
+        ("v (cycle view)", ("v",)),
+    ],
+    "weekly": [
+        ("h (previous week)", ("h",)),
+        ("l (next week)", ("l",)),
+        ("v (cycle view)", ("v",)),
+    ],
+    "navigate": [
+        (":d", ("colon", "d", "enter")),
+        (":w", ("colon", "w", "enter")),
+        (":p", ("colon", "p", "enter")),
+        (":c", ("colon", "c", "enter")),
+        (":t", ("colon", "t", "enter")),
+    ],
+}
+
+# p95 budgets in milliseconds per screen; one frame at 60 Hz is ~17 ms, and
+# 100 ms is where a keystroke stops feeling instant.
+BUDGETS_MS: dict[str, float] = {
+    "daily": 100.0,
+    "weekly": 100.0,
+    "navigate": 150.0,
+}
+
+_OPEN_SCREEN = {
+    "daily": ("colon", "d", "enter"),
+    "weekly": ("colon", "w", "enter"),
+    "navigate": (),
+}
+
+
+def build_database(path: Path, entries: int) -> int:
+    conn = get_connection(path, profile="bulk")
+    try:
+        summary = generate_history(
+            conn,
+            SyntheticConfig(
+                days=max(entries // ENTRIES_PER_DAY, 7),
+                end=date.today(),
+                entries_per_day=ENTRIES_PER_DAY,
+                weekends=True,
+            ),
+        )
+    finally:
+        conn.close()
+    return summary.entries
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(samples)}
+
+
+def _key_event(key: str) -> events.Key:
+    # As Pilot.press builds them, so printable keys carry their character.
+    return events.Key(key, key_to_character(key))
+
+
+async def _settle(pilot) -> None:
+    """Let workers finish and the screen repaint until two rounds in a row are quiet.
+
+    A key hops app -> focused widget, and e.g. a submitted command then
+    mounts a screen whose data arrives from a worker (devflow.db.worker),
+    so one round is not enough. ``pilot.pause(0)`` drains every widget's
+    pending messages and updates the compositor without idle polling.
+    """
+    app = pilot.app
+    quiet_rounds = 0
+    while quiet_rounds < 2:
+        running = [worker for worker in app.workers if not worker.is_finished]
+        if running:
+            try:
+                await app.workers.wait_for_complete(running)
+            except WorkerCancelled:
+                pass  # superseded by a newer exclusive worker
+        await pilot.pause(0)
+        idle = all(worker.is_finished for worker in app.workers)
+        quiet_rounds = quiet_rounds + 1 if not running and idle else 0
+
+
+async def _press_and_paint(pilot, keys: tuple[str, ...]) -> None:
+    """Send ``keys`` one at a time, each settled, ending with a painted frame."""
+    app = pilot.app
+    for key in keys:
+        app.post_message(_key_event(key))
+        await _settle(pilot)
+
+
+async def measure(db_path: Path, samples: int, size: tuple[int, int]) -> dict[str, dict]:
+    """Return {screen: {action: percentiles}}."""
+    app = DevFlowApp(db_path=db_path)
+    results: dict[str, dict] = {}
+    async with app.run_test(size=size) as pilot:
+        await pilot.pause()
+        for screen, actions in SCENARIOS.items():
+            await pilot.press(*_OPEN_SCREEN[screen])
+            await pilot.pause()
+            timings: dict[str, list[float]] = {name: [] for name, _ in actions}
+            for _ in range(samples):
+                for name, keys in actions:
+                    t0 = time.perf_counter()
+                    await _press_and_paint(pilot, keys)
+                    timings[name].append((time.perf_counter() - t0) * 1000)
+                    await pilot.pause()
+            results[screen] = {name: percentiles(ms) for name, ms in timings.items()}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--budget-scale", type=float, default=1.0)
+    parser.add_argument("--db", type=Path, help="Reuse this database instead of generating one")
+    parser.add_argument("--out", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if db_path is None:
+            db_path = Path(tmp) / "devflow.db"
+            t0 = time.perf_counter()
+            count = build_database(db_path, args.entries)
+            print(f"generated {count} entries in {time.perf_counter() - t0:.1f}s")
+        results = asyncio.run(measure(db_path, args.samples, (120, 40)))
+
+    failures = 0
+    print(f"{'screen':<10} {'action':<20} {'p50':>8} {'p95':>8} {'p99':>8}  budget")
+    for screen, actions in results.items():
+        budget = BUDGETS_MS[screen] * args.budget_scale
+        for name, p in actions.items():
+            over = p["p95"] > budget
+            failures += over
+            print(f"{screen:<10} {name:<20} {p['p50']:>8.1f} {p['p95']:>8.1f} {p['p99']:>8.1f}"
+                  f"  {budget:.0f} ms{'  OVER' if over else ''}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"budgets_ms": BUDGETS_MS, "results": results}, f, indent=2)
+    if failures:
+        print(f"FAIL: {failures} action(s) over their p95 budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
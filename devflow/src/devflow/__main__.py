@@ -1,37 +1,240 @@
 """Entry point for devflow: handles --status flag or launches TUI."""
 
-import argparse
 import sys
 
 
+def _status() -> None:
+    # Fast path for the tmux status line: skip argparse and the TUI stack.
+    try:
+        from devflow.cli import run_status
+
+        print(run_status())
+    except Exception as e:
+        print(f"DevFlow Status Error: {e}")
+    sys.exit(0)
+
+
+def _run_tui(profiler=None) -> None:
+    from contextlib import nullcontext
+
+    with profiler.section("import") if profiler else nullcontext():
+        from devflow.app import DevFlowApp
+    if profiler:
+        from devflow.profiling import instrument_app
+
+        instrument_app(profiler)
+    DevFlowApp().run()
+
+
+def _run_status_profiled(profiler) -> None:
+    with profiler.section("import"):
+        import devflow.cli  # noqa: F401
+    with profiler.section("status"):
+        _status()
+
+
+def _missing_database(db_path: str | None) -> None:
+    from devflow.cli import default_db_path
+
+    print(f"No DevFlow database at {db_path or default_db_path()}", file=sys.stderr)
+    sys.exit(1)
+
+
 def main():
+    if sys.argv[1:] == ["--status"]:
+        _status()
+
+    import argparse
+    from datetime import date
+
     parser = argparse.ArgumentParser(description="DevFlow - Time tracking TUI")
     parser.add_argument(
         "--status",
         action="store_true",
         help="Print active timer status and exit",
     )
+    parser.add_argument(
+        "--trace-sql",
+        action="store_true",
+        help="Time every SQL statement, log slow ones and print a summary on exit",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="devflow-profile",
+        metavar="DIR",
+        help="Profile the TUI (or --status) and write pstats, collapsed stacks "
+        "and a summary to DIR (default: ./devflow-profile)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    rollups = subparsers.add_parser(
+        "rollups", help="Rebuild or verify the daily_rollups reporting table"
+    )
+    rollups.add_argument("action", choices=["rebuild", "check"])
+    generate = subparsers.add_parser(
+        "generate", help="Fill a database with synthetic history for load testing"
+    )
+    generate.add_argument("--db", required=True, help="Database file to populate")
+    generate.add_argument("--days", type=int, default=365 * 3)
+    generate.add_argument("--end", type=date.fromisoformat, help="Last day to generate (YYYY-MM-DD)")
+    generate.add_argument("--projects", type=int, default=12)
+    generate.add_argument("--tasks-per-project", type=int, default=8)
+    generate.add_argument("--entries-per-day", type=int, default=12)
+    generate.add_argument("--archive-ratio", type=float, default=0.25)
+    generate.add_argument("--midnight-ratio", type=float, default=0.02)
+    generate.add_argument("--weekends", action="store_true", help="Also generate weekend days")
+    generate.add_argument("--seed", type=int, default=0)
+    export = subparsers.add_parser(
+        "export", help="Stream time entries as CSV or JSONL (no TUI, bounded memory)"
+    )
+    export.add_argument("-o", "--output", default="-", help="File to write (default: stdout)")
+    export.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        help="Output format (default: from the --output extension, else csv)",
+    )
+    export.add_argument("--since", type=date.fromisoformat, help="First day to include (YYYY-MM-DD)")
+    export.add_argument("--until", type=date.fromisoformat, help="Last day to include (YYYY-MM-DD)")
+    export.add_argument("--project", help="Only entries for this project name")
+    export.add_argument("--category", help="Only entries in this category name")
+    export.add_argument("--db", help="Database file (default: the DevFlow database)")
+    ics = subparsers.add_parser(
+        "ics", help="Stream time entries as an iCalendar file, optionally only what changed"
+    )
+    ics.add_argument("-o", "--output", default="-", help="File to write (default: stdout)")
+    ics.add_argument("--since", type=date.fromisoformat, help="First day to include (YYYY-MM-DD)")
+    ics.add_argument("--until", type=date.fromisoformat, help="Last day to include (YYYY-MM-DD)")
+    ics.add_argument(
+        "--incremental",
+        metavar="NAME",
+        help="Only entries changed since the last export under this watermark name "
+        "(not with --since/--until)",
+    )
+    ics.add_argument("--db", help="Database file (default: the DevFlow database)")
+    import_ = subparsers.add_parser(
+        "import", help="Bulk-import time entries from CSV or JSONL; re-running is a no-op"
+    )
+    import_.add_argument("source", help="File to read, or - for stdin")
+    import_.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        help="Input format (default: from the file extension, else csv)",
+    )
+    import_.add_argument("--db", help="Database file (default: the DevFlow database)")
     args = parser.parse_args()
 
     if args.status:
+        if args.profile:
+            from devflow.profiling import run_profiled
+
+            run_profiled(_run_status_profiled, args.profile)
+        _status()
+
+    if args.command == "rollups":
+        from devflow.cli import rollups_command
+        from devflow.db.connection import get_connection
+
+        conn = get_connection(profile="cli")
+        try:
+            code, output = rollups_command(conn, args.action)
+        finally:
+            conn.close()
+        print(output)
+        sys.exit(code)
+
+    if args.command == "generate":
+        from devflow.cli import generate_command
+        from devflow.db.connection import get_connection
+        from devflow.synthetic import SyntheticConfig
+
+        config = SyntheticConfig(
+            days=args.days,
+            end=args.end,
+            projects=args.projects,
+            tasks_per_project=args.tasks_per_project,
+            entries_per_day=args.entries_per_day,
+            archive_ratio=args.archive_ratio,
+            midnight_ratio=args.midnight_ratio,
+            weekends=args.weekends,
+            seed=args.seed,
+        )
+        conn = get_connection(args.db, profile="bulk")
+        try:
+            code, output = generate_command(conn, config)
+        finally:
+            conn.close()
+        print(output)
+        sys.exit(code)
+
+    if args.command == "export":
+        from devflow.cli import export_command, open_export_connection
+
+        conn = open_export_connection(args.db)
+        if conn is None:
+            _missing_database(args.db)
         try:
-            from devflow.cli import print_status
-            from devflow.db.connection import get_connection
-
-            conn = get_connection()
-            try:
-                output = print_status(conn)
-                print(output)
-            finally:
-                conn.close()
-        except Exception as e:
-            print(f"DevFlow Status Error: {e}")
-        sys.exit(0)
-
-    from devflow.app import DevFlowApp
-
-    app = DevFlowApp()
-    app.run()
+            code, output = export_command(
+                conn,
+                args.output,
+                args.format,
+                since=args.since,
+                until=args.until,
+                project=args.project,
+                category=args.category,
+            )
+        finally:
+            conn.close()
+        # stdout may be the export itself.
+        print(output, file=sys.stderr)
+        sys.exit(code)
+
+    if args.command == "ics":
+        from devflow.cli import ics_command, open_export_connection
+
+        conn = open_export_connection(args.db, writable=bool(args.incremental))
+        if conn is None:
+            _missing_database(args.db)
+        try:
+            code, output = ics_command(
+                conn,
+                args.output,
+                since=args.since,
+                until=args.until,
+                incremental=args.incremental,
+            )
+        finally:
+            conn.close()
+        # stdout may be the calendar itself.
+        print(output, file=sys.stderr)
+        sys.exit(code)
+
+    if args.command == "import":
+        from devflow.cli import import_command
+        from devflow.db.connection import get_connection
+
+        conn = get_connection(args.db, profile="bulk")
+        try:
+            code, output = import_command(conn, args.source, args.format)
+        finally:
+            conn.close()
+        print(output)
+        sys.exit(code)
+
+    from devflow.db import tracing
+
+    if args.trace_sql:
+        import os
+
+        os.environ[tracing.TRACE_ENV_VAR] = "1"
+
+    if args.profile:
+        from devflow.profiling import run_profiled
+
+        run_profiled(_run_tui, args.profile)
+    else:
+        _run_tui()
+    if tracing.tracing_enabled():
+        print(tracing.get_tracer().summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -3,19 +3,44 @@
 from __future__ import annotations
 
 import sqlite3
+from pathlib import Path
 from typing import cast
 
+from textual import events
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
 from textual.widget import Widget
 from textual.widgets import Input
 
-from devflow.db.connection import get_connection
-from devflow.timer.engine import recover_crashed_session
+from devflow.db.changes import ChangeMonitor
+from devflow.db.connection import ConnectionPool, data_stamp, get_connection
+from devflow.db.worker import DatabaseWorker
+from devflow.screens.categories import CategoriesScreen
+from devflow.screens.daily import DailyReportScreen
+from devflow.screens.projects import ProjectsScreen
+from devflow.screens.tasks import TasksScreen
+from devflow.screens.timer import TimerScreen
+from devflow.screens.weekly import WeeklyReportScreen
+from devflow.timer.engine import RecoveryPolicy, recover_crashed_session
+from devflow.timer.state import TimerState
 from devflow.widgets.command_bar import COMMANDS, CommandBar
 
 
+# Seconds between checks for writes by other processes; a check that finds
+# nothing is two stat() calls.
+CHANGE_POLL_INTERVAL = 0.5
+
+SCREENS: dict[str, type[Widget]] = {
+    "timer": TimerScreen,
+    "daily": DailyReportScreen,
+    "weekly": WeeklyReportScreen,
+    "projects": ProjectsScreen,
+    "categories": CategoriesScreen,
+    "tasks": TasksScreen,
+}
+
+
 class DevFlowApp(App):
     """The main DevFlow application."""
 
@@ -35,21 +60,79 @@ class DevFlowApp(App):
         Binding("escape", "escape", "Cancel", show=False),
     ]
 
-    def __init__(self) -> None:
+    def __init__(self, db_path: Path | str | None = None) -> None:
         super().__init__()
+        self.db_path = db_path
+        # The single writer connection; screens' reports go through db_worker,
+        # which reads from a pool of read-only connections.
         self.db: sqlite3.Connection | None = None
+        self.db_pool: ConnectionPool | None = None
+        self.db_worker: DatabaseWorker | None = None
+        self.timer_state = TimerState()
         self._command_bar: CommandBar | None = None
+        # Screens stay mounted (hidden) once visited; see _navigate_to.
+        self._screens: dict[str, Widget] = {}
+        self._screen_kwargs: dict[str, dict] = {}
+        self._screen_stamps: dict[str, tuple[int, int]] = {}
+        self._screen_focus: dict[str, Widget] = {}
+        self._current_screen: str | None = None
+        self._changes: ChangeMonitor | None = None
 
     def compose(self) -> ComposeResult:
         yield Container(id="main-content")
         yield CommandBar(active_screen="timer")
 
     def on_mount(self) -> None:
-        self.db = get_connection()
-        recover_crashed_session(self.db)
+        self.db = get_connection(self.db_path)
+        self.db_pool = ConnectionPool(self.db_path)
+        self.db_worker = DatabaseWorker(self.db_pool)
+        try:
+            policy = RecoveryPolicy.from_env()
+        except ValueError as error:
+            self.notify(
+                f"{error}; using the default of {RecoveryPolicy().max_hours:g} hours.",
+                title="Invalid recovery setting",
+                severity="warning",
+                timeout=15,
+            )
+            policy = RecoveryPolicy()
+        recovered = recover_crashed_session(self.db, state=self.timer_state, policy=policy)
+        if recovered and not self.timer_state.running:
+            self.notify(
+                f"A timer left running since {recovered[0].start} was stopped at "
+                f"{recovered[-1].end}; edit the entry if you worked longer.",
+                title="Stale session recovered",
+                severity="warning",
+                timeout=15,
+            )
         self._command_bar = self.query_one(CommandBar)
+        self._changes = ChangeMonitor(self.db)
+        self.set_interval(CHANGE_POLL_INTERVAL, self._check_external_changes)
         self.call_later(self._navigate_to, "timer")
 
+    def on_unmount(self) -> None:
+        if self.db_worker is not None:
+            self.db_worker.close()
+        if self.db_pool is not None:
+            self.log(self.db_pool.stats.summary())
+            self.db_pool.close()
+
+    def _check_external_changes(self) -> None:
+        """Refresh the visible screen if another process wrote what it shows.
+
+        Hidden screens catch up on re-entry through their data stamp.
+        """
+        if self._changes is None or self.db is None:
+            return
+        tables = self._changes.poll()
+        if not tables:
+            return
+        if "active_session" in tables:
+            self.timer_state.load(self.db)
+        screen = self._screens.get(self._current_screen or "")
+        if screen is not None and tables & screen.WATCHED_TABLES:
+            screen.refresh_data()
+
     def action_command_mode(self) -> None:
         if self._command_bar:
             self._command_bar.activate_input()
@@ -73,35 +156,55 @@ class DevFlowApp(App):
             else:
                 self._navigate_to(screen_name)
 
+    def on_descendant_focus(self, event: events.DescendantFocus) -> None:
+        # Remember focus per screen; by the time _navigate_to runs the
+        # command input has it.
+        screen = self._screens.get(self._current_screen or "")
+        if screen is not None and (event.widget is screen or screen in event.widget.ancestors):
+            self._screen_focus[self._current_screen] = event.widget
+
     def _navigate_to(self, screen_name: str, **kwargs) -> None:
-        from devflow.screens.categories import CategoriesScreen
-        from devflow.screens.daily import DailyReportScreen
-        from devflow.screens.projects import ProjectsScreen
-        from devflow.screens.tasks import TasksScreen
-        from devflow.screens.timer import TimerScreen
-        from devflow.screens.weekly import WeeklyReportScreen
-
-        screen_map: dict[str, type[Widget]] = {
-            "timer": TimerScreen,
-            "daily": DailyReportScreen,
-            "weekly": WeeklyReportScreen,
-            "projects": ProjectsScreen,
-            "categories": CategoriesScreen,
-            "tasks": TasksScreen,
-        }
-
-        screen_class = screen_map.get(screen_name)
+        """Show ``screen_name``, mounting it on first visit.
+
+        Visited screens stay mounted but hidden, so their state (date, view
+        mode, cursor, focused widget) survives navigation. On re-entry a
+        screen's ``refresh_data()`` runs only if the database changed since
+        it was last shown. A screen opened with different ``kwargs`` (the
+        tasks screen for another project) is rebuilt.
+        """
+        screen_class = SCREENS.get(screen_name)
         if screen_class is None:
             return
 
-        # Mount the new screen in the main content area
         content_area = self.query_one("#main-content")
-        for child in content_area.children:
-            child.remove()
-        
-        new_screen = screen_class(**kwargs)
-        content_area.mount(new_screen)
-        new_screen.focus()
+        previous = self._current_screen
+        if previous is not None and previous in self._screens:
+            old = self._screens[previous]
+            if self.db is not None:
+                self._screen_stamps[previous] = data_stamp(self.db)
+            old.display = False
+
+        screen = self._screens.get(screen_name)
+        if screen is not None and self._screen_kwargs[screen_name] != kwargs:
+            screen.remove()
+            screen = None
+            self._screen_focus.pop(screen_name, None)
+
+        if screen is None:
+            screen = screen_class(**kwargs)
+            self._screens[screen_name] = screen
+            self._screen_kwargs[screen_name] = kwargs
+            content_area.mount(screen)
+            screen.focus()
+        else:
+            screen.display = True
+            if self.db is not None and self._screen_stamps.get(screen_name) != data_stamp(
+                self.db
+            ):
+                screen.refresh_data()
+            target = self._screen_focus.get(screen_name)
+            (target if target is not None and target.is_attached else screen).focus()
+        self._current_screen = screen_name
 
         # Don't change the footer's active command for the tasks screen
         if self._command_bar and screen_name != "tasks":
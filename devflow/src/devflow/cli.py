@@ -1,34 +1,259 @@
-"""Headless CLI logic for --status flag."""
+"""Headless CLI logic for --status flag and maintenance commands.
+
+The tmux status line runs ``devflow --status`` on every refresh, so this
+module deliberately imports nothing beyond ``sqlite3`` at import time: no
+schema setup, no seed data, no dataclasses, and a single joined query per
+call. Other commands import the query layer lazily.
+"""
 
 from __future__ import annotations
 
+import os
 import sqlite3
-from datetime import datetime
 
-from devflow.db import queries
+_STATUS_SQL = (
+    "SELECT COALESCE(p.name, 'Unknown'), t.name, c.name, "
+    "CAST(strftime('%s', 'now') AS INTEGER) - s.start_ts "
+    "FROM active_session s "
+    "JOIN tasks t ON s.task_id = t.id "
+    "JOIN categories c ON s.category_id = c.id "
+    "LEFT JOIN projects p ON t.project_id = p.id"
+)
+
+# Before schema v4 the start was local-time text. The status line may run
+# against such a database until the TUI next opens and migrates it.
+_LEGACY_STATUS_SQL = (
+    "SELECT COALESCE(p.name, 'Unknown'), t.name, c.name, "
+    "CAST(strftime('%s', 'now', 'localtime') AS INTEGER) "
+    "- CAST(strftime('%s', s.start_time) AS INTEGER) "
+    "FROM active_session s "
+    "JOIN tasks t ON s.task_id = t.id "
+    "JOIN categories c ON s.category_id = c.id "
+    "LEFT JOIN projects p ON t.project_id = p.id"
+)
+
+
+def default_db_path() -> str:
+    """Return the default database path (mirrors ``connection._DEFAULT_DB_PATH``)."""
+    return os.path.join(os.path.expanduser("~"), ".farhost", "devflow", "devflow.db")
+
+
+def open_status_connection(db_path: str | None = None) -> sqlite3.Connection | None:
+    """Open the database read-only, or return None if it does not exist yet.
+
+    Skips schema and seed work entirely: a missing database simply means no
+    timer has ever run.
+    """
+    if db_path is None:
+        db_path = default_db_path()
+    if not os.path.exists(db_path):
+        return None
+
+    quoted = db_path.replace("%", "%25").replace("?", "%3f").replace("#", "%23")
+    return sqlite3.connect(f"file:{quoted}?mode=ro", uri=True)
+
+
+def open_export_connection(
+    db_path: str | None = None, *, writable: bool = False
+) -> sqlite3.Connection | None:
+    """Open an existing database for an export, or return None if it is missing.
+
+    Unlike the TUI, an export never creates a database: a mistyped ``--db``
+    would otherwise leave a fresh, seeded file behind and export nothing.
+    Connections are read-only unless ``writable`` (an incremental export
+    records its watermark).
+    """
+    from devflow.db.connection import get_connection, get_read_connection
+
+    if db_path is None:
+        db_path = default_db_path()
+    if not os.path.exists(db_path):
+        return None
+    if writable:
+        return get_connection(db_path, profile="cli")
+    return get_read_connection(db_path, profile="cli")
 
 
 def print_status(conn: sqlite3.Connection) -> str:
     """Return the status string for the active timer, or 'Timer Stopped'."""
-    session = queries.get_active_session(conn)
-    if session is None:
+    try:
+        row = conn.execute(_STATUS_SQL).fetchone()
+    except sqlite3.OperationalError:
+        row = conn.execute(_LEGACY_STATUS_SQL).fetchone()
+    if row is None:
         return "Timer Stopped"
 
-    task = queries.get_task(conn, session.task_id)
-    category = queries.get_category(conn, session.category_id)
+    project_name, task_name, category_name, total_seconds = row
+    hours, remainder = divmod(max(total_seconds, 0), 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    return f"{project_name} > {task_name} > {category_name} | {hours:02d}:{minutes:02d}:{seconds:02d}"
+
 
-    if task is None or category is None:
+def run_status(db_path: str | None = None) -> str:
+    """Answer ``devflow --status`` against a read-only connection."""
+    conn = open_status_connection(db_path)
+    if conn is None:
         return "Timer Stopped"
+    try:
+        return print_status(conn)
+    finally:
+        conn.close()
 
-    from devflow.db import queries as q
 
-    project = q.get_project(conn, task.project_id)
-    project_name = project.name if project else "Unknown"
+def rollups_command(conn: sqlite3.Connection, action: str) -> tuple[int, str]:
+    """Run ``devflow rollups rebuild|check``; returns (exit_code, output)."""
+    from devflow.db import queries
 
-    start = datetime.strptime(session.start_time, "%Y-%m-%d %H:%M:%S")
-    elapsed = datetime.now() - start
-    total_seconds = int(elapsed.total_seconds())
-    hours, remainder = divmod(total_seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
+    if action == "rebuild":
+        count = queries.rebuild_daily_rollups(conn)
+        return 0, f"Rebuilt daily_rollups: {count} rows"
+
+    mismatches = queries.check_daily_rollups(conn)
+    if not mismatches:
+        return 0, "daily_rollups is consistent with time_entries"
+
+    lines = [f"daily_rollups has {len(mismatches)} inconsistent rows:"]
+    for day, project_id, category_id, expected, actual in mismatches:
+        lines.append(
+            f"  {day} project={project_id} category={category_id} "
+            f"expected={expected} actual={actual}"
+        )
+    lines.append("Run `devflow rollups rebuild` to repair.")
+    return 1, "\n".join(lines)
+
+
+def generate_command(conn: sqlite3.Connection, config) -> tuple[int, str]:
+    """Run ``devflow generate``; ``config`` is a ``synthetic.SyntheticConfig``."""
+    import time
+
+    from devflow.synthetic import generate_history
+
+    t0 = time.perf_counter()
+    summary = generate_history(conn, config)
+    elapsed = time.perf_counter() - t0
+    return 0, (
+        f"Generated {summary.entries} entries across {summary.projects} projects "
+        f"and {summary.tasks} tasks in {elapsed:.1f}s"
+    )
+
+
+def export_command(
+    conn: sqlite3.Connection,
+    output: str = "-",
+    fmt: str | None = None,
+    *,
+    since=None,
+    until=None,
+    project: str | None = None,
+    category: str | None = None,
+) -> tuple[int, str]:
+    """Run ``devflow export``; returns (exit_code, summary).
+
+    ``output`` is a file path or ``-`` for stdout, and ``fmt`` defaults to
+    the file's extension (CSV otherwise). ``since`` and ``until`` are
+    inclusive ``date`` bounds on each entry's start day.
+    """
+    import sys
+    import time
+    from datetime import datetime, timedelta
+
+    from devflow.export import export_entries, format_for_path
+
+    if fmt is None:
+        fmt = format_for_path(output)
+    start = datetime(since.year, since.month, since.day) if since else None
+    end = datetime(until.year, until.month, until.day) + timedelta(days=1) if until else None
+
+    t0 = time.perf_counter()
+    if output == "-":
+        count = export_entries(
+            conn, sys.stdout, fmt, start=start, end=end, project=project, category=category
+        )
+    else:
+        with open(output, "w", encoding="utf-8", newline="") as out:
+            count = export_entries(
+                conn, out, fmt, start=start, end=end, project=project, category=category
+            )
+    elapsed = time.perf_counter() - t0
+    target = "stdout" if output == "-" else output
+    return 0, f"Exported {count} entries as {fmt} to {target} in {elapsed:.1f}s"
+
+
+def import_command(
+    conn: sqlite3.Connection, source: str = "-", fmt: str | None = None
+) -> tuple[int, str]:
+    """Run ``devflow import``; returns (exit_code, summary).
+
+    ``source`` is a file path or ``-`` for stdin, and ``fmt`` defaults to
+    the file's extension (CSV otherwise). Exits 1 if any record was
+    rejected, 2 if the input cannot be read at all.
+    """
+    import sys
+
+    from devflow.export import format_for_path
+    from devflow.importer import import_entries
+
+    if fmt is None:
+        fmt = format_for_path(source)
+    try:
+        if source == "-":
+            report = import_entries(conn, sys.stdin, fmt)
+        else:
+            # utf-8-sig: spreadsheet tools often save CSV with a BOM.
+            with open(source, encoding="utf-8-sig", newline="") as f:
+                report = import_entries(conn, f, fmt)
+    except (OSError, ValueError) as error:
+        return 2, f"Import failed: {error}"
+    return (1 if report.rejected else 0), report.summary()
+
+
+def ics_command(
+    conn: sqlite3.Connection,
+    output: str = "-",
+    *,
+    since=None,
+    until=None,
+    incremental: str | None = None,
+) -> tuple[int, str]:
+    """Run ``devflow ics``; returns (exit_code, summary).
+
+    ``output`` is a file path or ``-`` for stdout; ``since`` and ``until``
+    are inclusive ``date`` bounds on each entry's start day. With
+    ``incremental``, the name of a watermark, only entries changed since
+    that watermark's last export are written (everything, the first time),
+    and the watermark moves forward once the output is complete. A date
+    range cannot be combined with ``incremental`` (exit code 2).
+    """
+    import sys
+    import time
+    from datetime import datetime, timedelta
+
+    from devflow.db import queries
+    from devflow.ics import export_calendar
+
+    if incremental and (since or until):
+        # The journal only knows an entry's new times, so an entry moved out
+        # of the range could not be withdrawn from the calendar.
+        return 2, "--incremental cannot be combined with --since/--until"
+    start = datetime(since.year, since.month, since.day) if since else None
+    end = datetime(until.year, until.month, until.day) + timedelta(days=1) if until else None
+    after_seq = queries.get_export_watermark(conn, incremental) if incremental else None
+
+    t0 = time.perf_counter()
+    if output == "-":
+        count, seq = export_calendar(conn, sys.stdout, start=start, end=end, after_seq=after_seq)
+        sys.stdout.flush()
+    else:
+        with open(output, "w", encoding="utf-8", newline="") as out:
+            count, seq = export_calendar(conn, out, start=start, end=end, after_seq=after_seq)
+    if incremental:
+        queries.set_export_watermark(conn, incremental, seq)
+    elapsed = time.perf_counter() - t0
 
-    return f"{project_name} > {task.name} > {category.name} | {hours:02d}:{minutes:02d}:{seconds:02d}"
+    target = "stdout" if output == "-" else output
+    summary = f"Exported {count} events to {target} in {elapsed * 1000:.0f}ms"
+    if incremental:
+        since_text = "everything" if after_seq is None else f"changes since {after_seq}"
+        summary += f" ({since_text}; watermark {incremental!r} now at {seq})"
+    return 0, summary
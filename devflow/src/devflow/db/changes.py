@@ -0,0 +1,71 @@
+"""Detect writes made by other connections, and which tables they touched.
+
+Every row change bumps its table's counter in ``db_changes`` (maintained by
+triggers, see ``schema.sql``). ``ChangeMonitor.poll()`` is cheap enough to
+call several times a second:
+
+1. ``stat()`` the database file and its WAL. Every commit rewrites one of
+   them, so if neither changed nothing happened and no SQLite call is made.
+2. ``PRAGMA data_version`` tells whether the commit came from another
+   connection; the monitor's own connection's writes are not reported,
+   since whoever made them has already updated its view.
+3. Only then are the handful of ``db_changes`` rows read and diffed.
+
+In-memory databases have no files to stat and start at step 2.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+
+
+def table_versions(conn: sqlite3.Connection) -> dict[str, int]:
+    return dict(conn.execute("SELECT table_name, version FROM db_changes").fetchall())
+
+
+class ChangeMonitor:
+    """Reports the tables changed by other connections since the last poll."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        path = conn.execute("PRAGMA database_list").fetchone()[2]
+        self._paths = (path, f"{path}-wal") if path else ()
+        self._files = self._file_signature()
+        self._data_version = self._read_data_version()
+        self._versions = table_versions(conn)
+
+    def _file_signature(self) -> tuple[tuple[int, int] | None, ...]:
+        signature = []
+        for path in self._paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                signature.append(None)
+            else:
+                signature.append((st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def _read_data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll(self) -> frozenset[str]:
+        """Return the tables other connections changed since the last call."""
+        if self._paths:
+            files = self._file_signature()
+            if files == self._files:
+                return frozenset()
+            self._files = files
+        data_version = self._read_data_version()
+        if data_version == self._data_version:
+            if self._paths:
+                # Only this connection wrote; move the baseline past its changes.
+                self._versions = table_versions(self.conn)
+            return frozenset()
+        self._data_version = data_version
+        versions = table_versions(self.conn)
+        changed = frozenset(
+            table for table, version in versions.items() if self._versions.get(table) != version
+        )
+        self._versions = versions
+        return changed
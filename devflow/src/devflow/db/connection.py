@@ -1,12 +1,70 @@
-"""Database connection factory, schema initialization, and seed data."""
+"""Database connections (writer, read-only pool), versioned schema bootstrap, seed data."""
 
 from __future__ import annotations
 
+import os
+import queue
 import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 
+from devflow.db import migrations, tracing
+
 _DEFAULT_DB_PATH = Path.home() / ".farhost" / "devflow" / "devflow.db"
 
+PROFILE_ENV_VAR = "DEVFLOW_DB_PROFILE"
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """SQLite pragmas applied to every connection opened with this profile."""
+
+    journal_mode: str
+    synchronous: str
+    busy_timeout_ms: int
+    cache_size: int  # pages if positive, KiB if negative
+    mmap_size: int  # bytes; 0 disables memory-mapped I/O
+    temp_store: str
+
+
+PROFILES: dict[str, ConnectionProfile] = {
+    # The TUI: WAL so writes never block `--status` readers, NORMAL sync
+    # (durable at checkpoints, one fsync-free commit per user action), and a
+    # generous cache and mmap window for report queries.
+    "interactive": ConnectionProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        busy_timeout_ms=5000,
+        cache_size=-16384,
+        mmap_size=64 * 1024 * 1024,
+        temp_store="MEMORY",
+    ),
+    # Short-lived headless commands: small footprint, fail fast on locks.
+    "cli": ConnectionProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        busy_timeout_ms=2000,
+        cache_size=-2048,
+        mmap_size=0,
+        temp_store="DEFAULT",
+    ),
+    # Imports and synthetic data: throughput over crash-durability.
+    "bulk": ConnectionProfile(
+        journal_mode="WAL",
+        synchronous="OFF",
+        busy_timeout_ms=30000,
+        cache_size=-262144,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+    ),
+}
+
+DEFAULT_PROFILE = "interactive"
+
 _SEED_PROJECTS = [
     "Architecture",
     "Platform",
@@ -40,38 +98,265 @@ def _schema_sql() -> str:
     return schema_path.read_text()
 
 
-def get_connection(db_path: Path | str | None = None) -> sqlite3.Connection:
-    """Create and return a database connection with schema initialized."""
+def resolve_profile(name: str | None = None) -> ConnectionProfile:
+    """Pick a connection profile.
+
+    ``name``, the caller's explicit choice, wins: a headless command that
+    asks for ``bulk`` gets it. Otherwise ``$DEVFLOW_DB_PROFILE``, so the
+    default can be tuned from the environment without code changes, then
+    ``DEFAULT_PROFILE``.
+    """
+    chosen = name or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+    try:
+        return PROFILES[chosen]
+    except KeyError:
+        raise ValueError(
+            f"Unknown connection profile {chosen!r}; expected one of {sorted(PROFILES)}"
+        ) from None
+
+
+def apply_profile(conn: sqlite3.Connection, profile: ConnectionProfile) -> None:
+    """Apply ``profile``'s pragmas. Must run outside a transaction."""
+    conn.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {profile.synchronous}")
+    conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA cache_size = {int(profile.cache_size)}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)}")
+    conn.execute(f"PRAGMA temp_store = {profile.temp_store}")
+
+
+def get_connection(
+    db_path: Path | str | None = None, *, profile: str | None = None
+) -> sqlite3.Connection:
+    """Create and return a database connection with schema initialized.
+
+    ``profile`` names an entry in ``PROFILES`` (see ``resolve_profile``).
+    With ``$DEVFLOW_TRACE_SQL`` set, the connection records every statement
+    (see ``devflow.db.tracing``).
+    """
     if db_path is None:
         db_path = _DEFAULT_DB_PATH
 
     db_path = Path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(db_path))
+    factory = tracing.TracingConnection if tracing.tracing_enabled() else sqlite3.Connection
+    conn = sqlite3.connect(str(db_path), factory=factory)
     conn.execute("PRAGMA foreign_keys = ON")
     conn.row_factory = sqlite3.Row
+    apply_profile(conn, resolve_profile(profile))
+
+    _ensure_schema(conn)
+
+    return conn
+
 
-    conn.executescript(_schema_sql())
-    _seed_data(conn)
+def get_read_connection(
+    db_path: Path | str | None = None, *, profile: str | None = None
+) -> sqlite3.Connection:
+    """Open a read-only connection to an existing, initialized database.
 
+    Opened with ``mode=ro`` and ``query_only``, so it can never take the
+    write lock; in WAL mode it reads the last committed state while a
+    writer works. ``check_same_thread`` is off so a ``ConnectionPool`` can
+    hand it to any thread, one at a time.
+    """
+    db_path = Path(db_path if db_path is not None else _DEFAULT_DB_PATH)
+    factory = tracing.TracingConnection if tracing.tracing_enabled() else sqlite3.Connection
+    conn = sqlite3.connect(
+        f"{db_path.resolve().as_uri()}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        factory=factory,
+    )
+    conn.row_factory = sqlite3.Row
+    settings = resolve_profile(profile)
+    # journal_mode is the writer's business; a read-only connection can't set it.
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute(f"PRAGMA busy_timeout = {int(settings.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA cache_size = {int(settings.cache_size)}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings.mmap_size)}")
+    conn.execute(f"PRAGMA temp_store = {settings.temp_store}")
     return conn
 
 
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    waits: int = 0  # checkouts that found every connection in use
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def summary(self) -> str:
+        avg = self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+        return (
+            f"read pool: {self.checkouts} checkouts, {self.waits} waited, "
+            f"avg wait {avg:.2f} ms, max wait {self.max_wait_ms:.2f} ms"
+        )
+
+
+class ConnectionPool:
+    """A few read-only connections shared by background readers.
+
+    Connections are opened on demand up to ``size``; ``checkout()`` blocks
+    while all of them are in use and records how long it waited in
+    ``stats``. Writes go through the single writer connection from
+    ``get_connection``, which must have created the database first.
+    """
+
+    def __init__(
+        self, db_path: Path | str | None = None, *, size: int = 2, profile: str | None = None
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.db_path = db_path
+        self.size = size
+        self.profile = profile
+        self.stats = PoolStats()
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self, timeout: float | None) -> tuple[sqlite3.Connection, bool]:
+        try:
+            return self._idle.get_nowait(), False
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = get_read_connection(self.db_path, profile=self.profile)
+                self._all.append(conn)
+                return conn, False
+        try:
+            return self._idle.get(timeout=timeout), True
+        except queue.Empty:
+            raise TimeoutError(f"no pooled connection free after {timeout}s") from None
+
+    @contextmanager
+    def checkout(self, timeout: float | None = None) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the ``with`` block."""
+        started = time.perf_counter()
+        conn, waited = self._acquire(timeout)
+        wait_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self.stats
+            stats.checkouts += 1
+            stats.waits += waited
+            stats.total_wait_ms += wait_ms
+            stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close every connection; call once no checkout is outstanding."""
+        with self._lock:
+            connections, self._all = self._all, []
+        for conn in connections:
+            conn.close()
+        self._idle = queue.LifoQueue()
+
+
 def get_memory_connection() -> sqlite3.Connection:
     """Create an in-memory database connection for testing."""
     conn = sqlite3.connect(":memory:")
     conn.execute("PRAGMA foreign_keys = ON")
     conn.row_factory = sqlite3.Row
 
-    conn.executescript(_schema_sql())
-    _seed_data(conn)
+    _ensure_schema(conn)
 
     return conn
 
 
+@contextmanager
+def unit_of_work(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a block as one transaction: commit on success, roll back on error.
+
+    Scopes nest: if ``conn`` is already inside a transaction (an outer
+    ``unit_of_work``, or one the caller opened), the block joins it and the
+    outermost scope alone commits or rolls back. The outermost scope starts
+    with ``BEGIN IMMEDIATE`` so the write lock is taken up front rather than
+    upgraded mid-transaction, which under WAL can fail with SQLITE_BUSY.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+@contextmanager
+def read_snapshot(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a block's reads against one snapshot of the database.
+
+    Outside a transaction every statement reads whatever was committed when
+    it started, so two queries can disagree about a write that landed
+    between them. This opens a deferred transaction, whose first read fixes
+    the snapshot (under WAL, writers carry on meanwhile), and ends it after
+    the block. Inside an existing transaction the block simply joins it.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.rollback()  # nothing to keep: the block only reads
+
+
+def data_stamp(conn: sqlite3.Connection) -> tuple[int, int]:
+    """A value that changes whenever the database content may have changed.
+
+    ``PRAGMA data_version`` moves when *another* connection commits;
+    ``total_changes`` counts rows changed through ``conn`` itself. Comparing
+    stamps is two cheap calls, so views can skip reloading unchanged data.
+    """
+    return conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    """Bring the schema up to ``migrations.SCHEMA_VERSION``.
+
+    A database that is already current costs a single ``PRAGMA user_version``
+    read; DDL, migrations and seed data only run when the stored version is
+    behind.
+    """
+    if migrations.get_version(conn) >= migrations.SCHEMA_VERSION:
+        return
+
+    with unit_of_work(conn):
+        # Re-read under the write lock: another process may have upgraded it.
+        version = migrations.get_version(conn)
+        if version >= migrations.SCHEMA_VERSION:
+            return
+        has_tables = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'time_entries'"
+        ).fetchone()
+        if version == 0 and has_tables is None:
+            for statement in migrations.split_statements(_schema_sql()):
+                conn.execute(statement)
+        else:
+            migrations.run_migrations(conn, max(version, 1))
+        _seed_data(conn)
+        migrations.set_version(conn, migrations.SCHEMA_VERSION)
+
+
 def _seed_data(conn: sqlite3.Connection) -> None:
-    """Insert default projects and categories if tables are empty."""
+    """Insert default projects and categories if tables are empty.
+
+    Runs inside the schema bootstrap transaction; the caller commits.
+    """
     cursor = conn.execute("SELECT COUNT(*) FROM projects")
     if cursor.fetchone()[0] == 0:
         conn.executemany(
@@ -85,5 +370,3 @@ def _seed_data(conn: sqlite3.Connection) -> None:
             "INSERT INTO categories (name) VALUES (?)",
             [(name,) for name in _SEED_CATEGORIES],
         )
-
-    conn.commit()
@@ -0,0 +1,364 @@
+"""Schema versioning: ordered migrations stamped in ``PRAGMA user_version``.
+
+``schema.sql`` always describes the latest schema and is applied as-is to
+new databases. Existing databases are upgraded by ``MIGRATIONS``, where
+entry ``i`` moves a database from version ``i + 1`` to ``i + 2``. To change
+the schema, edit ``schema.sql`` *and* append a migration; never edit a
+migration that has shipped.
+
+Version 0 means the database predates versioning (or is brand new); an
+unversioned database that already has tables is treated as version 1.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable, Iterator
+
+
+def _migrate_daily_rollups(conn: sqlite3.Connection) -> None:
+    """v1 -> v2: add the trigger-maintained ``daily_rollups`` table."""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS daily_rollups ("
+        "day TEXT NOT NULL, "
+        "project_id INTEGER NOT NULL REFERENCES projects(id), "
+        "category_id INTEGER NOT NULL REFERENCES categories(id), "
+        "seconds INTEGER NOT NULL, "
+        "entries INTEGER NOT NULL, "
+        "PRIMARY KEY (day, project_id, category_id)"
+        ") WITHOUT ROWID"
+    )
+    remove_old = (
+        "UPDATE daily_rollups "
+        "SET seconds = seconds - OLD.duration_seconds, entries = entries - 1 "
+        "WHERE day = date(OLD.start) AND category_id = OLD.category_id "
+        "AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id); "
+        "DELETE FROM daily_rollups "
+        "WHERE day = date(OLD.start) AND category_id = OLD.category_id "
+        "AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id) "
+        "AND entries = 0; "
+    )
+    add_new = (
+        "INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries) "
+        "SELECT date(NEW.start), t.project_id, NEW.category_id, NEW.duration_seconds, 1 "
+        "FROM tasks t WHERE t.id = NEW.task_id "
+        "ON CONFLICT (day, project_id, category_id) DO UPDATE "
+        "SET seconds = seconds + excluded.seconds, entries = entries + 1; "
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_insert "
+        f"AFTER INSERT ON time_entries BEGIN {add_new}END"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_delete "
+        f"AFTER DELETE ON time_entries BEGIN {remove_old}END"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_update "
+        "AFTER UPDATE OF task_id, category_id, start, duration_seconds ON time_entries "
+        f"BEGIN {remove_old}{add_new}END"
+    )
+    # Backfill: existing entries were written before the triggers existed.
+    conn.execute("DELETE FROM daily_rollups")
+    conn.execute(
+        "INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries) "
+        "SELECT date(te.start), t.project_id, te.category_id, "
+        "SUM(te.duration_seconds), COUNT(*) "
+        "FROM time_entries te JOIN tasks t ON te.task_id = t.id "
+        "GROUP BY 1, 2, 3"
+    )
+
+
+def _migrate_change_log(conn: sqlite3.Connection) -> None:
+    """v2 -> v3: add ``db_changes`` and the triggers that bump it."""
+    tables = ("categories", "projects", "tasks", "time_entries", "active_session")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS db_changes ("
+        "table_name TEXT PRIMARY KEY, "
+        "version INTEGER NOT NULL DEFAULT 0"
+        ") WITHOUT ROWID"
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO db_changes (table_name) VALUES (?)",
+        [(table,) for table in tables],
+    )
+    for table in tables:
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_{op.lower()} "
+                f"AFTER {op} ON {table} BEGIN "
+                f"UPDATE db_changes SET version = version + 1 WHERE table_name = '{table}'; "
+                "END"
+            )
+
+
+def _migrate_epoch_timestamps(conn: sqlite3.Connection) -> None:
+    """v3 -> v4: store entry and session times as integer epoch seconds.
+
+    ``time_entries`` trades its text ``start``/``end`` and stored duration for
+    ``start_ts``/``end_ts`` and a ``YYYYMMDD`` ``day``; ``active_session``
+    gets ``start_ts`` and ``daily_rollups.day`` becomes the same integer.
+    The text was local time: ``strftime('%s', ..., 'utc')`` converts it with
+    the machine's time zone rules, as ``datetime.timestamp()`` does.
+
+    Each table is copied with a single ``INSERT ... SELECT`` inside the
+    bootstrap transaction, so WAL readers keep seeing the old tables until
+    it commits, and a failure leaves the database untouched.
+    """
+    (sequence,) = conn.execute(
+        "SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'time_entries'"
+    ).fetchone()
+    conn.execute(
+        "CREATE TABLE time_entries_v4 ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "task_id INTEGER NOT NULL REFERENCES tasks(id), "
+        "category_id INTEGER NOT NULL REFERENCES categories(id), "
+        "start_ts INTEGER NOT NULL, "
+        "end_ts INTEGER NOT NULL, "
+        "day INTEGER NOT NULL"
+        ")"
+    )
+    conn.execute(
+        "INSERT INTO time_entries_v4 (id, task_id, category_id, start_ts, end_ts, day) "
+        "SELECT id, task_id, category_id, "
+        "CAST(strftime('%s', start, 'utc') AS INTEGER), "
+        "CAST(strftime('%s', end, 'utc') AS INTEGER), "
+        "CAST(strftime('%Y%m%d', start) AS INTEGER) "
+        "FROM time_entries ORDER BY id"
+    )
+    # Dropping the table drops its indexes and triggers too.
+    conn.execute("DROP TABLE time_entries")
+    conn.execute("ALTER TABLE time_entries_v4 RENAME TO time_entries")
+    # Keep ids of deleted trailing entries from being handed out again.
+    conn.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'time_entries'",
+        (sequence,),
+    )
+    conn.execute("CREATE INDEX idx_time_entries_start ON time_entries(start_ts)")
+    conn.execute("CREATE INDEX idx_time_entries_task_id ON time_entries(task_id)")
+    conn.execute("CREATE INDEX idx_time_entries_category_id ON time_entries(category_id)")
+
+    conn.execute(
+        "CREATE TABLE active_session_v4 ("
+        "id INTEGER PRIMARY KEY CHECK (id = 1), "
+        "task_id INTEGER NOT NULL REFERENCES tasks(id), "
+        "category_id INTEGER NOT NULL REFERENCES categories(id), "
+        "start_ts INTEGER NOT NULL"
+        ")"
+    )
+    conn.execute(
+        "INSERT INTO active_session_v4 (id, task_id, category_id, start_ts) "
+        "SELECT id, task_id, category_id, CAST(strftime('%s', start_time, 'utc') AS INTEGER) "
+        "FROM active_session"
+    )
+    conn.execute("DROP TABLE active_session")
+    conn.execute("ALTER TABLE active_session_v4 RENAME TO active_session")
+
+    conn.execute("DROP TABLE daily_rollups")
+    conn.execute(
+        "CREATE TABLE daily_rollups ("
+        "day INTEGER NOT NULL, "
+        "project_id INTEGER NOT NULL REFERENCES projects(id), "
+        "category_id INTEGER NOT NULL REFERENCES categories(id), "
+        "seconds INTEGER NOT NULL, "
+        "entries INTEGER NOT NULL, "
+        "PRIMARY KEY (day, project_id, category_id)"
+        ") WITHOUT ROWID"
+    )
+    remove_old = (
+        "UPDATE daily_rollups "
+        "SET seconds = seconds - (OLD.end_ts - OLD.start_ts), entries = entries - 1 "
+        "WHERE day = OLD.day AND category_id = OLD.category_id "
+        "AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id); "
+        "DELETE FROM daily_rollups "
+        "WHERE day = OLD.day AND category_id = OLD.category_id "
+        "AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id) "
+        "AND entries = 0; "
+    )
+    add_new = (
+        "INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries) "
+        "SELECT NEW.day, t.project_id, NEW.category_id, NEW.end_ts - NEW.start_ts, 1 "
+        "FROM tasks t WHERE t.id = NEW.task_id "
+        "ON CONFLICT (day, project_id, category_id) DO UPDATE "
+        "SET seconds = seconds + excluded.seconds, entries = entries + 1; "
+    )
+    conn.execute(
+        "CREATE TRIGGER trg_time_entries_rollup_insert "
+        f"AFTER INSERT ON time_entries BEGIN {add_new}END"
+    )
+    conn.execute(
+        "CREATE TRIGGER trg_time_entries_rollup_delete "
+        f"AFTER DELETE ON time_entries BEGIN {remove_old}END"
+    )
+    conn.execute(
+        "CREATE TRIGGER trg_time_entries_rollup_update "
+        "AFTER UPDATE OF task_id, category_id, start_ts, end_ts, day ON time_entries "
+        f"BEGIN {remove_old}{add_new}END"
+    )
+    conn.execute(
+        "INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries) "
+        "SELECT te.day, t.project_id, te.category_id, "
+        "SUM(te.end_ts - te.start_ts), COUNT(*) "
+        "FROM time_entries te JOIN tasks t ON te.task_id = t.id "
+        "GROUP BY 1, 2, 3"
+    )
+
+    # Restores the change-log triggers dropped with the two rebuilt tables,
+    # then tells running watchers both tables changed under them.
+    _migrate_change_log(conn)
+    conn.execute(
+        "UPDATE db_changes SET version = version + 1 "
+        "WHERE table_name IN ('time_entries', 'active_session')"
+    )
+
+
+def _migrate_content_hash(conn: sqlite3.Connection) -> None:
+    """v4 -> v5: add ``time_entries.content_hash`` for idempotent imports."""
+    conn.execute("ALTER TABLE time_entries ADD COLUMN content_hash INTEGER")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_time_entries_content_hash "
+        "ON time_entries(content_hash) WHERE content_hash IS NOT NULL"
+    )
+
+
+def _migrate_change_journal(conn: sqlite3.Connection) -> None:
+    """v5 -> v6: add ``time_entry_changes`` and ``export_watermarks``.
+
+    No backfill: existing entries get a journal row when they next change,
+    and no export can have a watermark from before the journal.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS time_entry_changes ("
+        "entry_id INTEGER PRIMARY KEY, "
+        "seq INTEGER NOT NULL, "
+        "start_ts INTEGER NOT NULL, "
+        "end_ts INTEGER NOT NULL"
+        ")"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_time_entry_changes_seq ON time_entry_changes(seq)"
+    )
+    next_seq = "(SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes)"
+    record = (
+        "INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts) "
+        f"VALUES ({{row}}.id, {next_seq}, {{row}}.start_ts, {{row}}.end_ts) "
+        "ON CONFLICT (entry_id) DO UPDATE "
+        "SET seq = excluded.seq, start_ts = excluded.start_ts, end_ts = excluded.end_ts; "
+    )
+    for op, event, row in (
+        ("insert", "INSERT", "NEW"),
+        ("update", "UPDATE OF task_id, category_id, start_ts, end_ts", "NEW"),
+        ("delete", "DELETE", "OLD"),
+    ):
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_time_entries_journal_{op} "
+            f"AFTER {event} ON time_entries BEGIN {record.format(row=row)}END"
+        )
+    for table, entries in (
+        ("tasks", "task_id = NEW.id"),
+        ("projects", "task_id IN (SELECT id FROM tasks WHERE project_id = NEW.id)"),
+        ("categories", "category_id = NEW.id"),
+    ):
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_journal_rename "
+            f"AFTER UPDATE OF name ON {table} WHEN NEW.name IS NOT OLD.name BEGIN "
+            "INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts) "
+            f"SELECT id, {next_seq}, start_ts, end_ts FROM time_entries WHERE {entries} "
+            "ON CONFLICT (entry_id) DO UPDATE SET seq = excluded.seq; "
+            "END"
+        )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS export_watermarks ("
+        "name TEXT PRIMARY KEY, "
+        "seq INTEGER NOT NULL"
+        ") WITHOUT ROWID"
+    )
+
+
+def _migrate_bulk_insert_switch(conn: sqlite3.Connection) -> None:
+    """v6 -> v7: let bulk inserts switch the ``time_entries`` insert triggers off.
+
+    Adds the one-row ``bulk_insert`` table and recreates the rollup,
+    change-log and change-journal insert triggers with a ``WHEN`` clause
+    that skips them while it is set.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS bulk_insert ("
+        "id INTEGER PRIMARY KEY CHECK (id = 1), "
+        "active INTEGER NOT NULL DEFAULT 0"
+        ")"
+    )
+    conn.execute("INSERT OR IGNORE INTO bulk_insert (id) VALUES (1)")
+    bodies = {
+        "rollup": (
+            "INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries) "
+            "SELECT NEW.day, t.project_id, NEW.category_id, NEW.end_ts - NEW.start_ts, 1 "
+            "FROM tasks t WHERE t.id = NEW.task_id "
+            "ON CONFLICT (day, project_id, category_id) DO UPDATE "
+            "SET seconds = seconds + excluded.seconds, entries = entries + 1; "
+        ),
+        "changes": (
+            "UPDATE db_changes SET version = version + 1 WHERE table_name = 'time_entries'; "
+        ),
+        "journal": (
+            "INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts) "
+            "VALUES (NEW.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes), "
+            "NEW.start_ts, NEW.end_ts) "
+            "ON CONFLICT (entry_id) DO UPDATE "
+            "SET seq = excluded.seq, start_ts = excluded.start_ts, end_ts = excluded.end_ts; "
+        ),
+    }
+    for name, body in bodies.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_time_entries_{name}_insert")
+        conn.execute(
+            f"CREATE TRIGGER trg_time_entries_{name}_insert "
+            "AFTER INSERT ON time_entries "
+            f"WHEN (SELECT active FROM bulk_insert) IS NOT 1 BEGIN {body}END"
+        )
+
+
+MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _migrate_daily_rollups,
+    _migrate_change_log,
+    _migrate_epoch_timestamps,
+    _migrate_content_hash,
+    _migrate_change_journal,
+    _migrate_bulk_insert_switch,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS) + 1
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def set_version(conn: sqlite3.Connection, version: int) -> None:
+    # PRAGMA arguments cannot be bound parameters.
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def run_migrations(conn: sqlite3.Connection, from_version: int) -> int:
+    """Apply every migration after ``from_version`` in order.
+
+    Must be called inside the caller's transaction. Returns the new version.
+    """
+    for index in range(from_version - 1, len(MIGRATIONS)):
+        MIGRATIONS[index](conn)
+    return SCHEMA_VERSION
+
+
+def split_statements(script: str) -> Iterator[str]:
+    """Yield the complete SQL statements in ``script``, trigger bodies intact.
+
+    Unlike ``executescript`` this lets a script run inside an open
+    transaction.
+    """
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            buffer = ""
+            if statement.rstrip(";").strip():
+                yield statement
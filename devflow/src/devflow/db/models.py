@@ -1,25 +1,33 @@
-"""Data models for DevFlow entities."""
+"""Data models for DevFlow entities.
+
+The models are slotted: no per-instance ``__dict__``, so a listing of
+thousands of entries costs a fixed-size object per row. ``queries`` builds
+them positionally from each row, so field order matches the columns it
+selects.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     id: int
     name: str
     archived_at: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     id: int
     name: str
     archived_at: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: int
     project_id: int
@@ -27,19 +35,70 @@ class Task:
     archived_at: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeEntry:
     id: int
     task_id: int
     category_id: int
-    start: str
-    end: str
+    start: datetime
+    end: datetime
     duration_seconds: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ActiveSession:
     id: int
     task_id: int
     category_id: int
-    start_time: str
+    start_time: datetime
+
+
+@dataclass(slots=True)
+class ActiveSessionDetail:
+    """An active session joined with its project, task and category names."""
+
+    id: int
+    task_id: int
+    category_id: int
+    start_time: datetime
+    project_name: str | None
+    task_name: str
+    category_name: str
+
+
+@dataclass(slots=True)
+class TimeEntryDetail:
+    """A time entry joined with its project, task and category names."""
+
+    id: int
+    task_id: int
+    category_id: int
+    start: datetime
+    end: datetime
+    duration_seconds: int
+    project_name: str
+    task_name: str
+    category_name: str
+
+
+def _int_column() -> array:
+    return array("q")
+
+
+@dataclass(slots=True)
+class TimeEntryColumns:
+    """Time entries as parallel columns of 64-bit integers.
+
+    For listings too large to materialize as ``TimeEntry`` objects: each
+    entry costs 40 bytes and no Python objects. Times are POSIX seconds, as
+    stored (see ``devflow.db.timestamps``).
+    """
+
+    id: array = field(default_factory=_int_column)
+    task_id: array = field(default_factory=_int_column)
+    category_id: array = field(default_factory=_int_column)
+    start_ts: array = field(default_factory=_int_column)
+    end_ts: array = field(default_factory=_int_column)
+
+    def __len__(self) -> int:
+        return len(self.id)
@@ -3,15 +3,93 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime
+from itertools import islice
+from typing import Any
 
+from devflow.db.connection import unit_of_work
 from devflow.db.models import (
     ActiveSession,
+    ActiveSessionDetail,
     Category,
     Project,
     Task,
     TimeEntry,
+    TimeEntryColumns,
+    TimeEntryDetail,
 )
+from devflow.db.timestamps import day_bounds, day_key, from_day_key, from_epoch, to_epoch
+
+
+# ---------------------------------------------------------------------------
+# Row factories
+# ---------------------------------------------------------------------------
+#
+# Connections default to ``sqlite3.Row``. Reads here instead run on a cursor
+# whose ``row_factory`` builds the model straight from SQLite's row tuple,
+# with no ``Row`` or dict in between.
+
+def _cursor(
+    conn: sqlite3.Connection, row_factory: Callable[[sqlite3.Cursor, tuple], Any] | None
+) -> sqlite3.Cursor:
+    """A new cursor whose rows are built by ``row_factory``; ``None`` means tuples.
+
+    Callers run ``execute`` on it themselves, so SQL tracing attributes the
+    statement to them.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = row_factory
+    return cursor
+
+
+def _model_row(model: Callable[..., Any]) -> Callable[[sqlite3.Cursor, tuple], Any]:
+    """A ``row_factory`` passing the selected columns to ``model`` in order."""
+    def factory(_cursor: sqlite3.Cursor, row: tuple) -> Any:
+        return model(*row)
+    return factory
+
+
+_project_row = _model_row(Project)
+_task_row = _model_row(Task)
+_category_row = _model_row(Category)
+
+
+def _entry_row(_cursor: sqlite3.Cursor | None, row: tuple) -> TimeEntry:
+    """Build a ``TimeEntry`` from ``id, task_id, category_id, start_ts, end_ts``."""
+    entry_id, task_id, category_id, start_ts, end_ts = row
+    return TimeEntry(
+        entry_id, task_id, category_id, from_epoch(start_ts), from_epoch(end_ts), end_ts - start_ts
+    )
+
+
+def _entry_detail_row(_cursor: sqlite3.Cursor, row: tuple) -> TimeEntryDetail:
+    """``_entry_row`` followed by project, task and category names."""
+    (
+        entry_id, task_id, category_id, start_ts, end_ts,
+        project_name, task_name, category_name,
+    ) = row
+    return TimeEntryDetail(
+        entry_id, task_id, category_id, from_epoch(start_ts), from_epoch(end_ts),
+        end_ts - start_ts, project_name, task_name, category_name,
+    )
+
+
+def _session_row(_cursor: sqlite3.Cursor, row: tuple) -> ActiveSession:
+    session_id, task_id, category_id, start_ts = row
+    return ActiveSession(session_id, task_id, category_id, from_epoch(start_ts))
+
+
+def _session_detail_row(_cursor: sqlite3.Cursor, row: tuple) -> ActiveSessionDetail:
+    session_id, task_id, category_id, start_ts, project_name, task_name, category_name = row
+    return ActiveSessionDetail(
+        session_id, task_id, category_id, from_epoch(start_ts),
+        project_name, task_name, category_name,
+    )
+
+
+def _day_total_row(_cursor: sqlite3.Cursor, row: tuple) -> tuple[date, int]:
+    return from_day_key(row[0]), row[1]
 
 
 # ---------------------------------------------------------------------------
@@ -20,59 +98,56 @@ from devflow.db.models import (
 
 def list_projects(conn: sqlite3.Connection, *, include_archived: bool = False) -> list[Project]:
     if include_archived:
-        rows = conn.execute(
+        return _cursor(conn, _project_row).execute(
             "SELECT id, name, archived_at FROM projects WHERE archived_at IS NOT NULL ORDER BY name ASC"
         ).fetchall()
-    else:
-        rows = conn.execute(
-            "SELECT id, name, archived_at FROM projects WHERE archived_at IS NULL ORDER BY name ASC"
-        ).fetchall()
-    return [Project(**dict(r)) for r in rows]
+    return _cursor(conn, _project_row).execute(
+        "SELECT id, name, archived_at FROM projects WHERE archived_at IS NULL ORDER BY name ASC"
+    ).fetchall()
 
 
 def get_project(conn: sqlite3.Connection, project_id: int) -> Project | None:
-    row = conn.execute(
+    return _cursor(conn, _project_row).execute(
         "SELECT id, name, archived_at FROM projects WHERE id = ?", (project_id,)
     ).fetchone()
-    return Project(**dict(row)) if row else None
 
 
 def create_project(conn: sqlite3.Connection, name: str) -> Project:
-    cursor = conn.execute("INSERT INTO projects (name) VALUES (?)", (name,))
-    conn.commit()
+    with unit_of_work(conn):
+        cursor = conn.execute("INSERT INTO projects (name) VALUES (?)", (name,))
     return Project(id=cursor.lastrowid, name=name)
 
 
 def update_project(conn: sqlite3.Connection, project_id: int, name: str) -> None:
-    conn.execute("UPDATE projects SET name = ? WHERE id = ?", (name, project_id))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE projects SET name = ? WHERE id = ?", (name, project_id))
 
 
 def archive_project(conn: sqlite3.Connection, project_id: int) -> None:
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    conn.execute("UPDATE projects SET archived_at = ? WHERE id = ?", (now, project_id))
-    conn.execute(
-        "UPDATE tasks SET archived_at = ? WHERE project_id = ? AND archived_at IS NULL",
-        (now, project_id),
-    )
-    # Stop active session if it references a task in this project
-    conn.execute(
-        "DELETE FROM active_session WHERE task_id IN "
-        "(SELECT id FROM tasks WHERE project_id = ?)",
-        (project_id,),
-    )
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE projects SET archived_at = ? WHERE id = ?", (now, project_id))
+        conn.execute(
+            "UPDATE tasks SET archived_at = ? WHERE project_id = ? AND archived_at IS NULL",
+            (now, project_id),
+        )
+        # Stop active session if it references a task in this project
+        conn.execute(
+            "DELETE FROM active_session WHERE task_id IN "
+            "(SELECT id FROM tasks WHERE project_id = ?)",
+            (project_id,),
+        )
 
 
 def restore_project(conn: sqlite3.Connection, project_id: int) -> None:
-    project = get_project(conn, project_id)
-    if project and project.archived_at:
-        conn.execute(
-            "UPDATE tasks SET archived_at = NULL WHERE project_id = ? AND archived_at = ?",
-            (project_id, project.archived_at),
-        )
-        conn.execute("UPDATE projects SET archived_at = NULL WHERE id = ?", (project_id,))
-        conn.commit()
+    with unit_of_work(conn):
+        project = get_project(conn, project_id)
+        if project and project.archived_at:
+            conn.execute(
+                "UPDATE tasks SET archived_at = NULL WHERE project_id = ? AND archived_at = ?",
+                (project_id, project.archived_at),
+            )
+            conn.execute("UPDATE projects SET archived_at = NULL WHERE id = ?", (project_id,))
 
 
 # ---------------------------------------------------------------------------
@@ -86,50 +161,47 @@ def list_tasks(
     include_archived: bool = False,
 ) -> list[Task]:
     if include_archived:
-        rows = conn.execute(
+        return _cursor(conn, _task_row).execute(
             "SELECT id, project_id, name, archived_at FROM tasks "
             "WHERE project_id = ? AND archived_at IS NOT NULL ORDER BY name ASC",
             (project_id,),
         ).fetchall()
-    else:
-        rows = conn.execute(
-            "SELECT id, project_id, name, archived_at FROM tasks "
-            "WHERE project_id = ? AND archived_at IS NULL ORDER BY name ASC",
-            (project_id,),
-        ).fetchall()
-    return [Task(**dict(r)) for r in rows]
+    return _cursor(conn, _task_row).execute(
+        "SELECT id, project_id, name, archived_at FROM tasks "
+        "WHERE project_id = ? AND archived_at IS NULL ORDER BY name ASC",
+        (project_id,),
+    ).fetchall()
 
 
 def get_task(conn: sqlite3.Connection, task_id: int) -> Task | None:
-    row = conn.execute(
+    return _cursor(conn, _task_row).execute(
         "SELECT id, project_id, name, archived_at FROM tasks WHERE id = ?", (task_id,)
     ).fetchone()
-    return Task(**dict(row)) if row else None
 
 
 def create_task(conn: sqlite3.Connection, project_id: int, name: str) -> Task:
-    cursor = conn.execute(
-        "INSERT INTO tasks (project_id, name) VALUES (?, ?)", (project_id, name)
-    )
-    conn.commit()
+    with unit_of_work(conn):
+        cursor = conn.execute(
+            "INSERT INTO tasks (project_id, name) VALUES (?, ?)", (project_id, name)
+        )
     return Task(id=cursor.lastrowid, project_id=project_id, name=name)
 
 
 def update_task(conn: sqlite3.Connection, task_id: int, name: str) -> None:
-    conn.execute("UPDATE tasks SET name = ? WHERE id = ?", (name, task_id))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE tasks SET name = ? WHERE id = ?", (name, task_id))
 
 
 def archive_task(conn: sqlite3.Connection, task_id: int) -> None:
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    conn.execute("UPDATE tasks SET archived_at = ? WHERE id = ?", (now, task_id))
-    conn.execute("DELETE FROM active_session WHERE task_id = ?", (task_id,))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE tasks SET archived_at = ? WHERE id = ?", (now, task_id))
+        conn.execute("DELETE FROM active_session WHERE task_id = ?", (task_id,))
 
 
 def restore_task(conn: sqlite3.Connection, task_id: int) -> None:
-    conn.execute("UPDATE tasks SET archived_at = NULL WHERE id = ?", (task_id,))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE tasks SET archived_at = NULL WHERE id = ?", (task_id,))
 
 
 # ---------------------------------------------------------------------------
@@ -140,94 +212,435 @@ def list_categories(
     conn: sqlite3.Connection, *, include_archived: bool = False
 ) -> list[Category]:
     if include_archived:
-        rows = conn.execute(
+        return _cursor(conn, _category_row).execute(
             "SELECT id, name, archived_at FROM categories WHERE archived_at IS NOT NULL ORDER BY name ASC"
         ).fetchall()
-    else:
-        rows = conn.execute(
-            "SELECT id, name, archived_at FROM categories WHERE archived_at IS NULL ORDER BY name ASC"
-        ).fetchall()
-    return [Category(**dict(r)) for r in rows]
+    return _cursor(conn, _category_row).execute(
+        "SELECT id, name, archived_at FROM categories WHERE archived_at IS NULL ORDER BY name ASC"
+    ).fetchall()
 
 
 def get_category(conn: sqlite3.Connection, category_id: int) -> Category | None:
-    row = conn.execute(
+    return _cursor(conn, _category_row).execute(
         "SELECT id, name, archived_at FROM categories WHERE id = ?", (category_id,)
     ).fetchone()
-    return Category(**dict(row)) if row else None
 
 
 def create_category(conn: sqlite3.Connection, name: str) -> Category:
-    cursor = conn.execute("INSERT INTO categories (name) VALUES (?)", (name,))
-    conn.commit()
+    with unit_of_work(conn):
+        cursor = conn.execute("INSERT INTO categories (name) VALUES (?)", (name,))
     return Category(id=cursor.lastrowid, name=name)
 
 
 def update_category(conn: sqlite3.Connection, category_id: int, name: str) -> None:
-    conn.execute("UPDATE categories SET name = ? WHERE id = ?", (name, category_id))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE categories SET name = ? WHERE id = ?", (name, category_id))
 
 
 def archive_category(conn: sqlite3.Connection, category_id: int) -> None:
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    conn.execute("UPDATE categories SET archived_at = ? WHERE id = ?", (now, category_id))
-    conn.execute("DELETE FROM active_session WHERE category_id = ?", (category_id,))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE categories SET archived_at = ? WHERE id = ?", (now, category_id))
+        conn.execute("DELETE FROM active_session WHERE category_id = ?", (category_id,))
 
 
 def restore_category(conn: sqlite3.Connection, category_id: int) -> None:
-    conn.execute("UPDATE categories SET archived_at = NULL WHERE id = ?", (category_id,))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("UPDATE categories SET archived_at = NULL WHERE id = ?", (category_id,))
 
 
 # ---------------------------------------------------------------------------
 # Time Entries
 # ---------------------------------------------------------------------------
 
-def list_time_entries_for_date(conn: sqlite3.Connection, date_str: str) -> list[TimeEntry]:
-    """Get all time entries for a given date (YYYY-MM-DD), sorted chronologically."""
-    rows = conn.execute(
-        "SELECT id, task_id, category_id, start, end, duration_seconds "
-        "FROM time_entries WHERE date(start) = ? ORDER BY start ASC",
-        (date_str,),
+def list_time_entries_for_date(conn: sqlite3.Connection, day: date) -> list[TimeEntry]:
+    """Get all time entries starting on a given local day, sorted chronologically.
+
+    Filters on the day's epoch bounds rather than the ``day`` column so
+    SQLite can range-scan ``idx_time_entries_start`` in time order.
+    """
+    return _cursor(conn, _entry_row).execute(
+        "SELECT id, task_id, category_id, start_ts, end_ts "
+        "FROM time_entries WHERE start_ts >= ? AND start_ts < ? ORDER BY start_ts ASC",
+        day_bounds(day),
+    ).fetchall()
+
+
+def list_time_entry_details_for_date(
+    conn: sqlite3.Connection, day: date
+) -> list[TimeEntryDetail]:
+    """Get a day's entries with project, task and category names, in one query.
+
+    Sorted chronologically. Archived entities still resolve, so historical
+    entries keep their original names; an entry whose task, project or
+    category no longer resolves is still listed, with ``"?"`` for the name.
+    """
+    return _cursor(conn, _entry_detail_row).execute(
+        "SELECT te.id, te.task_id, te.category_id, te.start_ts, te.end_ts, "
+        "COALESCE(p.name, '?'), COALESCE(t.name, '?'), COALESCE(c.name, '?') "
+        "FROM time_entries te "
+        "LEFT JOIN tasks t ON te.task_id = t.id "
+        "LEFT JOIN projects p ON t.project_id = p.id "
+        "LEFT JOIN categories c ON te.category_id = c.id "
+        "WHERE te.start_ts >= ? AND te.start_ts < ? ORDER BY te.start_ts ASC",
+        day_bounds(day),
     ).fetchall()
-    return [TimeEntry(**dict(r)) for r in rows]
 
 
 def list_time_entries_for_range(
-    conn: sqlite3.Connection, start: str, end: str
+    conn: sqlite3.Connection, start: datetime, end: datetime
 ) -> list[TimeEntry]:
-    """Get all time entries within a date range [start, end), sorted chronologically."""
-    rows = conn.execute(
-        "SELECT id, task_id, category_id, start, end, duration_seconds "
-        "FROM time_entries WHERE start >= ? AND start < ? ORDER BY start ASC",
-        (start, end),
+    """Get all time entries starting within [start, end), sorted chronologically."""
+    return _cursor(conn, _entry_row).execute(
+        "SELECT id, task_id, category_id, start_ts, end_ts "
+        "FROM time_entries WHERE start_ts >= ? AND start_ts < ? ORDER BY start_ts ASC",
+        (to_epoch(start), to_epoch(end)),
     ).fetchall()
-    return [TimeEntry(**dict(r)) for r in rows]
+
+
+_COLUMN_CHUNK = 4096
+
+
+def list_time_entry_columns_for_range(
+    conn: sqlite3.Connection, start: datetime, end: datetime
+) -> TimeEntryColumns:
+    """``list_time_entries_for_range`` as integer columns, for large ranges.
+
+    Rows are fetched ``_COLUMN_CHUNK`` at a time and appended to the
+    arrays, so no per-entry object outlives its chunk.
+    """
+    columns = TimeEntryColumns()
+    arrays = (columns.id, columns.task_id, columns.category_id, columns.start_ts, columns.end_ts)
+    cursor = _cursor(conn, None).execute(
+        "SELECT id, task_id, category_id, start_ts, end_ts "
+        "FROM time_entries WHERE start_ts >= ? AND start_ts < ? ORDER BY start_ts ASC",
+        (to_epoch(start), to_epoch(end)),
+    )
+    while rows := cursor.fetchmany(_COLUMN_CHUNK):
+        for column, values in zip(arrays, zip(*rows)):
+            column.extend(values)
+    return columns
+
+
+def iter_time_entries_for_export(
+    conn: sqlite3.Connection,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    *,
+    project: str | None = None,
+    category: str | None = None,
+) -> Iterator[tuple[int, str, str, int, str, str, str]]:
+    """Stream entries with their names, chronologically, for ``devflow export``.
+
+    Yields (id, start, end, duration_seconds, project, task, category) with
+    times as local ``YYYY-MM-DD HH:MM:SS`` text formatted by SQLite, so a
+    writer can pass rows straight through. Rows come off the cursor one at
+    a time; nothing is materialized. ``start``/``end`` bound the entry's
+    start, half-open, and either may be omitted; ``project`` and
+    ``category`` match names exactly.
+    """
+    clauses: list[str] = []
+    parameters: list[int | str] = []
+    if start is not None:
+        clauses.append("te.start_ts >= ?")
+        parameters.append(to_epoch(start))
+    if end is not None:
+        clauses.append("te.start_ts < ?")
+        parameters.append(to_epoch(end))
+    if project is not None:
+        clauses.append("p.name = ?")
+        parameters.append(project)
+    if category is not None:
+        clauses.append("c.name = ?")
+        parameters.append(category)
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    return _cursor(conn, None).execute(
+        "SELECT te.id, "
+        "strftime('%Y-%m-%d %H:%M:%S', te.start_ts, 'unixepoch', 'localtime'), "
+        "strftime('%Y-%m-%d %H:%M:%S', te.end_ts, 'unixepoch', 'localtime'), "
+        "te.end_ts - te.start_ts, p.name, t.name, c.name "
+        "FROM time_entries te "
+        "JOIN tasks t ON te.task_id = t.id "
+        "JOIN projects p ON t.project_id = p.id "
+        "JOIN categories c ON te.category_id = c.id "
+        f"{where}ORDER BY te.start_ts ASC, te.id ASC",
+        parameters,
+    )
+
+
+def iter_time_entries_for_calendar(
+    conn: sqlite3.Connection,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    *,
+    after_seq: int | None = None,
+    up_to_seq: int | None = None,
+) -> Iterator[tuple[int, str, str, str | None, str | None, str | None, int]]:
+    """Stream entries for ``devflow ics`` as (id, start, end, project, task, category, seq).
+
+    Times are UTC ``YYYYMMDDTHHMMSSZ`` text, as iCalendar writes them, and
+    ``seq`` is the entry's ``time_entry_changes.seq`` (0 if it has not
+    changed since the journal began). ``start``/``end`` bound the entry's
+    start, half-open. Like ``iter_time_entries_for_export``, rows come
+    straight off the cursor.
+
+    With ``after_seq``, yields only entries changed after that seq (and up
+    to ``up_to_seq``), in change order. This reads the journal through its
+    seq index, so it costs in proportion to the changes, not the history.
+    Deleted entries come through too, with their last times and None for
+    the names. A range cannot be combined with ``after_seq`` (ValueError):
+    the journal only has an entry's new times, so an entry moved out of the
+    range would silently stay in a calendar that had it.
+    """
+    clauses: list[str] = []
+    parameters: list[int] = []
+    if after_seq is not None:
+        if start is not None or end is not None:
+            raise ValueError("a date range cannot be combined with an incremental export")
+        clauses.append("ch.seq > ?")
+        parameters.append(after_seq)
+        if up_to_seq is not None:
+            clauses.append("ch.seq <= ?")
+            parameters.append(up_to_seq)
+    if start is not None:
+        clauses.append("te.start_ts >= ?")
+        parameters.append(to_epoch(start))
+    if end is not None:
+        clauses.append("te.start_ts < ?")
+        parameters.append(to_epoch(end))
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    if after_seq is not None:
+        return _cursor(conn, None).execute(
+            "SELECT ch.entry_id, "
+            "strftime('%Y%m%dT%H%M%SZ', ch.start_ts, 'unixepoch'), "
+            "strftime('%Y%m%dT%H%M%SZ', ch.end_ts, 'unixepoch'), "
+            "p.name, t.name, c.name, ch.seq "
+            "FROM time_entry_changes ch "
+            "LEFT JOIN time_entries te ON te.id = ch.entry_id "
+            "LEFT JOIN tasks t ON te.task_id = t.id "
+            "LEFT JOIN projects p ON t.project_id = p.id "
+            "LEFT JOIN categories c ON te.category_id = c.id "
+            f"{where}ORDER BY ch.seq ASC",
+            parameters,
+        )
+    return _cursor(conn, None).execute(
+        "SELECT te.id, "
+        "strftime('%Y%m%dT%H%M%SZ', te.start_ts, 'unixepoch'), "
+        "strftime('%Y%m%dT%H%M%SZ', te.end_ts, 'unixepoch'), "
+        "p.name, t.name, c.name, COALESCE(ch.seq, 0) "
+        "FROM time_entries te "
+        "JOIN tasks t ON te.task_id = t.id "
+        "JOIN projects p ON t.project_id = p.id "
+        "JOIN categories c ON te.category_id = c.id "
+        "LEFT JOIN time_entry_changes ch ON ch.entry_id = te.id "
+        f"{where}ORDER BY te.start_ts ASC, te.id ASC",
+        parameters,
+    )
+
+
+def time_entry_change_seq(conn: sqlite3.Connection) -> int:
+    """The latest ``time_entry_changes.seq``; 0 before any change."""
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM time_entry_changes").fetchone()[0]
+
+
+def get_export_watermark(conn: sqlite3.Connection, name: str) -> int | None:
+    """The seq the incremental export ``name`` last covered, or None if it never ran."""
+    row = conn.execute("SELECT seq FROM export_watermarks WHERE name = ?", (name,)).fetchone()
+    return row[0] if row is not None else None
+
+
+def set_export_watermark(conn: sqlite3.Connection, name: str, seq: int) -> None:
+    """Record that the incremental export ``name`` has covered changes up to ``seq``.
+
+    A deleted entry's journal row is only needed until every watermark has
+    sent its cancellation, so rows of deleted entries at or below the
+    lowest watermark are pruned here, however the watermarks got there.
+    The row with the highest seq is kept whatever it holds, as the next
+    change's seq counts up from it.
+    """
+    with unit_of_work(conn):
+        conn.execute(
+            "INSERT INTO export_watermarks (name, seq) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET seq = excluded.seq",
+            (name, seq),
+        )
+        conn.execute(
+            "DELETE FROM time_entry_changes "
+            "WHERE seq <= (SELECT MIN(seq) FROM export_watermarks) "
+            "AND seq < (SELECT MAX(seq) FROM time_entry_changes) "
+            "AND NOT EXISTS (SELECT 1 FROM time_entries te WHERE te.id = entry_id)"
+        )
+
+
+# (task_id, category_id, start_ts, end_ts, day), in column order; see
+# ``new_time_entry``. Bulk callers may build these directly from integers.
+NewTimeEntry = tuple[int, int, int, int, int]
+
+
+def new_time_entry(
+    task_id: int, category_id: int, start: datetime, end: datetime
+) -> NewTimeEntry:
+    """The stored form of an entry from ``start`` to ``end`` (local datetimes)."""
+    return (task_id, category_id, to_epoch(start), to_epoch(end), day_key(start.date()))
 
 
 def create_time_entry(
     conn: sqlite3.Connection,
     task_id: int,
     category_id: int,
-    start: str,
-    end: str,
-    duration_seconds: int,
+    start: datetime,
+    end: datetime,
 ) -> TimeEntry:
-    cursor = conn.execute(
-        "INSERT INTO time_entries (task_id, category_id, start, end, duration_seconds) "
-        "VALUES (?, ?, ?, ?, ?)",
-        (task_id, category_id, start, end, duration_seconds),
-    )
-    conn.commit()
-    return TimeEntry(
-        id=cursor.lastrowid,
-        task_id=task_id,
-        category_id=category_id,
-        start=start,
-        end=end,
-        duration_seconds=duration_seconds,
-    )
+    row = new_time_entry(task_id, category_id, start, end)
+    with unit_of_work(conn):
+        cursor = conn.execute(
+            "INSERT INTO time_entries (task_id, category_id, start_ts, end_ts, day) "
+            "VALUES (?, ?, ?, ?, ?)",
+            row,
+        )
+    return _entry_row(None, (cursor.lastrowid, *row[:4]))
+
+
+# Below this many rows the per-row insert triggers are cheaper than the
+# grouped statements that replace them.
+_BULK_INSERT_MIN_ROWS = 256
+_ENTRY_COLUMNS = "task_id, category_id, start_ts, end_ts, day"
+
+
+def _insert_entry_chunk(
+    conn: sqlite3.Connection, chunk: list[tuple], *, imported: bool = False
+) -> tuple[int, int]:
+    """Insert ``chunk`` in one transaction; returns (first_id, inserted).
+
+    Rows are ``NewTimeEntry`` tuples, or ``ImportedTimeEntry`` ones with
+    ``imported``, which skips records already imported. New rows get ids
+    counting up from ``first_id`` (consecutive unless some are skipped).
+
+    The rows are staged in a temporary table and moved with a single
+    ``INSERT ... SELECT``: one statement per chunk rather than per row,
+    which with triggers on ``time_entries`` would each open a statement
+    journal and rewrite ``sqlite_sequence``. A large chunk also sets the
+    ``bulk_insert`` switch, which turns the rollup, change-log and
+    change-journal insert triggers off, and applies their effect once for
+    the chunk, as described in ``create_time_entries``.
+    """
+    columns = f"{_ENTRY_COLUMNS}, content_hash" if imported else _ENTRY_COLUMNS
+    placeholders = ", ".join("?" * len(chunk[0]))
+    with unit_of_work(conn):
+        # Temporary objects are private to this connection, so this is not
+        # the kind of DDL that makes other connections re-prepare.
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS time_entries_staging "
+            f"({_ENTRY_COLUMNS}, content_hash)"
+        )
+        conn.executemany(
+            f"INSERT INTO temp.time_entries_staging ({columns}) VALUES ({placeholders})", chunk
+        )
+        bulk = len(chunk) >= _BULK_INSERT_MIN_ROWS
+        if bulk:
+            conn.execute("UPDATE bulk_insert SET active = 1")
+        # The write lock is held, so AUTOINCREMENT hands this chunk the ids
+        # after the table's sequence, and every row from there on is new.
+        (sequence,) = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'time_entries'"
+        ).fetchone()
+        first_id = sequence + 1
+        # An upsert after INSERT ... SELECT needs the WHERE to parse.
+        inserted = conn.execute(
+            f"INSERT INTO time_entries ({columns}) "
+            f"SELECT {columns} FROM temp.time_entries_staging WHERE true ORDER BY rowid"
+            + (" ON CONFLICT DO NOTHING" if imported else "")
+        ).rowcount
+        conn.execute("DELETE FROM temp.time_entries_staging")
+        if bulk:
+            conn.execute("UPDATE bulk_insert SET active = 0")
+        if bulk and inserted:
+            conn.execute(
+                "INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries) "
+                "SELECT te.day, t.project_id, te.category_id, "
+                "SUM(te.end_ts - te.start_ts), COUNT(*) "
+                "FROM time_entries te JOIN tasks t ON te.task_id = t.id "
+                "WHERE te.id >= ? "
+                "GROUP BY 1, 2, 3 "
+                "ON CONFLICT (day, project_id, category_id) DO UPDATE "
+                "SET seconds = seconds + excluded.seconds, "
+                "entries = entries + excluded.entries",
+                (first_id,),
+            )
+            conn.execute(
+                "UPDATE db_changes SET version = version + 1 "
+                "WHERE table_name = 'time_entries'"
+            )
+            # Ids are never reused, so none of these rows is in the journal yet.
+            conn.execute(
+                "INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts) "
+                "SELECT id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes), "
+                "start_ts, end_ts FROM time_entries WHERE id >= ?",
+                (first_id,),
+            )
+    return first_id, inserted
+
+
+def create_time_entries(
+    conn: sqlite3.Connection,
+    entries: Iterable[NewTimeEntry],
+    *,
+    chunk_size: int = 10_000,
+    return_entries: bool = False,
+) -> list[TimeEntry] | int:
+    """Bulk-insert time entries with ``executemany``, one transaction per chunk.
+
+    ``entries`` is consumed lazily, so generators of any size stream through
+    in bounded memory. When called inside an outer ``unit_of_work`` every
+    chunk joins that transaction instead.
+
+    Rather than paying the per-row rollup, change-log and change-journal
+    triggers, each large chunk switches them off with the ``bulk_insert``
+    row (written inside the chunk's transaction, so other connections never
+    see it set), merges the chunk into ``daily_rollups`` with one grouped
+    upsert, bumps ``db_changes`` once and journals the whole chunk under one
+    ``time_entry_changes.seq``. Small batches, such as a stopped timer's
+    midnight segments, keep the triggers.
+
+    Returns the inserted rows as ``TimeEntry`` objects if ``return_entries``
+    is set, otherwise just the number of rows inserted.
+    """
+    iterator = iter(entries)
+    created: list[TimeEntry] = []
+    total = 0
+    while chunk := list(islice(iterator, chunk_size)):
+        first_id, inserted = _insert_entry_chunk(conn, chunk)
+        if return_entries:
+            created.extend(
+                _entry_row(None, (first_id + i, *row[:4])) for i, row in enumerate(chunk)
+            )
+        total += inserted
+    return created if return_entries else total
+
+
+# ``NewTimeEntry`` followed by the entry's ``content_hash``; see
+# ``import_time_entries``.
+ImportedTimeEntry = tuple[int, int, int, int, int, int]
+
+
+def import_time_entries(
+    conn: sqlite3.Connection,
+    entries: Iterable[ImportedTimeEntry],
+    *,
+    chunk_size: int = 10_000,
+) -> int:
+    """``create_time_entries`` for imports: skips entries already imported.
+
+    Each entry carries a ``content_hash`` of its source record, which a
+    unique index keeps once per database, so importing the same records
+    again inserts nothing. Entries created in the app have no hash and
+    never conflict. Returns the number of rows inserted.
+    """
+    iterator = iter(entries)
+    total = 0
+    while chunk := list(islice(iterator, chunk_size)):
+        total += _insert_entry_chunk(conn, chunk, imported=True)[1]
+    return total
 
 
 def update_time_entry(
@@ -236,123 +649,168 @@ def update_time_entry(
     *,
     task_id: int | None = None,
     category_id: int | None = None,
-    start: str | None = None,
-    end: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
 ) -> None:
-    entry = get_time_entry(conn, entry_id)
-    if entry is None:
-        return
-
-    new_task_id = task_id if task_id is not None else entry.task_id
-    new_category_id = category_id if category_id is not None else entry.category_id
-    new_start = start if start is not None else entry.start
-    new_end = end if end is not None else entry.end
-
-    start_dt = datetime.strptime(new_start, "%Y-%m-%d %H:%M:%S")
-    end_dt = datetime.strptime(new_end, "%Y-%m-%d %H:%M:%S")
-    new_duration = int((end_dt - start_dt).total_seconds())
-
-    conn.execute(
-        "UPDATE time_entries SET task_id = ?, category_id = ?, start = ?, end = ?, "
-        "duration_seconds = ? WHERE id = ?",
-        (new_task_id, new_category_id, new_start, new_end, new_duration, entry_id),
-    )
-    conn.commit()
+    with unit_of_work(conn):
+        entry = get_time_entry(conn, entry_id)
+        if entry is None:
+            return
+
+        row = new_time_entry(
+            task_id if task_id is not None else entry.task_id,
+            category_id if category_id is not None else entry.category_id,
+            start if start is not None else entry.start,
+            end if end is not None else entry.end,
+        )
+        conn.execute(
+            "UPDATE time_entries SET task_id = ?, category_id = ?, start_ts = ?, end_ts = ?, "
+            "day = ? WHERE id = ?",
+            (*row, entry_id),
+        )
 
 
 def get_time_entry(conn: sqlite3.Connection, entry_id: int) -> TimeEntry | None:
-    row = conn.execute(
-        "SELECT id, task_id, category_id, start, end, duration_seconds "
-        "FROM time_entries WHERE id = ?",
+    return _cursor(conn, _entry_row).execute(
+        "SELECT id, task_id, category_id, start_ts, end_ts FROM time_entries WHERE id = ?",
         (entry_id,),
     ).fetchone()
-    return TimeEntry(**dict(row)) if row else None
 
 
 def delete_time_entry(conn: sqlite3.Connection, entry_id: int) -> None:
     """Hard-delete a time entry (permanent)."""
-    conn.execute("DELETE FROM time_entries WHERE id = ?", (entry_id,))
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("DELETE FROM time_entries WHERE id = ?", (entry_id,))
 
 
 # ---------------------------------------------------------------------------
 # Reporting
 # ---------------------------------------------------------------------------
+#
+# All totals read from ``daily_rollups``, which the schema's triggers keep in
+# step with ``time_entries``. Days are local calendar days; the weekly_*
+# functions take a half-open ``[start, end)`` range of them.
 
 def daily_totals_by_project(
-    conn: sqlite3.Connection, date_str: str
+    conn: sqlite3.Connection, day: date
 ) -> list[tuple[str, int]]:
-    """Return (project_name, total_seconds) pairs for a given date."""
-    rows = conn.execute(
-        "SELECT p.name, SUM(te.duration_seconds) as total "
-        "FROM time_entries te "
-        "JOIN tasks t ON te.task_id = t.id "
-        "JOIN projects p ON t.project_id = p.id "
-        "WHERE date(te.start) = ? "
+    """Return (project_name, total_seconds) pairs for a given day."""
+    return _cursor(conn, None).execute(
+        "SELECT p.name, SUM(r.seconds) as total "
+        "FROM daily_rollups r "
+        "JOIN projects p ON r.project_id = p.id "
+        "WHERE r.day = ? "
         "GROUP BY p.name ORDER BY p.name ASC",
-        (date_str,),
+        (day_key(day),),
     ).fetchall()
-    return [(row["name"], row["total"]) for row in rows]
 
 
 def daily_totals_by_category(
-    conn: sqlite3.Connection, date_str: str
+    conn: sqlite3.Connection, day: date
 ) -> list[tuple[str, int]]:
-    """Return (category_name, total_seconds) pairs for a given date."""
-    rows = conn.execute(
-        "SELECT c.name, SUM(te.duration_seconds) as total "
-        "FROM time_entries te "
-        "JOIN categories c ON te.category_id = c.id "
-        "WHERE date(te.start) = ? "
+    """Return (category_name, total_seconds) pairs for a given day."""
+    return _cursor(conn, None).execute(
+        "SELECT c.name, SUM(r.seconds) as total "
+        "FROM daily_rollups r "
+        "JOIN categories c ON r.category_id = c.id "
+        "WHERE r.day = ? "
         "GROUP BY c.name ORDER BY c.name ASC",
-        (date_str,),
+        (day_key(day),),
     ).fetchall()
-    return [(row["name"], row["total"]) for row in rows]
 
 
 def weekly_totals_by_day(
-    conn: sqlite3.Connection, week_start: str, week_end: str
-) -> list[tuple[str, int]]:
-    """Return (date_str, total_seconds) pairs for each day in the range [start, end)."""
-    rows = conn.execute(
-        "SELECT date(start) as day, SUM(duration_seconds) as total "
-        "FROM time_entries "
-        "WHERE start >= ? AND start < ? "
-        "GROUP BY date(start) ORDER BY day ASC",
-        (week_start, week_end),
+    conn: sqlite3.Connection, week_start: date, week_end: date
+) -> list[tuple[date, int]]:
+    """Return (day, total_seconds) pairs for each day in the range [start, end)."""
+    return _cursor(conn, _day_total_row).execute(
+        "SELECT day, SUM(seconds) as total "
+        "FROM daily_rollups "
+        "WHERE day >= ? AND day < ? "
+        "GROUP BY day ORDER BY day ASC",
+        (day_key(week_start), day_key(week_end)),
     ).fetchall()
-    return [(row["day"], row["total"]) for row in rows]
 
 
 def weekly_totals_by_project(
-    conn: sqlite3.Connection, week_start: str, week_end: str
+    conn: sqlite3.Connection, week_start: date, week_end: date
 ) -> list[tuple[str, int]]:
     """Return (project_name, total_seconds) for a week range [start, end)."""
-    rows = conn.execute(
-        "SELECT p.name, SUM(te.duration_seconds) as total "
-        "FROM time_entries te "
-        "JOIN tasks t ON te.task_id = t.id "
-        "JOIN projects p ON t.project_id = p.id "
-        "WHERE te.start >= ? AND te.start < ? "
+    return _cursor(conn, None).execute(
+        "SELECT p.name, SUM(r.seconds) as total "
+        "FROM daily_rollups r "
+        "JOIN projects p ON r.project_id = p.id "
+        "WHERE r.day >= ? AND r.day < ? "
         "GROUP BY p.name ORDER BY p.name ASC",
-        (week_start, week_end),
+        (day_key(week_start), day_key(week_end)),
     ).fetchall()
-    return [(row["name"], row["total"]) for row in rows]
 
 
 def weekly_totals_by_category(
-    conn: sqlite3.Connection, week_start: str, week_end: str
+    conn: sqlite3.Connection, week_start: date, week_end: date
 ) -> list[tuple[str, int]]:
     """Return (category_name, total_seconds) for a week range [start, end)."""
-    rows = conn.execute(
-        "SELECT c.name, SUM(te.duration_seconds) as total "
-        "FROM time_entries te "
-        "JOIN categories c ON te.category_id = c.id "
-        "WHERE te.start >= ? AND te.start < ? "
+    return _cursor(conn, None).execute(
+        "SELECT c.name, SUM(r.seconds) as total "
+        "FROM daily_rollups r "
+        "JOIN categories c ON r.category_id = c.id "
+        "WHERE r.day >= ? AND r.day < ? "
         "GROUP BY c.name ORDER BY c.name ASC",
-        (week_start, week_end),
+        (day_key(week_start), day_key(week_end)),
     ).fetchall()
-    return [(row["name"], row["total"]) for row in rows]
+
+
+_EXPECTED_ROLLUPS_SQL = (
+    "SELECT te.day, t.project_id, te.category_id, "
+    "SUM(te.end_ts - te.start_ts) AS seconds, COUNT(*) AS entries "
+    "FROM time_entries te JOIN tasks t ON te.task_id = t.id "
+    "GROUP BY 1, 2, 3"
+)
+
+
+def rebuild_daily_rollups(conn: sqlite3.Connection) -> int:
+    """Recompute ``daily_rollups`` from the raw time entries.
+
+    Returns the number of rollup rows written.
+    """
+    with unit_of_work(conn):
+        conn.execute("DELETE FROM daily_rollups")
+        cursor = conn.execute(
+            "INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries) "
+            + _EXPECTED_ROLLUPS_SQL
+        )
+    return cursor.rowcount
+
+
+def check_daily_rollups(
+    conn: sqlite3.Connection,
+) -> list[tuple[date, int, int, int | None, int | None]]:
+    """Compare ``daily_rollups`` against a fresh aggregate of ``time_entries``.
+
+    Returns (day, project_id, category_id, expected_seconds, actual_seconds)
+    for every rollup row that is missing, stale or orphaned; an empty list
+    means the rollups are exact.
+    """
+    expected = {row[:3]: row[3:] for row in _cursor(conn, None).execute(_EXPECTED_ROLLUPS_SQL)}
+    actual = {
+        row[:3]: row[3:]
+        for row in _cursor(conn, None).execute(
+            "SELECT day, project_id, category_id, seconds, entries FROM daily_rollups"
+        )
+    }
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want, have = expected.get(key), actual.get(key)
+        if want != have:
+            day, project_id, category_id = key
+            mismatches.append((
+                from_day_key(day),
+                project_id,
+                category_id,
+                want[0] if want else None,
+                have[0] if have else None,
+            ))
+    return mismatches
 
 
 # ---------------------------------------------------------------------------
@@ -360,24 +818,42 @@ def weekly_totals_by_category(
 # ---------------------------------------------------------------------------
 
 def get_active_session(conn: sqlite3.Connection) -> ActiveSession | None:
-    row = conn.execute(
-        "SELECT id, task_id, category_id, start_time FROM active_session"
+    return _cursor(conn, _session_row).execute(
+        "SELECT id, task_id, category_id, start_ts FROM active_session"
+    ).fetchone()
+
+
+def get_active_session_detail(conn: sqlite3.Connection) -> ActiveSessionDetail | None:
+    """Get the active session with its names resolved in one joined query.
+
+    Returns None when there is no session, or when its task or category no
+    longer resolves.
+    """
+    return _cursor(conn, _session_detail_row).execute(
+        "SELECT s.id, s.task_id, s.category_id, s.start_ts, "
+        "p.name, t.name, c.name "
+        "FROM active_session s "
+        "JOIN tasks t ON s.task_id = t.id "
+        "JOIN categories c ON s.category_id = c.id "
+        "LEFT JOIN projects p ON t.project_id = p.id",
     ).fetchone()
-    return ActiveSession(**dict(row)) if row else None
 
 
 def set_active_session(
-    conn: sqlite3.Connection, task_id: int, category_id: int, start_time: str
+    conn: sqlite3.Connection, task_id: int, category_id: int, start_time: datetime
 ) -> ActiveSession:
-    conn.execute("DELETE FROM active_session")
-    conn.execute(
-        "INSERT INTO active_session (id, task_id, category_id, start_time) VALUES (1, ?, ?, ?)",
-        (task_id, category_id, start_time),
+    start_ts = to_epoch(start_time)
+    with unit_of_work(conn):
+        conn.execute("DELETE FROM active_session")
+        conn.execute(
+            "INSERT INTO active_session (id, task_id, category_id, start_ts) VALUES (1, ?, ?, ?)",
+            (task_id, category_id, start_ts),
+        )
+    return ActiveSession(
+        id=1, task_id=task_id, category_id=category_id, start_time=from_epoch(start_ts)
     )
-    conn.commit()
-    return ActiveSession(id=1, task_id=task_id, category_id=category_id, start_time=start_time)
 
 
 def clear_active_session(conn: sqlite3.Connection) -> None:
-    conn.execute("DELETE FROM active_session")
-    conn.commit()
+    with unit_of_work(conn):
+        conn.execute("DELETE FROM active_session")
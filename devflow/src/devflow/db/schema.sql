@@ -19,23 +19,285 @@ CREATE TABLE IF NOT EXISTS tasks (
     archived_at TEXT
 );
 
+-- start_ts / end_ts are POSIX seconds; day is the local date of start_ts
+-- as YYYYMMDD, fixed at write time (see devflow.db.timestamps). Durations
+-- are end_ts - start_ts. content_hash identifies the source record of an
+-- imported entry (NULL for entries tracked in the app); see devflow.importer.
 CREATE TABLE IF NOT EXISTS time_entries (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     task_id INTEGER NOT NULL REFERENCES tasks(id),
     category_id INTEGER NOT NULL REFERENCES categories(id),
-    start TEXT NOT NULL,
-    end TEXT NOT NULL,
-    duration_seconds INTEGER NOT NULL
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    content_hash INTEGER
 );
 
 CREATE TABLE IF NOT EXISTS active_session (
     id INTEGER PRIMARY KEY CHECK (id = 1),
     task_id INTEGER NOT NULL REFERENCES tasks(id),
     category_id INTEGER NOT NULL REFERENCES categories(id),
-    start_time TEXT NOT NULL
+    start_ts INTEGER NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_time_entries_start ON time_entries(start);
+CREATE INDEX IF NOT EXISTS idx_time_entries_start ON time_entries(start_ts);
 CREATE INDEX IF NOT EXISTS idx_time_entries_task_id ON time_entries(task_id);
 CREATE INDEX IF NOT EXISTS idx_time_entries_category_id ON time_entries(category_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
+-- Makes imports idempotent: a record already imported is skipped.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_time_entries_content_hash
+    ON time_entries(content_hash) WHERE content_hash IS NOT NULL;
+
+-- A one-row switch the time_entries insert triggers check: a bulk insert
+-- (see devflow.db.queries.create_time_entries) sets it inside its own
+-- transaction and applies the triggers' effect once per chunk instead, so
+-- other connections never see it set. A missing row counts as unset.
+CREATE TABLE IF NOT EXISTS bulk_insert (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    active INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO bulk_insert (id) VALUES (1);
+
+-- Per-day aggregates maintained by the triggers below, so daily and weekly
+-- reports read a handful of rollup rows instead of re-summing time_entries.
+-- A task never changes project, so the project is resolved at write time.
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day INTEGER NOT NULL,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    seconds INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    PRIMARY KEY (day, project_id, category_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_insert
+AFTER INSERT ON time_entries
+WHEN (SELECT active FROM bulk_insert) IS NOT 1
+BEGIN
+    INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries)
+    SELECT NEW.day, t.project_id, NEW.category_id, NEW.end_ts - NEW.start_ts, 1
+    FROM tasks t WHERE t.id = NEW.task_id
+    ON CONFLICT (day, project_id, category_id) DO UPDATE
+    SET seconds = seconds + excluded.seconds, entries = entries + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_delete
+AFTER DELETE ON time_entries
+BEGIN
+    UPDATE daily_rollups
+    SET seconds = seconds - (OLD.end_ts - OLD.start_ts), entries = entries - 1
+    WHERE day = OLD.day AND category_id = OLD.category_id
+    AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id);
+    DELETE FROM daily_rollups
+    WHERE day = OLD.day AND category_id = OLD.category_id
+    AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id)
+    AND entries = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_update
+AFTER UPDATE OF task_id, category_id, start_ts, end_ts, day ON time_entries
+BEGIN
+    UPDATE daily_rollups
+    SET seconds = seconds - (OLD.end_ts - OLD.start_ts), entries = entries - 1
+    WHERE day = OLD.day AND category_id = OLD.category_id
+    AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id);
+    DELETE FROM daily_rollups
+    WHERE day = OLD.day AND category_id = OLD.category_id
+    AND project_id = (SELECT project_id FROM tasks WHERE id = OLD.task_id)
+    AND entries = 0;
+    INSERT INTO daily_rollups (day, project_id, category_id, seconds, entries)
+    SELECT NEW.day, t.project_id, NEW.category_id, NEW.end_ts - NEW.start_ts, 1
+    FROM tasks t WHERE t.id = NEW.task_id
+    ON CONFLICT (day, project_id, category_id) DO UPDATE
+    SET seconds = seconds + excluded.seconds, entries = entries + 1;
+END;
+
+-- One version counter per table, bumped by the triggers below on every
+-- row change, so a process watching the database can tell *which* tables
+-- another connection wrote (see devflow.db.changes).
+CREATE TABLE IF NOT EXISTS db_changes (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO db_changes (table_name) VALUES
+    ('categories'), ('projects'), ('tasks'), ('time_entries'), ('active_session');
+
+CREATE TRIGGER IF NOT EXISTS trg_categories_changes_insert
+AFTER INSERT ON categories
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_categories_changes_update
+AFTER UPDATE ON categories
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_categories_changes_delete
+AFTER DELETE ON categories
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_changes_insert
+AFTER INSERT ON projects
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'projects';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_changes_update
+AFTER UPDATE ON projects
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'projects';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_changes_delete
+AFTER DELETE ON projects
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'projects';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_changes_insert
+AFTER INSERT ON tasks
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'tasks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_changes_update
+AFTER UPDATE ON tasks
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'tasks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_changes_delete
+AFTER DELETE ON tasks
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'tasks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_changes_insert
+AFTER INSERT ON time_entries
+WHEN (SELECT active FROM bulk_insert) IS NOT 1
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'time_entries';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_changes_update
+AFTER UPDATE ON time_entries
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'time_entries';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_changes_delete
+AFTER DELETE ON time_entries
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'time_entries';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_active_session_changes_insert
+AFTER INSERT ON active_session
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'active_session';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_active_session_changes_update
+AFTER UPDATE ON active_session
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'active_session';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_active_session_changes_delete
+AFTER DELETE ON active_session
+BEGIN
+    UPDATE db_changes SET version = version + 1 WHERE table_name = 'active_session';
+END;
+
+-- The latest change to each time entry, for incremental exports (see
+-- devflow.ics): seq counts up across all changes, and start_ts / end_ts are
+-- the entry's times as of that change. A deleted entry keeps its row, so
+-- an export can tell calendars to drop it, until every export watermark is
+-- past it (see queries.set_export_watermark). Renaming a task, project or
+-- category counts as a change to every entry that shows the name. Entries
+-- older than the table (schema v6) have no row until they next change.
+CREATE TABLE IF NOT EXISTS time_entry_changes (
+    entry_id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_time_entry_changes_seq ON time_entry_changes(seq);
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_journal_insert
+AFTER INSERT ON time_entries
+WHEN (SELECT active FROM bulk_insert) IS NOT 1
+BEGIN
+    INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts)
+    VALUES (
+        NEW.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes),
+        NEW.start_ts, NEW.end_ts
+    )
+    ON CONFLICT (entry_id) DO UPDATE
+    SET seq = excluded.seq, start_ts = excluded.start_ts, end_ts = excluded.end_ts;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_journal_update
+AFTER UPDATE OF task_id, category_id, start_ts, end_ts ON time_entries
+BEGIN
+    INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts)
+    VALUES (
+        NEW.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes),
+        NEW.start_ts, NEW.end_ts
+    )
+    ON CONFLICT (entry_id) DO UPDATE
+    SET seq = excluded.seq, start_ts = excluded.start_ts, end_ts = excluded.end_ts;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_time_entries_journal_delete
+AFTER DELETE ON time_entries
+BEGIN
+    INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts)
+    VALUES (
+        OLD.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes),
+        OLD.start_ts, OLD.end_ts
+    )
+    ON CONFLICT (entry_id) DO UPDATE
+    SET seq = excluded.seq, start_ts = excluded.start_ts, end_ts = excluded.end_ts;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_journal_rename
+AFTER UPDATE OF name ON tasks WHEN NEW.name IS NOT OLD.name
+BEGIN
+    INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts)
+    SELECT id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes), start_ts, end_ts
+    FROM time_entries WHERE task_id = NEW.id
+    ON CONFLICT (entry_id) DO UPDATE SET seq = excluded.seq;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_journal_rename
+AFTER UPDATE OF name ON projects WHEN NEW.name IS NOT OLD.name
+BEGIN
+    INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts)
+    SELECT id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes), start_ts, end_ts
+    FROM time_entries WHERE task_id IN (SELECT id FROM tasks WHERE project_id = NEW.id)
+    ON CONFLICT (entry_id) DO UPDATE SET seq = excluded.seq;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_categories_journal_rename
+AFTER UPDATE OF name ON categories WHEN NEW.name IS NOT OLD.name
+BEGIN
+    INSERT INTO time_entry_changes (entry_id, seq, start_ts, end_ts)
+    SELECT id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM time_entry_changes), start_ts, end_ts
+    FROM time_entries WHERE category_id = NEW.id
+    ON CONFLICT (entry_id) DO UPDATE SET seq = excluded.seq;
+END;
+
+-- How far each named incremental export has got: the highest
+-- time_entry_changes.seq it has written out.
+CREATE TABLE IF NOT EXISTS export_watermarks (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+) WITHOUT ROWID;
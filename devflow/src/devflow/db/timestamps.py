@@ -0,0 +1,42 @@
+"""Conversions between Python dates and the integers the schema stores.
+
+Instants (``time_entries.start_ts`` / ``end_ts``, ``active_session.start_ts``)
+are POSIX seconds. DevFlow's datetimes are naive local time, converted with
+the machine's time zone rules, so a DST change never makes an entry's
+duration disagree with its end minus its start.
+
+Calendar days (``time_entries.day``, ``daily_rollups.day``) are ``YYYYMMDD``
+integers: they sort and compare like dates, take four bytes, and still read
+as a date in the ``sqlite3`` shell. An entry's day is the local date of its
+start, fixed when it is written.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+
+def to_epoch(moment: datetime) -> int:
+    """Whole POSIX seconds for a naive local datetime (sub-seconds dropped)."""
+    return int(moment.timestamp())
+
+
+def from_epoch(seconds: int) -> datetime:
+    return datetime.fromtimestamp(seconds)
+
+
+def day_key(day: date) -> int:
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def from_day_key(key: int) -> date:
+    return date(key // 10000, key // 100 % 100, key % 100)
+
+
+def day_bounds(day: date) -> tuple[int, int]:
+    """POSIX seconds of the local midnights opening and closing ``day``.
+
+    23 or 25 hours apart on the days the clocks change.
+    """
+    start = datetime.combine(day, time.min)
+    return to_epoch(start), to_epoch(start + timedelta(days=1))
@@ -0,0 +1,321 @@
+"""Opt-in SQL tracing: per-statement timing, row counts, callers, slow-query log.
+
+Enabled by ``$DEVFLOW_TRACE_SQL`` (``devflow --trace-sql`` sets it), in which
+case ``get_connection`` opens a ``TracingConnection``. Every statement that
+goes through ``execute``/``executemany`` is timed from execution through
+the last fetched row, attributed to the nearest calling function in
+``devflow`` and to the screen module it ran under, and aggregated in the
+process-wide ``SqlTracer``. A job a screen hands to ``DatabaseWorker`` runs
+on a pool thread whose stack has no screen frame, so the worker captures
+the screen when the job is submitted (``submitting_screen``) and runs it
+under ``screen_context``. Statements slower than ``$DEVFLOW_SLOW_SQL_MS``
+are appended to ``$DEVFLOW_SLOW_SQL_LOG`` with their bound values, as
+reported by ``set_trace_callback``.
+
+Tracing costs a stack walk per statement and a Python call per fetched row,
+so it is for diagnosis only; disabled, connections are plain
+``sqlite3.Connection`` objects.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+TRACE_ENV_VAR = "DEVFLOW_TRACE_SQL"
+SLOW_MS_ENV_VAR = "DEVFLOW_SLOW_SQL_MS"
+SLOW_LOG_ENV_VAR = "DEVFLOW_SLOW_SQL_LOG"
+
+DEFAULT_SLOW_MS = 20.0
+DEFAULT_SLOW_LOG = Path.home() / ".farhost" / "devflow" / "slow-sql.log"
+
+
+def tracing_enabled() -> bool:
+    return os.environ.get(TRACE_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    total_ms: float = 0.0
+    rows: int = 0
+
+
+@dataclass
+class _Statement:
+    sql: str
+    caller: str
+    screen: str
+    expanded: str | None = None
+    elapsed_ms: float = 0.0
+    rows: int = 0
+
+
+class SqlTracer:
+    """Aggregates traced statements by (screen, caller) and logs slow ones."""
+
+    def __init__(self, slow_ms: float = DEFAULT_SLOW_MS, slow_log: Path | None = None) -> None:
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self.stats: dict[tuple[str, str], StatementStats] = {}
+        self.slow_count = 0
+        # Connections on DatabaseWorker threads record concurrently.
+        self._lock = threading.Lock()
+
+    def record(self, statement: _Statement) -> None:
+        with self._lock:
+            stats = self.stats.setdefault((statement.screen, statement.caller), StatementStats())
+            stats.count += 1
+            stats.total_ms += statement.elapsed_ms
+            stats.rows += statement.rows
+            if statement.elapsed_ms >= self.slow_ms:
+                self.slow_count += 1
+                self._log_slow(statement)
+
+    def _log_slow(self, statement: _Statement) -> None:
+        if self.slow_log is None:
+            return
+        self.slow_log.parent.mkdir(parents=True, exist_ok=True)
+        sql = " ".join((statement.expanded or statement.sql).split())
+        with self.slow_log.open("a") as f:
+            f.write(
+                f"{datetime.now().isoformat(timespec='seconds')}\t"
+                f"{statement.elapsed_ms:.2f} ms\t{statement.rows} rows\t"
+                f"{statement.screen}\t{statement.caller}\t{sql}\n"
+            )
+
+    def summary(self, top: int = 5) -> str:
+        """Statement counts and time per screen, with its busiest callers."""
+        if not self.stats:
+            return "SQL trace: no statements"
+        by_screen: dict[str, list[tuple[str, StatementStats]]] = {}
+        for (screen, caller), stats in self.stats.items():
+            by_screen.setdefault(screen, []).append((caller, stats))
+
+        total = sum(s.count for s in self.stats.values())
+        total_ms = sum(s.total_ms for s in self.stats.values())
+        lines = [
+            f"SQL trace: {total} statements, {total_ms:.1f} ms, "
+            f"{self.slow_count} over {self.slow_ms:g} ms",
+            f"{'screen / caller':<52} {'stmts':>7} {'rows':>9} {'ms':>9}",
+        ]
+        ordered = sorted(by_screen.items(), key=lambda item: -sum(s.count for _, s in item[1]))
+        for screen, callers in ordered:
+            lines.append(
+                f"{screen:<52} {sum(s.count for _, s in callers):>7} "
+                f"{sum(s.rows for _, s in callers):>9} "
+                f"{sum(s.total_ms for _, s in callers):>9.1f}"
+            )
+            callers.sort(key=lambda item: -item[1].count)
+            for caller, stats in callers[:top]:
+                lines.append(
+                    f"  {caller:<50} {stats.count:>7} {stats.rows:>9} {stats.total_ms:>9.1f}"
+                )
+        return "\n".join(lines)
+
+
+_tracer: SqlTracer | None = None
+
+
+def get_tracer() -> SqlTracer:
+    """The process-wide tracer, configured from the environment on first use."""
+    global _tracer
+    if _tracer is None:
+        slow_log = os.environ.get(SLOW_LOG_ENV_VAR)
+        _tracer = SqlTracer(
+            slow_ms=float(os.environ.get(SLOW_MS_ENV_VAR) or DEFAULT_SLOW_MS),
+            slow_log=Path(slow_log) if slow_log else DEFAULT_SLOW_LOG,
+        )
+    return _tracer
+
+
+def reset_tracer() -> None:
+    global _tracer
+    _tracer = None
+
+
+# The screen that submitted the DatabaseWorker job running on this thread.
+_job_screen: ContextVar[str | None] = ContextVar("devflow_job_screen", default=None)
+
+
+def submitting_screen() -> str | None:
+    """The screen the calling code runs under, to attribute a job it hands off."""
+    screen = _attribution()[1]
+    return None if screen == "<no screen>" else screen
+
+
+@contextmanager
+def screen_context(screen: str | None) -> Iterator[None]:
+    """Attribute statements run in the block to ``screen`` when the stack has none."""
+    token = _job_screen.set(screen)
+    try:
+        yield
+    finally:
+        _job_screen.reset(token)
+
+
+def _attribution() -> tuple[str, str]:
+    """Return (caller, screen) from the first devflow frames on the stack.
+
+    A statement run by a module's private helper is charged to the public
+    function of that module that called it, when there is one. Without a
+    screen frame, the screen falls back to the one ``screen_context`` set.
+    """
+    caller = helper = helper_module = screen = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("devflow.") and module != __name__:
+            if caller is None:
+                code = frame.f_code
+                qualname = getattr(code, "co_qualname", code.co_name)
+                name = f"{module.removeprefix('devflow.')}.{qualname}"
+                if helper is not None and module != helper_module:
+                    caller = helper
+                elif code.co_name.startswith("_") and not code.co_name.startswith("__"):
+                    if helper is None:
+                        helper, helper_module = name, module
+                else:
+                    caller = name
+            if module.startswith("devflow.screens."):
+                screen = module.removeprefix("devflow.screens.")
+                break
+            if module == "devflow.app":
+                screen = "app"
+                break
+        frame = frame.f_back
+    return caller or helper or "<unknown>", screen or _job_screen.get() or "<no screen>"
+
+
+class TracingCursor(sqlite3.Cursor):
+    """Times each statement from ``execute`` until its rows are consumed."""
+
+    _statement: _Statement | None = None
+
+    def _begin(self, sql: str) -> None:
+        self._finish()
+        caller, screen = _attribution()
+        self._statement = _Statement(sql=sql, caller=caller, screen=screen)
+        self.connection._last_expanded = None
+
+    def _finish(self) -> None:
+        statement, self._statement = self._statement, None
+        if statement is not None:
+            self.connection.tracer.record(statement)
+
+    def _ran(self, started: float) -> None:
+        statement = self._statement
+        statement.elapsed_ms += (time.perf_counter() - started) * 1000
+        statement.expanded = self.connection._last_expanded
+        if self.description is None:  # no result set: done
+            statement.rows = max(self.rowcount, 0)
+            self._finish()
+
+    def execute(self, sql, parameters=(), /):
+        self._begin(sql)
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            self._ran(started)
+        return self
+
+    def executemany(self, sql, seq_of_parameters, /):
+        self._begin(sql)
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        finally:
+            self._ran(started)
+        return self
+
+    def _fetched(self, started: float, rows: int, exhausted: bool) -> None:
+        statement = self._statement
+        if statement is None:
+            return
+        statement.elapsed_ms += (time.perf_counter() - started) * 1000
+        statement.rows += rows
+        if exhausted:
+            self._finish()
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(started, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Cursors read with a single fetchone() are finished when dropped.
+        self._finish()
+
+
+class TracingConnection(sqlite3.Connection):
+    """``sqlite3.Connection`` whose statements are recorded by a ``SqlTracer``."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.tracer = get_tracer()
+        self._last_expanded: str | None = None
+        self.set_trace_callback(self._on_trace)
+
+    def _on_trace(self, sql: str) -> None:
+        # Statements run by triggers are reported as "-- TRIGGER name".
+        if not sql.startswith("--"):
+            self._last_expanded = sql
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        started = time.perf_counter()
+        super().commit()
+        caller, screen = _attribution()
+        self.tracer.record(
+            _Statement(
+                sql="COMMIT",
+                caller=caller,
+                screen=screen,
+                elapsed_ms=(time.perf_counter() - started) * 1000,
+            )
+        )
@@ -0,0 +1,60 @@
+"""Background threads, fed by a read-only pool, for queries run off the UI.
+
+The TUI's event loop must never wait on SQLite: a report over a large
+history would freeze input handling. Screens hand read-only functions of
+the form ``fn(conn, *args)`` to ``DatabaseWorker.run`` and await the result
+from a Textual worker, so the loop keeps processing keys meanwhile.
+
+Each job runs on one of ``pool.size`` threads with a connection checked
+out of a ``ConnectionPool``. The connections are read-only, so reports
+run concurrently with each other and with the app's writer connection
+and never take the write lock; in WAL mode a job reads everything
+committed before it started. A job whose awaiting task was cancelled
+before it started (say, the report for a day the user has already
+skipped past) is dropped without touching the database; one already
+running finishes and its result is discarded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from devflow.db import tracing
+from devflow.db.connection import ConnectionPool
+
+T = TypeVar("T")
+
+
+class DatabaseWorker:
+    """Runs ``fn(conn, *args)`` on background threads with pooled connections."""
+
+    def __init__(self, pool: ConnectionPool) -> None:
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool.size, thread_name_prefix="devflow-db"
+        )
+
+    def _call(self, fn: Callable[..., T], args: tuple, kwargs: dict, screen: str | None) -> T:
+        with self.pool.checkout() as conn, tracing.screen_context(screen):
+            return fn(conn, *args, **kwargs)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await ``fn(conn, *args, **kwargs)`` run on a worker thread."""
+        loop = asyncio.get_running_loop()
+        # SQL tracing charges the job's statements to the submitting screen.
+        screen = tracing.submitting_screen() if tracing.tracing_enabled() else None
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, fn, args, kwargs, screen)
+        )
+
+    def close(self) -> None:
+        """Stop the threads once running jobs finish; the pool stays open.
+
+        Jobs whose awaiting task was cancelled are already dropped, so this
+        waits at most for the ones that are running.
+        """
+        self._executor.shutdown(wait=True)
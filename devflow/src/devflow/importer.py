@@ -0,0 +1,235 @@
+"""Bulk, idempotent import of time entries from CSV or JSONL (``devflow import``).
+
+Records need ``start``, ``end``, ``project``, ``task`` and ``category``;
+other fields (``id``, ``duration_seconds``) are ignored, so a
+``devflow export`` imports back as is. Times are ISO 8601, local unless
+they carry an offset. Entries are stored as given: unlike the timer, an
+import does not split an entry that crosses midnight.
+
+Records stream through in chunks, each resolved and inserted in one
+transaction. Projects, tasks and categories are matched by name against
+lookup tables loaded once up front, and created when missing; archived
+ones match too, so history lands on the names it had. Every entry stores
+a ``content_hash`` of its record, and ``queries.import_time_entries`` skips
+hashes already present: re-running an import inserts nothing.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from typing import TextIO
+
+from devflow.db import queries
+from devflow.db.connection import unit_of_work
+
+FIELDS = ("start", "end", "project", "task", "category")
+FORMATS = ("csv", "jsonl")
+MAX_REPORTED_ERRORS = 20
+
+
+class RejectedRecord(ValueError):
+    """A record that cannot be imported; the import skips it and goes on."""
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    elapsed: float = 0.0
+    errors: list[str] = field(default_factory=list)  # the first MAX_REPORTED_ERRORS
+
+    @property
+    def duplicates(self) -> int:
+        """Valid records skipped because they were already imported."""
+        return self.read - self.rejected - self.inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Imported {self.inserted} of {self.read} records "
+            f"({self.duplicates} already imported, {self.rejected} rejected) "
+            f"in {self.elapsed:.1f}s, {self.rows_per_second:,.0f} records/s"
+        ]
+        lines += [f"  {error}" for error in self.errors]
+        if self.rejected > len(self.errors):
+            lines.append(f"  ... and {self.rejected - len(self.errors)} more rejected")
+        return "\n".join(lines)
+
+
+def content_hash(start_ts: int, end_ts: int, project: str, task: str, category: str) -> int:
+    """A signed 64-bit hash identifying an imported record."""
+    return _hash(start_ts, end_ts, _hashed_names(project, task, category))
+
+
+def _hashed_names(project: str, task: str, category: str) -> bytes:
+    return "\x1f".join((project, task, category)).encode("utf-8")
+
+
+def _hash(start_ts: int, end_ts: int, names: bytes) -> int:
+    # ``names`` is encoded once per distinct triple; see ``_Names``.
+    digest = hashlib.blake2b(b"%d\x1f%d\x1f%s" % (start_ts, end_ts, names), digest_size=8)
+    return int.from_bytes(digest.digest(), "big", signed=True)
+
+
+class _Names(dict):
+    """Memoizes (project, task, category) as read -> (task_id, category_id, hashed names).
+
+    Behind it are name -> id lookup tables loaded once; a miss creates the
+    project, task or category. The same few triples recur on every record,
+    so most records cost one dict lookup.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        super().__init__()
+        self.conn = conn
+        self.projects: dict[str, int] = {}
+        self.tasks: dict[tuple[int, str], int] = {}
+        self.categories: dict[str, int] = {}
+        # Active rows are loaded last so they win over archived namesakes.
+        for archived in (True, False):
+            for project in queries.list_projects(conn, include_archived=archived):
+                self.projects[project.name] = project.id
+            for category in queries.list_categories(conn, include_archived=archived):
+                self.categories[category.name] = category.id
+        for archived in (True, False):
+            for project_id in self.projects.values():
+                for task in queries.list_tasks(conn, project_id, include_archived=archived):
+                    self.tasks[(project_id, task.name)] = task.id
+
+    def __missing__(self, key: tuple[str, str, str]) -> tuple[int, int, bytes]:
+        project, task, category = (
+            _name(value, name) for value, name in zip(key, FIELDS[2:])
+        )
+        project_id = self.projects.get(project)
+        if project_id is None:
+            project_id = self.projects[project] = queries.create_project(self.conn, project).id
+        task_id = self.tasks.get((project_id, task))
+        if task_id is None:
+            task_id = self.tasks[(project_id, task)] = queries.create_task(
+                self.conn, project_id, task
+            ).id
+        category_id = self.categories.get(category)
+        if category_id is None:
+            category_id = self.categories[category] = queries.create_category(
+                self.conn, category
+            ).id
+        value = self[key] = (task_id, category_id, _hashed_names(project, task, category))
+        return value
+
+
+# Both readers yield (line number, record), where a record is the FIELDS
+# values as a tuple, or a message saying why the line has none.
+_Record = tuple[object, object, object, object, object]
+
+
+def _read_csv(source: TextIO) -> Iterator[tuple[int, _Record | str]]:
+    reader = csv.reader(source)
+    header = next(reader, [])
+    missing = [name for name in FIELDS if name not in header]
+    if missing:
+        raise ValueError(f"CSV header is missing {', '.join(missing)}")
+    fields = itemgetter(*(header.index(name) for name in FIELDS))
+    for row in reader:
+        if not row:
+            continue
+        try:
+            yield reader.line_num, fields(row)
+        except IndexError:
+            yield reader.line_num, f"expected {len(header)} fields, found {len(row)}"
+
+
+def _read_jsonl(source: TextIO) -> Iterator[tuple[int, _Record | str]]:
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield line_number, f"invalid JSON ({error.msg})"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "not a JSON object"
+            continue
+        get = record.get
+        yield line_number, (get("start"), get("end"), get("project"), get("task"), get("category"))
+
+
+def _moment(value: object, name: str) -> datetime:
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise RejectedRecord(f"{name} is not an ISO 8601 time: {value!r}") from None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+def _name(value: object, name: str) -> str:
+    value = str(value).strip()
+    if not value:
+        raise RejectedRecord(f"{name} is empty")
+    return value
+
+
+def _entry(record: _Record | str, names: _Names) -> queries.ImportedTimeEntry:
+    if isinstance(record, str):
+        raise RejectedRecord(record)
+    if not all(record):
+        missing = [name for name, value in zip(FIELDS, record) if not value]
+        raise RejectedRecord(f"missing {', '.join(missing)}")
+    start, end = _moment(record[0], "start"), _moment(record[1], "end")
+    if end < start:
+        raise RejectedRecord("end is before start")
+    try:
+        task_id, category_id, hashed_names = names[record[2:]]
+    except TypeError:  # a JSON list or object where a name belongs
+        raise RejectedRecord("project, task and category must be names") from None
+    row = queries.new_time_entry(task_id, category_id, start, end)
+    return (*row, _hash(row[2], row[3], hashed_names))
+
+
+def import_entries(
+    conn: sqlite3.Connection,
+    source: TextIO,
+    fmt: str = "csv",
+    *,
+    chunk_size: int = 10_000,
+) -> ImportReport:
+    """Import every record in ``source``; returns what was inserted and rejected.
+
+    Each chunk of ``chunk_size`` records, and any names it creates, commits
+    as one transaction.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown import format {fmt!r}; expected one of {FORMATS}")
+    report = ImportReport()
+    t0 = time.perf_counter()
+    records = _read_csv(source) if fmt == "csv" else _read_jsonl(source)
+    names = _Names(conn)
+    while chunk := list(islice(records, chunk_size)):
+        report.read += len(chunk)
+        with unit_of_work(conn):
+            entries = []
+            for line_number, record in chunk:
+                try:
+                    entries.append(_entry(record, names))
+                except RejectedRecord as error:
+                    report.rejected += 1
+                    if len(report.errors) < MAX_REPORTED_ERRORS:
+                        report.errors.append(f"line {line_number}: {error}")
+            report.inserted += queries.import_time_entries(conn, entries, chunk_size=chunk_size)
+    report.elapsed = time.perf_counter() - t0
+    return report
@@ -0,0 +1,232 @@
+"""Built-in profiler for ``devflow --profile``.
+
+Two complementary views are collected for the whole run:
+
+* **cProfile per section.** Import time, ``DevFlowApp.on_mount``,
+  ``recover_crashed_session``, every screen's ``on_mount``, ``_refresh``
+  and ``_refresh_table``, and the ``_fetch_*`` queries the screens hand to
+  ``DatabaseWorker`` each get their own ``cProfile.Profile``, written to
+  ``<dir>/<section>.pstats`` (open with ``python -m pstats`` or snakeviz).
+  Sections nest exclusively: while ``recover_crashed_session`` runs inside
+  ``app.on_mount`` its time is charged to the inner section only.
+* **Sampling.** A background thread samples every thread's stack every few
+  milliseconds and writes ``<dir>/profile.collapsed`` in the collapsed
+  stack format read by flamegraph.pl and speedscope, prefixed with the
+  section active on that thread (and, off the main thread, the thread's
+  name).
+
+Sections are tracked per thread, so a report query running on a
+``DatabaseWorker`` thread is charged to its own section while the main
+thread carries on; each thread gets its own ``cProfile.Profile`` per
+section and they are merged when written. From Python 3.12 cProfile hooks
+the whole interpreter and only one profile can be active at a time, so
+there a section that starts while another thread's is active is timed and
+sampled but not added to its pstats.
+
+``<dir>/summary.txt`` lists call counts and wall time per section (wall
+time is inclusive of nested sections) followed by the top functions of
+each pstats file. The hooks are installed by wrapping the methods at
+runtime, so nothing in the app knows about them.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_OUTPUT_DIR = "devflow-profile"
+SAMPLE_INTERVAL = 0.002  # seconds
+
+
+@dataclass
+class SectionStats:
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class Profiler:
+    """Per-section, per-thread cProfile plus a stack-sampling thread."""
+
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL) -> None:
+        self.sample_interval = sample_interval
+        # Keyed by (section, thread ident): a profile only ever runs on one thread.
+        self.profiles: dict[tuple[str, int], cProfile.Profile] = {}
+        self.sections: dict[str, SectionStats] = {}
+        self.samples: Counter[str] = Counter()
+        self._stacks: dict[int, list[str]] = {}
+        self._lock = threading.Lock()
+        self._main_thread_id = threading.main_thread().ident
+        self._sampling = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._wrapped: list[tuple[Any, str, Any]] = []
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time and profile the body as ``name`` on the calling thread."""
+        thread_id = threading.get_ident()
+        stack = self._stacks.setdefault(thread_id, [])
+        outer = self.profiles[(stack[-1], thread_id)] if stack else None
+        if outer is not None:
+            outer.disable()
+        profile = self.profiles.setdefault((name, thread_id), cProfile.Profile())
+        stack.append(name)
+        started = time.perf_counter()
+        profiling = _enable(profile)
+        try:
+            yield
+        finally:
+            if profiling:
+                profile.disable()
+            elapsed = (time.perf_counter() - started) * 1000
+            stack.pop()
+            with self._lock:
+                stats = self.sections.setdefault(name, SectionStats())
+                stats.calls += 1
+                stats.total_ms += elapsed
+                stats.max_ms = max(stats.max_ms, elapsed)
+            if outer is not None:
+                _enable(outer)
+
+    def stats(self, name: str, stream: Any = None) -> pstats.Stats:
+        """The section's profiles from every thread, merged."""
+        profiles = [p for (section, _), p in self.profiles.items() if section == name]
+        return pstats.Stats(*profiles, stream=stream)
+
+    def wrap(self, owner: Any, attr: str, name: str) -> None:
+        """Replace ``owner.attr`` with a version that runs inside ``section(name)``."""
+        original = getattr(owner, attr)
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            with self.section(name):
+                return original(*args, **kwargs)
+
+        self._wrapped.append((owner, attr, original))
+        setattr(owner, attr, wrapper)
+
+    def unwrap_all(self) -> None:
+        """Undo every ``wrap``, most recent first."""
+        while self._wrapped:
+            owner, attr, original = self._wrapped.pop()
+            setattr(owner, attr, original)
+
+    # -- sampling -------------------------------------------------------------
+
+    def start_sampling(self) -> None:
+        self._sampling.set()
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+
+    def stop_sampling(self) -> None:
+        self._sampling.clear()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while self._sampling.is_set():
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self.samples[self._collapse(thread_id, frame, thread_names)] += 1
+            time.sleep(self.sample_interval)
+
+    def _collapse(self, thread_id: int, frame, thread_names: dict[int, str]) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}:{getattr(code, 'co_qualname', code.co_name)}")
+            frame = frame.f_back
+        stack = self._stacks.get(thread_id)
+        prefix = [stack[-1] if stack else "(idle)"]
+        if thread_id != self._main_thread_id:
+            prefix.append(f"thread:{thread_names.get(thread_id, thread_id)}")
+        return ";".join([*prefix, *reversed(names)])
+
+    # -- output ---------------------------------------------------------------
+
+    def write(self, output_dir: Path | str, top: int = 25) -> Path:
+        """Write pstats, collapsed stacks and the summary; return the directory."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = io.StringIO()
+        report.write(f"{'section':<40} {'calls':>7} {'total ms':>10} {'max ms':>9}\n")
+        for name, stats in sorted(self.sections.items(), key=lambda i: -i[1].total_ms):
+            report.write(
+                f"{name:<40} {stats.calls:>7} {stats.total_ms:>10.1f} {stats.max_ms:>9.1f}\n"
+            )
+        for name in dict.fromkeys(section for section, _ in self.profiles):
+            stats = self.stats(name, stream=report)
+            stats.dump_stats(output_dir / f"{name}.pstats")
+            report.write(f"\n=== {name} ===\n")
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        (output_dir / "summary.txt").write_text(report.getvalue())
+        with (output_dir / "profile.collapsed").open("w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return output_dir
+
+
+def _enable(profile: cProfile.Profile) -> bool:
+    """Enable ``profile``; False if another thread's profile holds the hook (3.12+)."""
+    try:
+        profile.enable()
+    except ValueError:
+        return False
+    return True
+
+
+def instrument_app(profiler: Profiler) -> None:
+    """Wrap app start-up, every screen's mount and refresh methods, and its DB jobs.
+
+    The screens' ``_fetch_*`` functions run on ``DatabaseWorker`` threads and
+    get a section each; ``DatabaseWorker._call`` is wrapped too, so any other
+    job (and the pool checkout) is charged to ``db_worker._call``.
+    """
+    from devflow import app as app_module
+    from devflow.db import worker
+    from devflow.screens import categories, daily, projects, tasks, timer, weekly
+
+    profiler.wrap(app_module.DevFlowApp, "on_mount", "app.on_mount")
+    profiler.wrap(app_module, "recover_crashed_session", "recover_crashed_session")
+    profiler.wrap(worker.DatabaseWorker, "_call", "db_worker._call")
+    for module in (timer, daily, weekly, projects, categories, tasks):
+        screen_name = module.__name__.rsplit(".", 1)[1]
+        for attr, value in list(vars(module).items()):
+            if attr.startswith("_fetch_") and callable(value):
+                profiler.wrap(module, attr, f"{screen_name}.{attr}")
+        for cls in vars(module).values():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            for attr in ("on_mount", "_refresh", "_refresh_table"):
+                if attr in vars(cls):
+                    profiler.wrap(cls, attr, f"{screen_name}.{attr}")
+
+
+def run_profiled(
+    target: Callable[[Profiler], Any], output_dir: Path | str = DEFAULT_OUTPUT_DIR
+) -> Any:
+    """Run ``target(profiler)`` with sampling on, then write the results."""
+    profiler = Profiler()
+    profiler.start_sampling()
+    try:
+        return target(profiler)
+    finally:
+        profiler.stop_sampling()
+        profiler.unwrap_all()
+        written = profiler.write(output_dir)
+        print(f"Profile written to {written}/ (summary.txt, *.pstats, profile.collapsed)",
+              file=sys.stderr)
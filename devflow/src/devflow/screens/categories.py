@@ -15,6 +15,7 @@ class CategoriesScreen(Container):
     """Manage categories: list, add, edit, archive, restore."""
 
     can_focus = True
+    WATCHED_TABLES = frozenset({"categories"})
 
     DEFAULT_CSS = """
     CategoriesScreen {
@@ -70,6 +71,14 @@ class CategoriesScreen(Container):
     def action_cursor_up(self) -> None:
         self.query_one("#categories-table", DataTable).action_cursor_up()
 
+    def refresh_data(self) -> None:
+        """Reload after the data changed elsewhere, keeping the cursor row."""
+        table = self.query_one("#categories-table", DataTable)
+        row = table.cursor_row
+        self._refresh_table()
+        if table.row_count:
+            table.move_cursor(row=min(row, table.row_count - 1))
+
     def _refresh_table(self) -> None:
         conn = self.app.db
         if conn is None:
@@ -2,22 +2,38 @@
 
 from __future__ import annotations
 
+import sqlite3
 from datetime import date, datetime, timedelta
 
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
 from textual.widgets import DataTable, Static
 
 from devflow.db import queries
+from devflow.db.models import TimeEntryDetail
 from devflow.widgets.bar_chart import format_duration
 from devflow.widgets.modal import ConfirmModal
 
 
+def _fetch_day(
+    conn: sqlite3.Connection, day: date, view_mode: int
+) -> tuple[list[TimeEntryDetail], list[tuple[str, int]]]:
+    """The day's entries plus the totals the view shows; runs on the DB worker."""
+    entries = queries.list_time_entry_details_for_date(conn, day)
+    if view_mode == 1:
+        return entries, queries.daily_totals_by_project(conn, day)
+    if view_mode == 2:
+        return entries, queries.daily_totals_by_category(conn, day)
+    return entries, []
+
+
 class DailyReportScreen(Container):
     """Daily report: chronological log, totals by project/category, date navigation."""
 
     can_focus = True
+    WATCHED_TABLES = frozenset({"time_entries", "tasks", "projects", "categories"})
 
     DEFAULT_CSS = """
     DailyReportScreen {
@@ -88,11 +104,12 @@ class DailyReportScreen(Container):
     def action_cursor_up(self) -> None:
         self.query_one("#daily-table", DataTable).action_cursor_up()
 
-    def _refresh(self) -> None:
-        conn = self.app.db
-        if conn is None:
-            return
+    def refresh_data(self) -> None:
+        """Reload after the data changed elsewhere, keeping the cursor row."""
+        self._refresh(cursor_row=self.query_one("#daily-table", DataTable).cursor_row)
 
+    def _refresh(self, cursor_row: int | None = None) -> None:
+        """Update the header now and load the day's data in the background."""
         date_str = self._current_date.isoformat()
         today = date.today()
 
@@ -122,42 +139,42 @@ class DailyReportScreen(Container):
             summary.display = True
             hints.update("(v) change view")
 
+        self._load(self._current_date, self._view_mode, cursor_row)
+
+    @work(exclusive=True, group="daily-load")
+    async def _load(self, day: date, view_mode: int, cursor_row: int | None) -> None:
+        # Exclusive: a newer h/l/v cancels this load, so a stale day never paints.
+        db_worker = self.app.db_worker
+        if db_worker is None:
+            return
+        entries, totals = await db_worker.run(_fetch_day, day, view_mode)
+
         # Entries table (refresh data even if hidden)
+        table = self.query_one("#daily-table", DataTable)
         table.clear()
-        entries = queries.list_time_entries_for_date(conn, date_str)
         for e in entries:
-            task = queries.get_task(conn, e.task_id)
-            cat = queries.get_category(conn, e.category_id)
-            project_name = ""
-            if task:
-                project = queries.get_project(conn, task.project_id)
-                project_name = project.name if project else "?"
-            task_name = task.name if task else "?"
-            cat_name = cat.name if cat else "?"
-
-            start_time = e.start.split(" ")[1] if " " in e.start else e.start
-            end_time = e.end.split(" ")[1] if " " in e.end else e.end
+            start_time = e.start.strftime("%H:%M:%S")
+            end_time = e.end.strftime("%H:%M:%S")
 
             table.add_row(
-                start_time, end_time, project_name, task_name, cat_name,
+                start_time, end_time, e.project_name, e.task_name, e.category_name,
                 format_duration(e.duration_seconds),
                 key=str(e.id),
             )
 
+        if cursor_row is not None and table.row_count:
+            table.move_cursor(row=min(cursor_row, table.row_count - 1))
+
         # Summary data
         lines = []
-        if self._view_mode == 1:
-            project_totals = queries.daily_totals_by_project(conn, date_str)
+        if view_mode == 1:
             lines.append("[bold #bd93f9]Totals by Project:[/]")
-            for name, secs in project_totals:
-                lines.append(f"  {name}: {format_duration(secs)}")
-        elif self._view_mode == 2:
-            category_totals = queries.daily_totals_by_category(conn, date_str)
+        elif view_mode == 2:
             lines.append("[bold #bd93f9]Totals by Category:[/]")
-            for name, secs in category_totals:
-                lines.append(f"  {name}: {format_duration(secs)}")
+        for name, secs in totals:
+            lines.append(f"  {name}: {format_duration(secs)}")
 
-        summary.update("\n".join(lines) if lines else "No entries")
+        self.query_one("#summary", Static).update("\n".join(lines) if lines else "No entries")
 
     def action_prev_day(self) -> None:
         self._current_date -= timedelta(days=1)
@@ -15,6 +15,7 @@ class ProjectsScreen(Container):
     """Manage projects: list, add, edit, archive, restore."""
 
     can_focus = True
+    WATCHED_TABLES = frozenset({"projects"})
 
     DEFAULT_CSS = """
     ProjectsScreen {
@@ -78,6 +79,14 @@ class ProjectsScreen(Container):
         project_id = int(event.row_key.value)
         self.app._navigate_to("tasks", project_id=project_id)
 
+    def refresh_data(self) -> None:
+        """Reload after the data changed elsewhere, keeping the cursor row."""
+        table = self.query_one("#projects-table", DataTable)
+        row = table.cursor_row
+        self._refresh_table()
+        if table.row_count:
+            table.move_cursor(row=min(row, table.row_count - 1))
+
     def _refresh_table(self) -> None:
         conn = self.app.db
         if conn is None:
@@ -2,22 +2,38 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import sqlite3
 
+from textual import work
 from textual.app import ComposeResult
 from textual.containers import Vertical, Horizontal, Container
 from textual.widgets import Button, Label, Select, Static, Digits
 from textual.timer import Timer
 
 from devflow.db import queries
+from devflow.db.models import Category, Project
 from devflow.timer import engine
+from devflow.timer.scheduler import MidnightScheduler
 from devflow.widgets.bar_chart import format_duration
 
 
+def _selected_id(value: object) -> int | None:
+    # The "nothing selected" sentinel differs across Textual versions
+    # (Select.BLANK, later Select.NULL); every real option value is an id.
+    return value if isinstance(value, int) else None
+
+
+def _fetch_selectors(conn: sqlite3.Connection) -> tuple[list[Project], list[Category]]:
+    """Runs on the DB worker."""
+    return queries.list_projects(conn), queries.list_categories(conn)
+
+
 class TimerScreen(Container):
     """Main timer view with selection controls and live elapsed display."""
 
     can_focus = True
+    # Tables whose changes by other processes trigger refresh_data().
+    WATCHED_TABLES = frozenset({"projects", "tasks", "categories", "active_session"})
 
     DEFAULT_CSS = """
     TimerScreen {
@@ -91,7 +107,11 @@ class TimerScreen(Container):
     def __init__(self) -> None:
         super().__init__()
         self._timer_interval: Timer | None = None
-        self._midnight_interval: Timer | None = None
+        self._midnight = MidnightScheduler(
+            self.set_timer, self._check_midnight, on_clock_jump=self._resync_after_clock_jump
+        )
+        # Task to reselect once the task list of a restored project loads.
+        self._restore_task: int | None = None
 
     def compose(self) -> ComposeResult:
         yield Static("DevFlow", id="title")
@@ -116,42 +136,71 @@ class TimerScreen(Container):
                 yield Button("STOP TIMER", id="btn-stop")
 
     def on_mount(self) -> None:
+        # Other screens may have ended the session (e.g. by archiving its
+        # project), so resync once here; ticks only read the cached state.
+        if self.app.db:
+            self.app.timer_state.load(self.app.db)
         self._load_selectors()
         self._update_timer_display()
         self._timer_interval = self.set_interval(1, self._tick)
-        self._midnight_interval = self.set_interval(60, self._check_midnight)
+        self._midnight.start()
         
         # Initial focus
-        session = queries.get_active_session(self.app.db) if self.app.db else None
-        if session:
+        if self.app.timer_state.running:
             self.query_one("#btn-stop", Button).focus()
         else:
             self.query_one("#sel-project", Select).focus()
 
-    def _load_selectors(self) -> None:
-        conn = self.app.db
-        if conn is None:
+    def refresh_data(self) -> None:
+        """Reload after the data changed elsewhere, keeping the selections."""
+        if self.app.db:
+            self.app.timer_state.load(self.app.db)
+        self._load_selectors(
+            project=_selected_id(self.query_one("#sel-project", Select).value),
+            task=_selected_id(self.query_one("#sel-task", Select).value),
+            category=_selected_id(self.query_one("#sel-category", Select).value),
+        )
+        self._update_timer_display()
+
+    @work(exclusive=True, group="timer-selectors")
+    async def _load_selectors(
+        self, project: int | None = None, task: int | None = None, category: int | None = None
+    ) -> None:
+        """Fill the project and category selectors, reselecting the given ids."""
+        db_worker = self.app.db_worker
+        if db_worker is None:
             return
+        projects, categories = await db_worker.run(_fetch_selectors)
 
-        projects = queries.list_projects(conn)
         self.query_one("#sel-project", Select).set_options(
             [(p.name, p.id) for p in projects]
         )
-
-        categories = queries.list_categories(conn)
         self.query_one("#sel-category", Select).set_options(
             [(c.name, c.id) for c in categories]
         )
+        if project in {p.id for p in projects}:
+            self._restore_task = task
+            self.query_one("#sel-project", Select).value = project
+        if category in {c.id for c in categories}:
+            self.query_one("#sel-category", Select).value = category
 
     def on_select_changed(self, event: Select.Changed) -> None:
-        if event.select.id == "sel-project" and event.value is not Select.BLANK:
-            conn = self.app.db
-            if conn is None:
-                return
-            tasks = queries.list_tasks(conn, event.value)
-            self.query_one("#sel-task", Select).set_options(
-                [(t.name, t.id) for t in tasks]
-            )
+        project_id = _selected_id(event.value)
+        if event.select.id == "sel-project" and project_id is not None:
+            self._load_tasks(project_id)
+
+    @work(exclusive=True, group="timer-tasks")
+    async def _load_tasks(self, project_id: int) -> None:
+        # Exclusive: scrolling through projects only fills the last one's tasks.
+        db_worker = self.app.db_worker
+        if db_worker is None:
+            return
+        tasks = await db_worker.run(queries.list_tasks, project_id)
+        task_select = self.query_one("#sel-task", Select)
+        task_select.set_options([(t.name, t.id) for t in tasks])
+        restore, self._restore_task = self._restore_task, None
+        if restore in {t.id for t in tasks}:
+            task_select.value = restore
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         conn = self.app.db
@@ -159,42 +208,50 @@ class TimerScreen(Container):
             return
 
         if event.button.id == "btn-start":
-            task_sel = self.query_one("#sel-task", Select)
-            cat_sel = self.query_one("#sel-category", Select)
+            task_id = _selected_id(self.query_one("#sel-task", Select).value)
+            category_id = _selected_id(self.query_one("#sel-category", Select).value)
 
-            if task_sel.value is Select.BLANK or cat_sel.value is Select.BLANK:
+            if task_id is None or category_id is None:
                 return
 
-            engine.start_timer(conn, task_sel.value, cat_sel.value)
+            engine.start_timer(conn, task_id, category_id, state=self.app.timer_state)
             self._update_timer_display()
             self.query_one("#btn-stop", Button).focus()
 
         elif event.button.id == "btn-stop":
-            engine.stop_timer(conn)
+            engine.stop_timer(conn, state=self.app.timer_state)
             self._update_timer_display()
             self.query_one("#sel-project", Select).focus()
 
     def _tick(self) -> None:
-        self._update_timer_display()
+        self._midnight.check_clock()
+        # Stays mounted while other screens are shown; only paint when visible.
+        if self.display:
+            self._update_timer_display()
+
+    def _resync_after_clock_jump(self) -> None:
+        # After a resume the session may have been stopped or restarted by
+        # another process meanwhile; a same-day resume makes no split, so
+        # nothing else would reload it.
+        if self.app.db is not None:
+            self.app.timer_state.load(self.app.db)
+            self._update_timer_display()
 
     def _check_midnight(self) -> None:
         conn = self.app.db
         if conn is None:
             return
-        engine.check_midnight_split(conn)
+        if engine.check_midnight_split(conn, state=self.app.timer_state):
+            self._update_timer_display()
 
     def _update_timer_display(self) -> None:
-        conn = self.app.db
-        if conn is None:
-            return
-
+        state = self.app.timer_state
         display_container = self.query_one("#timer-display", Vertical)
-        session = queries.get_active_session(conn)
         btn_start = self.query_one("#btn-start", Button)
         btn_stop = self.query_one("#btn-stop", Button)
         selectors = self.query_one("#selectors", Vertical)
 
-        if session is None:
+        if not state.running:
             display_container.display = False
             btn_start.display = True
             btn_stop.display = False
@@ -206,18 +263,7 @@ class TimerScreen(Container):
         btn_stop.display = True
         selectors.display = False
 
-        task = queries.get_task(conn, session.task_id)
-        category = queries.get_category(conn, session.category_id)
-        if task is None or category is None:
-            display_container.display = False
-            return
-
-        project = queries.get_project(conn, task.project_id)
-        project_name = project.name if project else "?"
-
-        start = datetime.strptime(session.start_time, "%Y-%m-%d %H:%M:%S")
-        elapsed = int((datetime.now() - start).total_seconds())
-        clock_str = format_duration(elapsed)
+        clock_str = format_duration(state.elapsed_seconds())
 
-        self.query_one("#timer-info", Static).update(f"{project_name} | {task.name} | {category.name}")
+        self.query_one("#timer-info", Static).update(state.label())
         self.query_one("#timer-clock", Digits).update(clock_str)
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import sqlite3
 from datetime import date, datetime, timedelta
 
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
@@ -13,10 +15,23 @@ from devflow.db import queries
 from devflow.widgets.bar_chart import format_hours, generate_bar
 
 
+def _fetch_week(
+    conn: sqlite3.Connection, week_start: date, week_end: date, view_mode: int
+) -> tuple[list[tuple[date, int]], list[tuple[str, int]]]:
+    """Per-day totals plus the breakdown the view shows; runs on the DB worker."""
+    day_totals = queries.weekly_totals_by_day(conn, week_start, week_end)
+    if view_mode == 1:
+        return day_totals, queries.weekly_totals_by_project(conn, week_start, week_end)
+    if view_mode == 2:
+        return day_totals, queries.weekly_totals_by_category(conn, week_start, week_end)
+    return day_totals, []
+
+
 class WeeklyReportScreen(Container):
     """Weekly report: ASCII bar charts per day, project/category breakdowns."""
 
     can_focus = True
+    WATCHED_TABLES = frozenset({"time_entries", "tasks", "projects", "categories"})
 
     DEFAULT_CSS = """
     WeeklyReportScreen {
@@ -79,11 +94,12 @@ class WeeklyReportScreen(Container):
     def on_mount(self) -> None:
         self._refresh()
 
-    def _refresh(self) -> None:
-        conn = self.app.db
-        if conn is None:
-            return
+    def refresh_data(self) -> None:
+        """Reload after the data changed elsewhere."""
+        self._refresh()
 
+    def _refresh(self) -> None:
+        """Update the header now and load the week's data in the background."""
         week_end = self._week_start + timedelta(days=7)
         iso = self._week_start.isocalendar()
 
@@ -109,12 +125,17 @@ class WeeklyReportScreen(Container):
             chart.display = False
             breakdown.display = True
 
-        # Query data
-        week_start_str = f"{self._week_start.isoformat()} 00:00:00"
-        week_end_str = f"{week_end.isoformat()} 00:00:00"
+        self._load(self._week_start, week_end, self._view_mode)
+
+    @work(exclusive=True, group="weekly-load")
+    async def _load(self, week_start: date, week_end: date, view_mode: int) -> None:
+        # Exclusive: a newer h/l/v cancels this load, so a stale week never paints.
+        db_worker = self.app.db_worker
+        if db_worker is None:
+            return
+        day_totals, totals = await db_worker.run(_fetch_week, week_start, week_end, view_mode)
 
         # Build Chart
-        day_totals = queries.weekly_totals_by_day(conn, week_start_str, week_end_str)
         day_map = dict(day_totals)
         day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
         max_seconds = max(day_map.values()) if day_map else 0
@@ -122,9 +143,8 @@ class WeeklyReportScreen(Container):
 
         chart_lines = []
         for i, day_name in enumerate(day_names):
-            day_date = self._week_start + timedelta(days=i)
-            day_str = day_date.isoformat()
-            secs = day_map.get(day_str, 0)
+            day_date = week_start + timedelta(days=i)
+            secs = day_map.get(day_date, 0)
             bar = generate_bar(secs, max_seconds) if secs > 0 else ""
             hours_label = f" ({format_hours(secs)})" if secs > 0 else ""
             chart_lines.append(
@@ -132,22 +152,18 @@ class WeeklyReportScreen(Container):
             )
         chart_lines.append("")
         chart_lines.append(f"  [bold]Total Hours: {format_hours(total_seconds)}[/]")
-        chart.update("\n".join(chart_lines))
+        self.query_one("#chart", Static).update("\n".join(chart_lines))
 
         # Breakdown
         breakdown_lines = []
-        if self._view_mode == 1:
-            project_totals = queries.weekly_totals_by_project(conn, week_start_str, week_end_str)
+        if view_mode == 1:
             breakdown_lines.append("[bold #bd93f9]Breakdown by Project:[/]")
-            for name, secs in project_totals:
-                breakdown_lines.append(f"  {name}: {format_hours(secs)}")
-        elif self._view_mode == 2:
-            category_totals = queries.weekly_totals_by_category(conn, week_start_str, week_end_str)
+        elif view_mode == 2:
             breakdown_lines.append("[bold #bd93f9]Breakdown by Category:[/]")
-            for name, secs in category_totals:
-                breakdown_lines.append(f"  {name}: {format_hours(secs)}")
+        for name, secs in totals:
+            breakdown_lines.append(f"  {name}: {format_hours(secs)}")
 
-        breakdown.update(
+        self.query_one("#breakdown", Static).update(
             "\n".join(breakdown_lines) if breakdown_lines else "No entries"
         )
 
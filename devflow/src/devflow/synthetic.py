@@ -0,0 +1,183 @@
+"""Synthetic history generator for load and scaling tests.
+
+Fills a database with years of plausible time tracking: projects with
+tasks, some of them archived, and a working day of back-to-back entries
+for every day in the range, with the occasional late session split at
+midnight exactly as ``timer.engine`` would split it. Output is fully
+determined by ``SyntheticConfig`` (including ``seed``), so a benchmark can
+regenerate the same database on any machine.
+
+Everything is written in one transaction through the bulk
+``queries.create_time_entries`` path; pair it with the ``bulk`` connection
+profile for file databases.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from devflow.db import queries
+from devflow.db.connection import unit_of_work
+from devflow.db.timestamps import day_bounds, day_key, to_epoch
+
+_DAY_START = 8 * 3600  # earliest first entry of a working day
+_WORKDAY_SECONDS = 10 * 3600  # entries are packed into this window
+_ARCHIVED_AT = "2000-01-01 00:00:00"
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """Shape of the generated history."""
+
+    days: int = 365 * 3
+    end: date | None = None  # last generated day; defaults to yesterday
+    projects: int = 12
+    tasks_per_project: int = 8
+    entries_per_day: int = 12
+    archive_ratio: float = 0.25  # share of projects and tasks archived
+    midnight_ratio: float = 0.02  # share of days ending in a midnight-spanning session
+    weekends: bool = False
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class SyntheticSummary:
+    projects: int
+    tasks: int
+    entries: int
+
+
+def generate_history(
+    conn: sqlite3.Connection, config: SyntheticConfig = SyntheticConfig()
+) -> SyntheticSummary:
+    """Populate ``conn`` according to ``config`` in a single transaction."""
+    if config.days < 1 or config.projects < 1 or config.tasks_per_project < 1:
+        raise ValueError("days, projects and tasks_per_project must be at least 1")
+    if config.entries_per_day < 1:
+        raise ValueError("entries_per_day must be at least 1")
+    if not 0.0 <= config.archive_ratio <= 1.0 or not 0.0 <= config.midnight_ratio <= 1.0:
+        raise ValueError("archive_ratio and midnight_ratio must be between 0 and 1")
+
+    rng = random.Random(config.seed)
+    with unit_of_work(conn):
+        task_ids = _create_projects_and_tasks(conn, config, rng)
+        category_ids = [c.id for c in queries.list_categories(conn)]
+        entries = queries.create_time_entries(
+            conn, _iter_entries(config, rng, task_ids, category_ids)
+        )
+    return SyntheticSummary(
+        projects=config.projects,
+        tasks=len(task_ids),
+        entries=entries,
+    )
+
+
+def _create_projects_and_tasks(
+    conn: sqlite3.Connection, config: SyntheticConfig, rng: random.Random
+) -> list[int]:
+    """Insert projects and tasks with ``executemany``; return the task ids."""
+    (first_project,) = conn.execute(
+        "SELECT COALESCE(MAX(id), 0) + 1 FROM projects"
+    ).fetchone()
+    archived_projects = set(
+        rng.sample(range(config.projects), round(config.projects * config.archive_ratio))
+    )
+    conn.executemany(
+        "INSERT INTO projects (id, name, archived_at) VALUES (?, ?, ?)",
+        [
+            (
+                first_project + i,
+                f"Synthetic {first_project + i}",
+                _ARCHIVED_AT if i in archived_projects else None,
+            )
+            for i in range(config.projects)
+        ],
+    )
+
+    (first_task,) = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()
+    total_tasks = config.projects * config.tasks_per_project
+    archived_tasks = set(
+        rng.sample(range(total_tasks), round(total_tasks * config.archive_ratio))
+    )
+    conn.executemany(
+        "INSERT INTO tasks (id, project_id, name, archived_at) VALUES (?, ?, ?, ?)",
+        [
+            (
+                first_task + i,
+                first_project + i // config.tasks_per_project,
+                f"Task {i % config.tasks_per_project + 1}",
+                _ARCHIVED_AT if i in archived_tasks else None,
+            )
+            for i in range(total_tasks)
+        ],
+    )
+    return [first_task + i for i in range(total_tasks)]
+
+
+def _iter_entries(
+    config: SyntheticConfig,
+    rng: random.Random,
+    task_ids: list[int],
+    category_ids: list[int],
+) -> Iterator[queries.NewTimeEntry]:
+    """Yield entries day by day in chronological order.
+
+    This runs once per row, so it avoids datetime arithmetic and ``randint``:
+    an entry's timestamps are its day's midnight plus a second count, and
+    every draw is scaled from ``rng.random()``. Only days the clocks change
+    on convert each time of day through ``datetime``.
+    """
+    end = config.end or date.today() - timedelta(days=1)
+    first = end - timedelta(days=config.days - 1)
+    slot = _WORKDAY_SECONDS // config.entries_per_day
+    shortest = max(slot // 2, 1)
+    spread = max(slot - 60 - shortest, 0) + 1
+    random_ = rng.random
+    categories = len(category_ids)
+
+    for offset in range(config.days):
+        current = first + timedelta(days=offset)
+        if not config.weekends and current.weekday() >= 5:
+            continue
+        day = day_key(current)
+        at = _clock(current)
+        # A few focus tasks per day, as people really work.
+        focus = rng.sample(task_ids, min(3, len(task_ids)))
+
+        clock = _DAY_START + int(random_() * 7200)
+        for _ in range(config.entries_per_day):
+            duration = shortest + int(random_() * spread)
+            start = at(clock)
+            yield (
+                focus[int(random_() * len(focus))],
+                category_ids[int(random_() * categories)],
+                start,
+                start + duration,
+                day,
+            )
+            clock += slot
+
+        if current < end and random_() < config.midnight_ratio:
+            # A late session split at midnight the way engine.stop_timer does:
+            # the first part ends at 23:59:59, the rest starts at 00:00:00.
+            start = 86400 - 600 - int(random_() * 3000)
+            after = 300 + int(random_() * 5100)
+            task_id = focus[int(random_() * len(focus))]
+            category_id = category_ids[int(random_() * categories)]
+            yield (task_id, category_id, at(start), at(86399), day)
+            next_day = current + timedelta(days=1)
+            next_at = _clock(next_day)
+            yield (task_id, category_id, next_at(0), next_at(after), day_key(next_day))
+
+
+def _clock(day: date) -> Callable[[int], int]:
+    """Map seconds after local midnight on ``day`` to POSIX seconds."""
+    midnight, next_midnight = day_bounds(day)
+    if next_midnight - midnight == 86400:
+        return lambda seconds: midnight + seconds
+    start = datetime.combine(day, time.min)
+    return lambda seconds: to_epoch(start + timedelta(seconds=seconds))
@@ -2,81 +2,178 @@
 
 from __future__ import annotations
 
+import math
+import os
 import sqlite3
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from devflow.db import queries
+from devflow.db.connection import unit_of_work
 from devflow.db.models import ActiveSession, TimeEntry
+from devflow.timer.state import TimerState
 
 
 def start_timer(
-    conn: sqlite3.Connection, task_id: int, category_id: int
+    conn: sqlite3.Connection,
+    task_id: int,
+    category_id: int,
+    *,
+    state: TimerState | None = None,
 ) -> ActiveSession:
-    """Start a new timer. Auto-stops any running timer first."""
-    existing = queries.get_active_session(conn)
-    if existing:
-        stop_timer(conn)
+    """Start a new timer. Auto-stops any running timer first.
+
+    Runs as one transaction. If ``state`` is given it is reloaded to reflect
+    the new session.
+    """
+    with unit_of_work(conn):
+        existing = queries.get_active_session(conn)
+        if existing:
+            stop_timer(conn)
 
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    return queries.set_active_session(conn, task_id, category_id, now)
+        session = queries.set_active_session(conn, task_id, category_id, datetime.now())
+    if state is not None:
+        state.load(conn)
+    return session
 
 
-def stop_timer(conn: sqlite3.Connection) -> list[TimeEntry]:
+def stop_timer(
+    conn: sqlite3.Connection, *, state: TimerState | None = None
+) -> list[TimeEntry]:
     """Stop the running timer and save time entries (with midnight splits).
 
-    Returns the list of created time entries.
+    Runs as one transaction. If ``state`` is given it is cleared. Returns
+    the list of created time entries.
     """
-    session = queries.get_active_session(conn)
-    if session is None:
-        return []
+    with unit_of_work(conn):
+        session = queries.get_active_session(conn)
+        if session is None:
+            entries: list[TimeEntry] = []
+        else:
+            entries = _create_entries_with_midnight_split(
+                conn, session.task_id, session.category_id, session.start_time, datetime.now()
+            )
+            queries.clear_active_session(conn)
+    if state is not None:
+        state.clear()
+    return entries
 
-    now = datetime.now()
-    start = datetime.strptime(session.start_time, "%Y-%m-%d %H:%M:%S")
 
-    entries = _create_entries_with_midnight_split(
-        conn, session.task_id, session.category_id, start, now
-    )
-    queries.clear_active_session(conn)
-    return entries
+RECOVERY_MAX_HOURS_ENV_VAR = "DEVFLOW_RECOVERY_MAX_HOURS"
+
 
+@dataclass(frozen=True)
+class RecoveryPolicy:
+    """How ``recover_crashed_session`` treats a session found at startup.
+
+    A session older than ``max_hours`` is taken to be abandoned (say, a
+    laptop closed over a holiday): only its first ``max_hours`` are recorded
+    and it is stopped there. ``None`` records it in full and keeps it running.
+    """
 
-def recover_crashed_session(conn: sqlite3.Connection) -> list[TimeEntry]:
+    max_hours: float | None = 7 * 24
+
+    @classmethod
+    def from_env(cls) -> RecoveryPolicy:
+        """``$DEVFLOW_RECOVERY_MAX_HOURS``: a positive number of hours, or ``none``."""
+        value = os.environ.get(RECOVERY_MAX_HOURS_ENV_VAR, "").strip().lower()
+        if not value:
+            return cls()
+        if value == "none":
+            return cls(max_hours=None)
+        try:
+            max_hours = float(value)
+        except ValueError:
+            raise ValueError(
+                f"{RECOVERY_MAX_HOURS_ENV_VAR} must be a number of hours or 'none', got {value!r}"
+            ) from None
+        if not math.isfinite(max_hours) or max_hours <= 0:
+            raise ValueError(
+                f"{RECOVERY_MAX_HOURS_ENV_VAR} must be a positive number of hours, got {value!r}"
+            )
+        return cls(max_hours=max_hours)
+
+
+def recover_crashed_session(
+    conn: sqlite3.Connection,
+    *,
+    state: TimerState | None = None,
+    policy: RecoveryPolicy | None = None,
+) -> list[TimeEntry]:
     """Recover an orphaned active session on startup.
 
-    Keeps the session running, but handles midnight splits if needed.
+    Keeps the session running, but handles midnight splits if needed. A
+    session older than the policy's ``max_hours`` (default from the
+    environment) is instead recorded up to the cap and stopped; the caller
+    can tell by the session no longer running.
     Returns any entries created by splits.
     """
-    return check_midnight_split(conn)
+    policy = policy or RecoveryPolicy.from_env()
+    if policy.max_hours is not None:
+        entries = _stop_abandoned_session(conn, policy.max_hours)
+        if entries is not None:
+            if state is not None:
+                state.clear()
+            return entries
+    return check_midnight_split(conn, state=state)
+
+
+def _stop_abandoned_session(
+    conn: sqlite3.Connection, max_hours: float
+) -> list[TimeEntry] | None:
+    """Record and stop a session older than ``max_hours``; None if there is none."""
+    with unit_of_work(conn):
+        session = queries.get_active_session(conn)
+        if session is None:
+            return None
+        start = session.start_time
+        cutoff = start + timedelta(hours=max_hours)
+        if datetime.now() <= cutoff:
+            return None
+        entries = _create_entries_with_midnight_split(
+            conn, session.task_id, session.category_id, start, cutoff
+        )
+        queries.clear_active_session(conn)
+    return entries
 
 
-def check_midnight_split(conn: sqlite3.Connection) -> list[TimeEntry]:
+def check_midnight_split(
+    conn: sqlite3.Connection, *, state: TimerState | None = None
+) -> list[TimeEntry]:
     """Check if the active timer crossed midnight and split if needed.
 
-    Called periodically (e.g., every minute) and on startup. If the current
+    Called by the midnight scheduler and on startup. If the current
     date differs from the session's start date, splits the timer at each
     midnight boundary and continues the session for today.
 
+    The split runs as one transaction. If ``state`` is given it is reloaded
+    after a split so the display re-anchors at midnight.
+
     Returns any entries created by the split.
     """
     session = queries.get_active_session(conn)
     if session is None:
         return []
 
-    start = datetime.strptime(session.start_time, "%Y-%m-%d %H:%M:%S")
+    start = session.start_time
     now = datetime.now()
 
     if start.date() == now.date():
         return []
 
-    # Split: save all entries up to today's midnight
-    today_midnight = datetime.combine(now.date(), datetime.min.time())
-    entries = _create_entries_with_midnight_split(
-        conn, session.task_id, session.category_id, start, today_midnight
-    )
+    with unit_of_work(conn):
+        # Split: save all entries up to today's midnight
+        today_midnight = datetime.combine(now.date(), datetime.min.time())
+        entries = _create_entries_with_midnight_split(
+            conn, session.task_id, session.category_id, start, today_midnight
+        )
 
-    # Start new session at midnight of today so it continues running
-    today_str = today_midnight.strftime("%Y-%m-%d %H:%M:%S")
-    queries.set_active_session(conn, session.task_id, session.category_id, today_str)
+        # Start new session at midnight of today so it continues running
+        queries.set_active_session(
+            conn, session.task_id, session.category_id, today_midnight
+        )
+    if state is not None:
+        state.load(conn)
 
     return entries
 
@@ -88,44 +185,33 @@ def _create_entries_with_midnight_split(
     start: datetime,
     end: datetime,
 ) -> list[TimeEntry]:
-    """Create time entries, splitting at each midnight boundary."""
-    entries: list[TimeEntry] = []
+    """Create time entries, splitting at each midnight boundary.
+
+    All segments are computed first and written with one batched insert,
+    so a session left running for weeks costs one statement, not one per day.
+    """
+    rows = [
+        queries.new_time_entry(task_id, category_id, seg_start, seg_end)
+        for seg_start, seg_end in _midnight_segments(start, end)
+    ]
+    if not rows:
+        return []
+    return queries.create_time_entries(conn, rows, return_entries=True)
+
 
+def _midnight_segments(start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    """``[start, end)`` cut into per-day spans: ..23:59:59, then from 00:00:00."""
+    segments = []
     current_start = start
     while current_start.date() < end.date():
-        # End of day: 23:59:59
         day_end = datetime.combine(
             current_start.date(), datetime.max.time().replace(microsecond=0)
         )
-        entry = _save_entry(conn, task_id, category_id, current_start, day_end)
-        entries.append(entry)
-
-        # Next day starts at 00:00:00
+        segments.append((current_start, day_end))
         current_start = datetime.combine(
             current_start.date() + timedelta(days=1), datetime.min.time()
         )
-
     # Final segment (same day)
     if current_start < end:
-        entry = _save_entry(conn, task_id, category_id, current_start, end)
-        entries.append(entry)
-
-    return entries
-
-
-def _save_entry(
-    conn: sqlite3.Connection,
-    task_id: int,
-    category_id: int,
-    start: datetime,
-    end: datetime,
-) -> TimeEntry:
-    duration = int((end - start).total_seconds())
-    return queries.create_time_entry(
-        conn,
-        task_id=task_id,
-        category_id=category_id,
-        start=start.strftime("%Y-%m-%d %H:%M:%S"),
-        end=end.strftime("%Y-%m-%d %H:%M:%S"),
-        duration_seconds=duration,
-    )
+        segments.append((current_start, end))
+    return segments
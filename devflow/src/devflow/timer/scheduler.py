@@ -0,0 +1,95 @@
+"""One-shot scheduling of the midnight session split.
+
+Rather than polling ``check_midnight_split`` every minute, ``MidnightScheduler``
+arms a single timer for the next local midnight, runs the split when it
+fires and re-arms for the following one.
+
+Timers run on the monotonic clock, which stops while the machine is
+suspended, so a laptop that sleeps through midnight would split late.
+``check_clock()`` costs two clock reads and is meant to be called from an
+existing frequent tick: when wall time has moved away from monotonic time
+(resume from suspend, or the clock was set) it calls ``on_clock_jump``,
+runs the split check once and re-arms the timer. Most resumes land on the
+same day, with no split to make, so ``on_clock_jump`` is where callers
+resync anything they derived from the clock.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any, Protocol
+
+# Wall/monotonic drift, in seconds, taken to mean the clock jumped.
+CLOCK_JUMP_TOLERANCE = 5.0
+
+
+class _Timer(Protocol):
+    def stop(self) -> Any: ...
+
+
+def seconds_until_midnight(now: datetime | None = None) -> float:
+    """Seconds from ``now`` (local time) until the next local midnight.
+
+    Computed from POSIX timestamps, so a day that gains or loses an hour to
+    a DST change is 25 or 23 hours long.
+    """
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(midnight.timestamp() - now.timestamp(), 0.0)
+
+
+class MidnightScheduler:
+    """Calls ``on_midnight`` just after each local midnight.
+
+    ``set_timer(delay, callback)`` arms a one-shot timer and returns an
+    object with ``stop()``, as Textual's ``Widget.set_timer`` does.
+    ``on_clock_jump``, if given, runs first whenever ``check_clock`` finds
+    the clock jumped.
+    """
+
+    def __init__(
+        self,
+        set_timer: Callable[[float, Callable[[], None]], _Timer],
+        on_midnight: Callable[[], Any],
+        *,
+        on_clock_jump: Callable[[], Any] | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self._set_timer = set_timer
+        self._on_midnight = on_midnight
+        self._on_clock_jump = on_clock_jump
+        self._clock = clock
+        self._timer: _Timer | None = None
+        self._offset = 0.0
+
+    def start(self) -> None:
+        self._arm()
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def check_clock(self) -> None:
+        """Run the split check now if the wall clock jumped since arming."""
+        if self._timer is not None and abs(self._wall_offset() - self._offset) > CLOCK_JUMP_TOLERANCE:
+            self._fire(clock_jumped=True)
+
+    def _wall_offset(self) -> float:
+        return self._clock().timestamp() - time.monotonic()
+
+    def _arm(self) -> None:
+        self.stop()
+        self._offset = self._wall_offset()
+        self._timer = self._set_timer(seconds_until_midnight(self._clock()), self._fire)
+
+    def _fire(self, clock_jumped: bool = False) -> None:
+        self.stop()
+        try:
+            if clock_jumped and self._on_clock_jump is not None:
+                self._on_clock_jump()
+            self._on_midnight()
+        finally:
+            self._arm()
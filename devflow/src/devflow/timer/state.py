@@ -0,0 +1,50 @@
+"""In-process timer state: lets the live display tick without touching SQLite."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+
+from devflow.db import queries
+from devflow.db.models import ActiveSessionDetail
+
+
+class TimerState:
+    """Memory-resident snapshot of the active session.
+
+    Loaded once from the database and kept current by the timer engine
+    (``start_timer`` / ``stop_timer`` / ``check_midnight_split``). Elapsed
+    time is computed from the session's wall-clock start, so a display tick
+    costs no queries. Not the monotonic clock: it stops while the machine
+    is suspended, and the session keeps running through a suspend.
+    """
+
+    def __init__(self) -> None:
+        self.session: ActiveSessionDetail | None = None
+        self._start_ts = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.session is not None
+
+    def load(self, conn: sqlite3.Connection) -> None:
+        """Re-read the active session from the database."""
+        self.session = queries.get_active_session_detail(conn)
+        if self.session is not None:
+            self._start_ts = self.session.start_time.timestamp()
+
+    def clear(self) -> None:
+        self.session = None
+
+    def elapsed_seconds(self) -> int:
+        """Seconds since the session started (0 if no session is running)."""
+        if self.session is None:
+            return 0
+        return max(int(time.time() - self._start_ts), 0)
+
+    def label(self) -> str:
+        """Return 'Project | Task | Category' for the running session."""
+        if self.session is None:
+            return ""
+        project_name = self.session.project_name or "?"
+        return f"{project_name} | {self.session.task_name} | {self.session.category_name}"
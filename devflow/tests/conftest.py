@@ -1,4 +1,6 @@
-"""Shared test fixtures: in-memory database with seed data."""
+"""Shared test fixtures: in-memory database with seed data, a DST time zone."""
+
+import time
 
 import pytest
 
@@ -11,3 +13,15 @@ def conn():
     connection = get_memory_connection()
     yield connection
     connection.close()
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    """Run in America/New_York, where 2024-03-10 is 23 hours and 2024-11-03 is 25."""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is unavailable on this platform")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
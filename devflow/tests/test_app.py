@@ -0,0 +1,169 @@
+"""Tests for screen routing in DevFlowApp."""
+
+import asyncio
+from datetime import datetime, time, timedelta
+
+from devflow.app import DevFlowApp
+from devflow.db import queries
+
+
+def _run(tmp_path, monkeypatch, scenario):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    app = DevFlowApp(db_path=tmp_path / "devflow.db")
+
+    async def main():
+        async with app.run_test(size=(120, 40)) as pilot:
+            await pilot.pause()
+            await scenario(app, pilot)
+
+    asyncio.run(main())
+
+
+def test_visited_screens_are_kept_with_their_state(tmp_path, monkeypatch):
+    async def scenario(app, pilot):
+        app._navigate_to("daily")
+        await pilot.pause()
+        daily = app._screens["daily"]
+        await pilot.press("h", "v")
+        day, view = daily._current_date, daily._view_mode
+        focused = app.focused
+
+        app._navigate_to("projects")
+        await pilot.pause()
+        assert not daily.display
+        app._navigate_to("daily")
+        await pilot.pause()
+
+        assert app._screens["daily"] is daily
+        assert daily.display
+        assert (daily._current_date, daily._view_mode) == (day, view)
+        assert app.focused is focused
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+def test_reentry_refreshes_only_after_a_write(tmp_path, monkeypatch):
+    async def scenario(app, pilot):
+        app._navigate_to("projects")
+        await pilot.pause()
+        projects = app._screens["projects"]
+        calls = []
+        projects.refresh_data = lambda: calls.append(1)
+
+        app._navigate_to("timer")
+        app._navigate_to("projects")
+        assert calls == []
+
+        app._navigate_to("timer")
+        queries.create_project(app.db, "Added elsewhere")
+        app._navigate_to("projects")
+        assert calls == [1]
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+def test_tasks_screen_is_rebuilt_for_another_project(tmp_path, monkeypatch):
+    async def scenario(app, pilot):
+        first, second = queries.list_projects(app.db)[:2]
+        app._navigate_to("tasks", project_id=first.id)
+        await pilot.pause()
+        tasks = app._screens["tasks"]
+
+        app._navigate_to("tasks", project_id=first.id)
+        assert app._screens["tasks"] is tasks
+        app._navigate_to("tasks", project_id=second.id)
+        await pilot.pause()
+
+        assert app._screens["tasks"] is not tasks
+        assert app._screens["tasks"]._project_id == second.id
+        assert not tasks.is_attached
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+def test_writes_by_another_process_refresh_the_visible_screen(tmp_path, monkeypatch):
+    from devflow.db.connection import get_connection
+
+    async def scenario(app, pilot):
+        app._navigate_to("projects")
+        await pilot.pause()
+        projects = app._screens["projects"]
+        calls = []
+        projects.refresh_data = lambda: calls.append(1)
+
+        other = get_connection(app.db_path)
+        queries.create_category(other, "Unwatched here")
+        app._check_external_changes()
+        assert calls == []
+
+        task = queries.create_task(other, queries.create_project(other, "From the CLI").id, "T")
+        queries.set_active_session(other, task.id, 1, datetime(2024, 1, 15, 9))
+        other.close()
+        app._check_external_changes()
+        assert calls == [1]
+        assert app.timer_state.running
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+def test_report_shows_only_the_last_requested_day(tmp_path, monkeypatch):
+    async def scenario(app, pilot):
+        task = queries.create_task(app.db, queries.list_projects(app.db)[0].id, "T")
+        app._navigate_to("daily")
+        await pilot.pause()
+        daily = app._screens["daily"]
+        day = daily._current_date
+        start = datetime.combine(day - timedelta(days=3), time(9))
+        queries.create_time_entry(app.db, task.id, 1, start, start + timedelta(hours=1))
+
+        for _ in range(3):
+            daily.action_prev_day()
+        while not all(worker.is_finished for worker in app.workers):
+            await pilot.pause()
+
+        assert daily._current_date == day - timedelta(days=3)
+        assert daily.query_one("#daily-table").row_count == 1
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+def test_same_day_resume_reloads_the_timer(tmp_path, monkeypatch):
+    async def scenario(app, pilot):
+        app._navigate_to("timer")
+        await pilot.pause()
+        timer = app._screens["timer"]
+        assert not app.timer_state.running
+
+        # Started by the CLI while the laptop slept; waking up is the same day.
+        task = queries.create_task(app.db, queries.list_projects(app.db)[0].id, "T")
+        queries.set_active_session(app.db, task.id, 1, datetime.now() - timedelta(minutes=30))
+        wall = timer._midnight._clock
+        monkeypatch.setattr(timer._midnight, "_clock", lambda: wall() + timedelta(seconds=60))
+        timer._midnight.check_clock()
+
+        assert app.timer_state.running
+        assert 1795 <= app.timer_state.elapsed_seconds() <= 1805
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+
+def test_invalid_recovery_cap_falls_back_to_the_default(tmp_path, monkeypatch):
+    from devflow.timer import engine
+
+    monkeypatch.setenv(engine.RECOVERY_MAX_HOURS_ENV_VAR, "0")
+    notices = []
+    monkeypatch.setattr(DevFlowApp, "notify", lambda self, message, **kw: notices.append((message, kw)))
+    policies = []
+    recover = engine.recover_crashed_session
+    monkeypatch.setattr(
+        "devflow.app.recover_crashed_session",
+        lambda conn, **kw: policies.append(kw["policy"]) or recover(conn, **kw),
+    )
+
+    async def scenario(app, pilot):
+        assert policies == [engine.RecoveryPolicy()]
+        assert notices[0][1]["severity"] == "warning"
+        assert engine.RECOVERY_MAX_HOURS_ENV_VAR in notices[0][0]
+
+    _run(tmp_path, monkeypatch, scenario)
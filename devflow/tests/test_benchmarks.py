@@ -0,0 +1,85 @@
+"""Tests for the benchmark suite harness (not the timings themselves)."""
+
+import inspect
+import io
+import json
+
+import pytest
+
+from benchmarks import suite
+from devflow.db import queries
+
+
+def test_every_public_query_is_benchmarked():
+    """New public functions in queries.py must get a case in suite.CASES."""
+    public = {
+        f"queries.{name}"
+        for name, fn in inspect.getmembers(queries, inspect.isfunction)
+        if fn.__module__ == queries.__name__ and not name.startswith("_")
+    }
+    assert public <= set(suite.CASES)
+    assert {"engine.stop_timer", "engine.check_midnight_split"} <= set(suite.CASES)
+
+
+def test_run_suite_times_every_case():
+    report = suite.run_suite([50], repeat=1, out=io.StringIO())
+
+    assert set(report["results"]["50"]) == set(suite.CASES)
+    for timing in report["results"]["50"].values():
+        assert 0 <= timing["min_ms"] <= timing["median_ms"]
+    assert report["meta"]["repeat"] == 1
+
+
+def test_run_suite_only_filter():
+    report = suite.run_suite([50], repeat=1, only=["engine."], out=io.StringIO())
+    assert set(report["results"]["50"]) == {"engine.stop_timer", "engine.check_midnight_split"}
+
+
+def _report(**timings):
+    return {"results": {"1000": {k: {"median_ms": v, "min_ms": v} for k, v in timings.items()}}}
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    old = _report(fast=1.0, slow=1.0, tiny=0.01, gone=1.0)
+    new = _report(fast=1.1, slow=1.5, tiny=0.03, added=1.0)
+
+    rows = {name: regressed for _, name, _, _, regressed in suite.compare(old, new, 0.2, 0.05)}
+
+    # "tiny" tripled but stays under the noise floor; only cases in both runs compare.
+    assert rows == {"fast": False, "slow": True, "tiny": False}
+
+
+def test_compare_exit_code(tmp_path):
+    old, new = tmp_path / "old.json", tmp_path / "new.json"
+    old.write_text(json.dumps(_report(case=1.0)))
+    new.write_text(json.dumps(_report(case=2.0)))
+
+    assert suite.main(["compare", str(old), str(old)]) == 0
+    assert suite.main(["compare", str(old), str(new)]) == 1
+    assert suite.main(["compare", str(old), str(new), "--threshold", "1.5"]) == 0
+
+
+def test_tui_percentiles():
+    from benchmarks import tui
+
+    p = tui.percentiles([float(ms) for ms in range(1, 101)])
+    assert p["p50"] == pytest.approx(50.5)
+    assert p["p95"] == pytest.approx(95.05)
+    assert p["p99"] == pytest.approx(99.01)
+    assert p["max"] == 100.0
+
+
+def test_tui_measure_covers_every_scenario(tmp_path, monkeypatch):
+    import asyncio
+
+    from benchmarks import tui
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    db_path = tmp_path / "devflow.db"
+    tui.build_database(db_path, 200)
+
+    results = asyncio.run(tui.measure(db_path, samples=2, size=(120, 40)))
+
+    assert set(results) == set(tui.SCENARIOS) == set(tui.BUDGETS_MS)
+    for screen, actions in tui.SCENARIOS.items():
+        assert set(results[screen]) == {name for name, _ in actions}
@@ -0,0 +1,68 @@
+"""Tests for cross-process change detection."""
+
+from datetime import datetime
+
+from devflow.db import queries
+from devflow.db.changes import ChangeMonitor, table_versions
+from devflow.db.connection import get_connection
+
+
+def test_triggers_bump_table_versions(conn):
+    before = table_versions(conn)
+    p = queries.create_project(conn, "Versioned")
+    queries.create_task(conn, p.id, "T")
+
+    after = table_versions(conn)
+    assert after["projects"] == before["projects"] + 1
+    assert after["tasks"] == before["tasks"] + 1
+    assert after["time_entries"] == before["time_entries"]
+
+
+def test_bulk_insert_bumps_once_per_large_chunk(conn):
+    t = queries.create_task(conn, queries.list_projects(conn)[0].id, "Bulk")
+    c = queries.list_categories(conn)[0]
+    before = table_versions(conn)["time_entries"]
+
+    queries.create_time_entries(
+        conn,
+        [queries.new_time_entry(t.id, c.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 9, 30))]
+        * 1010,
+        chunk_size=500,
+    )
+
+    # Two chunks with the triggers switched off, then ten rows through the per-row trigger
+    assert table_versions(conn)["time_entries"] == before + 2 + 10
+
+
+def test_monitor_reports_other_connections_only(tmp_path):
+    path = tmp_path / "devflow.db"
+    conn = get_connection(path)
+    other = get_connection(path)
+    monitor = ChangeMonitor(conn)
+    assert monitor.poll() == frozenset()
+
+    queries.create_project(conn, "Mine")
+    assert monitor.poll() == frozenset()
+
+    p = queries.create_project(other, "Theirs")
+    queries.create_task(other, p.id, "Their task")
+    assert monitor.poll() == {"projects", "tasks"}
+    assert monitor.poll() == frozenset()
+
+    queries.set_active_session(other, queries.list_tasks(other, p.id)[0].id, 1, datetime(2024, 1, 15, 9))
+    assert monitor.poll() == {"active_session"}
+    conn.close()
+    other.close()
+
+
+def test_unchanged_files_skip_sqlite(tmp_path):
+    conn = get_connection(tmp_path / "devflow.db")
+    monitor = ChangeMonitor(conn)
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    for _ in range(5):
+        monitor.poll()
+
+    assert statements == []
+    conn.close()
@@ -1,10 +1,29 @@
 """Tests for the CLI --status headless output."""
 
-from datetime import datetime, timedelta
+import sqlite3
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from unittest.mock import patch
 
-from devflow.cli import print_status
+import pytest
+
+from devflow.cli import (
+    default_db_path,
+    export_command,
+    generate_command,
+    ics_command,
+    import_command,
+    open_export_connection,
+    open_status_connection,
+    print_status,
+    rollups_command,
+    run_status,
+)
 from devflow.db import queries
+from devflow.db.connection import _DEFAULT_DB_PATH, get_connection
+from devflow.synthetic import SyntheticConfig
 
 
 def test_status_no_timer(conn):
@@ -17,7 +36,7 @@ def test_status_with_active_timer(conn):
     t = queries.create_task(conn, p.id, "StatusT")
     c = queries.list_categories(conn)[0]
 
-    start = (datetime.now() - timedelta(hours=1, minutes=23, seconds=45)).strftime("%Y-%m-%d %H:%M:%S")
+    start = datetime.now() - timedelta(hours=1, minutes=23, seconds=45)
     queries.set_active_session(conn, t.id, c.id, start)
 
     result = print_status(conn)
@@ -36,8 +55,7 @@ def test_status_format(conn):
     t = queries.create_task(conn, p.id, "FmtT")
     c = queries.create_category(conn, "FmtC")
 
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    queries.set_active_session(conn, t.id, c.id, now)
+    queries.set_active_session(conn, t.id, c.id, datetime.now())
 
     result = print_status(conn)
     assert result.startswith("FmtP > FmtT > FmtC |")
@@ -51,7 +69,7 @@ def test_status_missing_task(conn):
 
     # Insert a session referencing valid IDs, then disable FK checks to
     # simulate a corrupted state where the task row is gone.
-    queries.set_active_session(conn, t.id, c.id, "2024-01-15 09:00:00")
+    queries.set_active_session(conn, t.id, c.id, datetime(2024, 1, 15, 9))
     conn.execute("PRAGMA foreign_keys = OFF")
     conn.execute("DELETE FROM tasks WHERE id = ?", (t.id,))
     conn.commit()
@@ -59,3 +77,198 @@ def test_status_missing_task(conn):
 
     result = print_status(conn)
     assert result == "Timer Stopped"
+
+
+def test_default_db_path_matches_connection():
+    assert Path(default_db_path()) == _DEFAULT_DB_PATH
+
+
+def test_run_status_missing_db(tmp_path):
+    db_path = tmp_path / "missing.db"
+    assert run_status(str(db_path)) == "Timer Stopped"
+    # The status path must never create the database
+    assert not db_path.exists()
+
+
+def test_run_status_reads_file_db(tmp_path):
+    db_path = tmp_path / "devflow.db"
+    conn = get_connection(db_path)
+    p = queries.create_project(conn, "FileP")
+    t = queries.create_task(conn, p.id, "FileT")
+    c = queries.create_category(conn, "FileC")
+    queries.set_active_session(conn, t.id, c.id, datetime.now())
+    conn.close()
+
+    assert run_status(str(db_path)).startswith("FileP > FileT > FileC |")
+
+
+def test_status_connection_is_read_only(tmp_path):
+    db_path = tmp_path / "devflow.db"
+    get_connection(db_path).close()
+
+    conn = open_status_connection(str(db_path))
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM projects")
+    finally:
+        conn.close()
+
+
+def test_status_imports_only_sqlite3(tmp_path):
+    """The tmux fast path must not drag in the query layer or the TUI."""
+    code = (
+        "import sys\n"
+        "from devflow.cli import run_status\n"
+        f"run_status({str(tmp_path / 'missing.db')!r})\n"
+        "print('\\n'.join(sorted(sys.modules)))\n"
+    )
+    src = Path(__file__).resolve().parent.parent / "src"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(src)},
+    )
+    modules = set(result.stdout.split())
+    assert "sqlite3" in modules
+    assert not {"devflow.db", "devflow.db.queries", "textual", "argparse"} & modules
+
+
+@pytest.mark.parametrize("command", [["export"], ["ics"], ["ics", "--incremental", "phone"]])
+def test_exports_never_create_a_database(tmp_path, monkeypatch, capsys, command):
+    from devflow.__main__ import main
+
+    db_path = tmp_path / "mistyped.db"
+    monkeypatch.setattr(sys, "argv", ["devflow", *command, "--db", str(db_path)])
+    with pytest.raises(SystemExit) as exc:
+        main()
+
+    assert exc.value.code == 1
+    assert f"No DevFlow database at {db_path}" in capsys.readouterr().err
+    assert not db_path.exists()
+
+
+def test_export_connection_is_read_only_unless_writable(tmp_path):
+    db_path = tmp_path / "devflow.db"
+    get_connection(db_path).close()
+
+    conn = open_export_connection(str(db_path))
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM projects")
+    finally:
+        conn.close()
+    conn = open_export_connection(str(db_path), writable=True)
+    try:
+        queries.set_export_watermark(conn, "phone", 0)
+    finally:
+        conn.close()
+
+
+def test_rollups_check_consistent(conn):
+    code, output = rollups_command(conn, "check")
+    assert code == 0
+    assert "consistent" in output
+
+
+def test_rollups_check_and_rebuild(conn):
+    p = queries.create_project(conn, "RollP")
+    t = queries.create_task(conn, p.id, "RollT")
+    c = queries.list_categories(conn)[0]
+    queries.create_time_entry(conn, t.id, c.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+    conn.execute("UPDATE daily_rollups SET seconds = 1")
+    conn.commit()
+
+    code, output = rollups_command(conn, "check")
+    assert code == 1
+    assert "2024-01-15" in output
+
+    code, output = rollups_command(conn, "rebuild")
+    assert code == 0
+    assert rollups_command(conn, "check")[0] == 0
+
+
+def test_generate_command(conn):
+    config = SyntheticConfig(days=7, end=date(2024, 3, 10), projects=2, tasks_per_project=2)
+    code, output = generate_command(conn, config)
+    assert code == 0
+    assert output.startswith("Generated 60 entries across 2 projects and 4 tasks")
+
+
+def test_export_command_writes_inclusive_day_range(conn, tmp_path):
+    p = queries.create_project(conn, "ExpP")
+    t = queries.create_task(conn, p.id, "ExpT")
+    c = queries.list_categories(conn)[0]
+    for day in (14, 15, 16, 17):
+        queries.create_time_entry(
+            conn, t.id, c.id, datetime(2024, 1, day, 23), datetime(2024, 1, day, 23, 30)
+        )
+    out = tmp_path / "entries.jsonl"
+
+    code, output = export_command(
+        conn, str(out), since=date(2024, 1, 15), until=date(2024, 1, 16)
+    )
+
+    assert code == 0
+    assert output.startswith(f"Exported 2 entries as jsonl to {out}")
+    assert [line[:30] for line in out.read_text().splitlines()] == [
+        '{"id":2,"start":"2024-01-15 23',
+        '{"id":3,"start":"2024-01-16 23',
+    ]
+
+
+def test_import_command_reports_rejections(conn, tmp_path):
+    source = tmp_path / "entries.csv"
+    # Spreadsheet tools save CSV with a byte-order mark.
+    source.write_text(
+        "\ufeffstart,end,project,task,category\n"
+        "2024-01-15 09:00:00,2024-01-15 10:00:00,ImpP,ImpT,Code\n"
+        "2024-01-15 10:00:00,soon,ImpP,ImpT,Code\n",
+        encoding="utf-8",
+    )
+
+    code, output = import_command(conn, str(source))
+    assert code == 1
+    assert output.startswith("Imported 1 of 2 records (0 already imported, 1 rejected)")
+    assert "line 3: end is not an ISO 8601 time: 'soon'" in output
+
+    code, output = import_command(conn, str(source))
+    assert output.startswith("Imported 0 of 2 records (1 already imported, 1 rejected)")
+
+
+def test_import_command_unreadable_input(conn, tmp_path):
+    code, output = import_command(conn, str(tmp_path / "missing.csv"))
+    assert code == 2
+    assert output.startswith("Import failed:")
+
+
+def test_ics_command_incremental_watermark(conn, tmp_path):
+    p = queries.create_project(conn, "IcsP")
+    t = queries.create_task(conn, p.id, "IcsT")
+    c = queries.list_categories(conn)[0]
+    queries.create_time_entry(conn, t.id, c.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+    out = tmp_path / "work.ics"
+
+    code, output = ics_command(conn, str(out), incremental="nightly")
+    assert code == 0
+    assert output.startswith(f"Exported 1 events to {out}")
+    assert "(everything; watermark 'nightly' now at 1)" in output
+
+    code, output = ics_command(conn, str(out), incremental="nightly")
+    assert output.startswith(f"Exported 0 events to {out}")
+    assert "(changes since 1; watermark 'nightly' now at 1)" in output
+    assert out.read_bytes().endswith(b"X-WR-CALNAME:DevFlow\r\nEND:VCALENDAR\r\n")
+
+    code, output = ics_command(conn, str(out), since=date(2024, 1, 16))
+    assert output.startswith(f"Exported 0 events to {out}")
+    assert queries.get_export_watermark(conn, "nightly") == 1
+
+
+def test_ics_command_rejects_a_range_with_incremental(conn, tmp_path):
+    out = tmp_path / "work.ics"
+    code, output = ics_command(conn, str(out), until=date(2024, 1, 31), incremental="nightly")
+    assert code == 2
+    assert "--incremental cannot be combined" in output
+    assert not out.exists()
+    assert queries.get_export_watermark(conn, "nightly") is None
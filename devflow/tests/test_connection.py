@@ -1,5 +1,10 @@
 """Tests for database connection, schema creation, and seed data."""
 
+import sqlite3
+from datetime import date, datetime, timezone
+
+import pytest
+
 from devflow.db.connection import get_memory_connection, _SEED_CATEGORIES, _SEED_PROJECTS
 
 
@@ -75,7 +80,7 @@ def test_active_session_check_constraint():
 
     # id=1 should work
     conn.execute(
-        "INSERT INTO active_session (id, task_id, category_id, start_time) VALUES (1, ?, ?, '2024-01-01 00:00:00')",
+        "INSERT INTO active_session (id, task_id, category_id, start_ts) VALUES (1, ?, ?, 1704067200)",
         (task_id, cat_id),
     )
     conn.commit()
@@ -85,7 +90,311 @@ def test_active_session_check_constraint():
     import pytest
     with pytest.raises(sqlite3.IntegrityError):
         conn.execute(
-            "INSERT INTO active_session (id, task_id, category_id, start_time) VALUES (2, ?, ?, '2024-01-01 00:00:00')",
+            "INSERT INTO active_session (id, task_id, category_id, start_ts) VALUES (2, ?, ?, 1704067200)",
             (task_id, cat_id),
         )
     conn.close()
+
+
+
+# The schema before versioning: text timestamps, no rollups, no change log.
+_V1_SCHEMA = """
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, archived_at TEXT
+);
+CREATE TABLE projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, archived_at TEXT
+);
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    name TEXT NOT NULL,
+    archived_at TEXT
+);
+CREATE TABLE time_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL REFERENCES tasks(id),
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    duration_seconds INTEGER NOT NULL
+);
+CREATE TABLE active_session (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    task_id INTEGER NOT NULL REFERENCES tasks(id),
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    start_time TEXT NOT NULL
+);
+CREATE INDEX idx_time_entries_start ON time_entries(start);
+CREATE INDEX idx_time_entries_task_id ON time_entries(task_id);
+CREATE INDEX idx_time_entries_category_id ON time_entries(category_id);
+CREATE INDEX idx_tasks_project_id ON tasks(project_id);
+"""
+
+
+def _legacy_database(db_path):
+    """Build a database as it looked before schema versioning and rollups."""
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(_V1_SCHEMA)
+    conn.execute("INSERT INTO projects (id, name) VALUES (1, 'LegacyP')")
+    conn.execute("INSERT INTO tasks (id, project_id, name) VALUES (1, 1, 'LegacyT')")
+    conn.execute("INSERT INTO categories (id, name) VALUES (1, 'LegacyC')")
+    conn.executemany(
+        "INSERT INTO time_entries (task_id, category_id, start, end, duration_seconds) "
+        "VALUES (1, 1, ?, ?, ?)",
+        [
+            ("2024-01-15 09:00:00", "2024-01-15 10:00:00", 3600),
+            ("2024-01-15 23:00:00", "2024-01-15 23:59:59", 3599),
+            ("2024-01-16 08:00:00", "2024-01-16 08:30:00", 1800),
+        ],
+    )
+    conn.execute("DELETE FROM time_entries WHERE id = 3")
+    conn.execute(
+        "INSERT INTO active_session (id, task_id, category_id, start_time) "
+        "VALUES (1, 1, 1, '2024-01-16 09:15:00')"
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_schema_version_stamped():
+    from devflow.db.migrations import SCHEMA_VERSION
+
+    conn = get_memory_connection()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    conn.close()
+
+
+def test_current_database_skips_bootstrap(tmp_path):
+    from devflow.db.connection import _ensure_schema, get_connection
+
+    db_path = tmp_path / "devflow.db"
+    get_connection(db_path).close()
+
+    statements = []
+    conn = sqlite3.connect(str(db_path))
+    conn.set_trace_callback(statements.append)
+    _ensure_schema(conn)
+    conn.close()
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_unversioned_database_is_migrated(tmp_path):
+    """A pre-versioning database is brought to the same schema as a new one."""
+    from devflow.db import queries
+    from devflow.db.connection import get_connection
+    from devflow.db.migrations import SCHEMA_VERSION
+
+    db_path = tmp_path / "devflow.db"
+    _legacy_database(db_path)
+
+    conn = get_connection(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert dict(queries.daily_totals_by_project(conn, date(2024, 1, 15))) == {"LegacyP": 7199}
+    assert queries.check_daily_rollups(conn) == []
+
+    fresh = get_memory_connection()
+    schema = "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' ORDER BY 1, 2"
+    assert conn.execute(schema).fetchall() == fresh.execute(schema).fetchall()
+    for table in (
+        "time_entries", "active_session", "daily_rollups", "time_entry_changes", "bulk_insert"
+    ):
+        columns = f"SELECT name, type, \"notnull\", pk FROM pragma_table_info('{table}')"
+        assert conn.execute(columns).fetchall() == fresh.execute(columns).fetchall()
+    switched = (
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+        "AND sql LIKE '%WHEN (SELECT active FROM bulk_insert) IS NOT 1%' ORDER BY 1"
+    )
+    assert conn.execute(switched).fetchall() == fresh.execute(switched).fetchall()
+    assert len(conn.execute(switched).fetchall()) == 3
+    assert tuple(conn.execute("SELECT id, active FROM bulk_insert").fetchone()) == (1, 0)
+    fresh.close()
+    conn.close()
+
+
+def test_text_timestamps_migrate_to_epoch_seconds(tmp_path):
+    from devflow.db import queries
+    from devflow.db.connection import get_connection
+
+    db_path = tmp_path / "devflow.db"
+    _legacy_database(db_path)
+    conn = get_connection(db_path)
+
+    entries = queries.list_time_entries_for_date(conn, date(2024, 1, 15))
+    assert [(e.id, e.start, e.end, e.duration_seconds) for e in entries] == [
+        (1, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10), 3600),
+        (2, datetime(2024, 1, 15, 23), datetime(2024, 1, 15, 23, 59, 59), 3599),
+    ]
+    days = conn.execute("SELECT day FROM time_entries ORDER BY id").fetchall()
+    assert [row[0] for row in days] == [20240115, 20240115]
+    assert queries.get_active_session(conn).start_time == datetime(2024, 1, 16, 9, 15)
+    # The deleted entry's id is not handed out again.
+    created = queries.create_time_entry(
+        conn, 1, 1, datetime(2024, 1, 17, 9), datetime(2024, 1, 17, 10)
+    )
+    assert created.id == 4
+    conn.close()
+
+
+def test_epoch_migration_uses_local_time(tmp_path, new_york):
+    from devflow.db import queries
+    from devflow.db.connection import get_connection
+
+    db_path = tmp_path / "devflow.db"
+    _legacy_database(db_path)
+    conn = get_connection(db_path)
+
+    (start_ts,) = conn.execute("SELECT start_ts FROM time_entries WHERE id = 1").fetchone()
+    assert start_ts == int(datetime(2024, 1, 15, 14, tzinfo=timezone.utc).timestamp())
+    assert queries.get_time_entry(conn, 1).start == datetime(2024, 1, 15, 9)
+    conn.close()
+
+
+def test_migrations_run_in_order(monkeypatch):
+    from devflow.db import migrations
+
+    applied = []
+    monkeypatch.setattr(
+        migrations,
+        "MIGRATIONS",
+        [lambda c, n=n: applied.append(n) for n in range(1, 5)],
+    )
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", 5)
+
+    conn = sqlite3.connect(":memory:")
+    assert migrations.run_migrations(conn, 2) == 5
+    assert applied == [2, 3, 4]
+    conn.close()
+
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    from devflow.db import migrations
+    from devflow.db.connection import get_connection
+
+    db_path = tmp_path / "devflow.db"
+    get_connection(db_path).close()
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [broken])
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", migrations.SCHEMA_VERSION + 1)
+    with pytest.raises(RuntimeError):
+        get_connection(db_path)
+
+    conn = sqlite3.connect(str(db_path))
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == migrations.SCHEMA_VERSION - 1
+    assert conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'half_done'"
+    ).fetchone() is None
+    conn.close()
+
+
+def test_interactive_profile_is_default(tmp_path, monkeypatch):
+    from devflow.db.connection import get_connection
+
+    monkeypatch.delenv("DEVFLOW_DB_PROFILE", raising=False)
+    conn = get_connection(tmp_path / "devflow.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    conn.close()
+
+
+def test_profile_argument(tmp_path, monkeypatch):
+    from devflow.db.connection import get_connection
+
+    monkeypatch.delenv("DEVFLOW_DB_PROFILE", raising=False)
+    conn = get_connection(tmp_path / "devflow.db", profile="bulk")
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0  # OFF
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -262144
+    conn.close()
+
+
+def test_profile_argument_overrides_environment(tmp_path, monkeypatch):
+    from devflow.db.connection import get_connection
+
+    monkeypatch.setenv("DEVFLOW_DB_PROFILE", "cli")
+    conn = get_connection(tmp_path / "devflow.db", profile="bulk")
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0  # OFF
+    conn.close()
+
+
+def test_profile_environment_sets_the_default(tmp_path, monkeypatch):
+    from devflow.db.connection import get_connection
+
+    monkeypatch.setenv("DEVFLOW_DB_PROFILE", "cli")
+    conn = get_connection(tmp_path / "devflow.db")
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 2000
+    conn.close()
+
+
+def test_unknown_profile(monkeypatch):
+    from devflow.db.connection import resolve_profile
+
+    monkeypatch.delenv("DEVFLOW_DB_PROFILE", raising=False)
+    with pytest.raises(ValueError, match="Unknown connection profile"):
+        resolve_profile("turbo")
+
+
+class TestUnitOfWork:
+    def test_commits_once_at_outermost_scope(self, conn):
+        from devflow.db import queries
+        from devflow.db.connection import unit_of_work
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        with unit_of_work(conn):
+            p = queries.create_project(conn, "UowP")
+            queries.create_task(conn, p.id, "UowT")
+            assert conn.in_transaction
+        conn.set_trace_callback(None)
+
+        assert not conn.in_transaction
+        assert statements.count("BEGIN IMMEDIATE") == 1
+        assert statements.count("COMMIT") == 1
+
+    def test_rolls_back_everything_on_failure(self, conn):
+        from devflow.db import queries
+        from devflow.db.connection import unit_of_work
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work(conn):
+                queries.create_project(conn, "Doomed")
+                raise RuntimeError("boom")
+
+        assert not conn.in_transaction
+        assert all(p.name != "Doomed" for p in queries.list_projects(conn))
+
+    def test_inner_failure_rolls_back_outer_work(self, conn):
+        from devflow.db import queries
+        from devflow.db.connection import unit_of_work
+
+        p = queries.create_project(conn, "UowP2")
+        with pytest.raises(sqlite3.IntegrityError):
+            with unit_of_work(conn):
+                queries.create_task(conn, p.id, "Kept?")
+                queries.create_project(conn, "UowP2")  # duplicate name
+
+        assert queries.list_tasks(conn, p.id) == []
+
+
+def test_data_stamp_sees_own_and_other_writes(tmp_path):
+    from devflow.db import queries
+    from devflow.db.connection import data_stamp, get_connection
+
+    conn = get_connection(tmp_path / "devflow.db")
+    other = get_connection(tmp_path / "devflow.db")
+    stamp = data_stamp(conn)
+    assert data_stamp(conn) == stamp
+
+    queries.create_project(conn, "Mine")
+    assert data_stamp(conn) != stamp
+
+    stamp = data_stamp(conn)
+    queries.create_project(other, "Theirs")
+    assert data_stamp(conn) != stamp
+    conn.close()
+    other.close()
@@ -1,8 +1,10 @@
 """Tests for the timer engine: start, stop, midnight split, crash recovery."""
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from unittest.mock import patch
 
+import pytest
+
 from devflow.db import queries
 from devflow.timer import engine
 
@@ -73,12 +75,12 @@ class TestMidnightSplit:
         assert len(entries) == 2
 
         # First entry: 22:00 -> 23:59:59
-        assert entries[0].start == "2024-01-15 22:00:00"
-        assert entries[0].end == "2024-01-15 23:59:59"
+        assert entries[0].start == datetime(2024, 1, 15, 22, 0, 0)
+        assert entries[0].end == datetime(2024, 1, 15, 23, 59, 59)
 
         # Second entry: 00:00:00 -> 02:00:00
-        assert entries[1].start == "2024-01-16 00:00:00"
-        assert entries[1].end == "2024-01-16 02:00:00"
+        assert entries[1].start == datetime(2024, 1, 16, 0, 0, 0)
+        assert entries[1].end == datetime(2024, 1, 16, 2, 0, 0)
 
     def test_crosses_multiple_midnights(self, conn):
         p = queries.create_project(conn, "MSP3")
@@ -96,9 +98,7 @@ class TestMidnightSplit:
         t = queries.create_task(conn, p.id, "CMST")
         c = queries.list_categories(conn)[0]
 
-        now = datetime.now()
-        start_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        queries.set_active_session(conn, t.id, c.id, start_str)
+        queries.set_active_session(conn, t.id, c.id, datetime.now())
 
         entries = engine.check_midnight_split(conn)
         assert entries == []
@@ -112,8 +112,8 @@ class TestMidnightSplit:
 
         # Set session to yesterday
         yesterday = datetime.now() - timedelta(days=1)
-        start_str = yesterday.strftime("%Y-%m-%d") + " 23:00:00"
-        queries.set_active_session(conn, t.id, c.id, start_str)
+        start = datetime.combine(yesterday.date(), time(23, 0, 0))
+        queries.set_active_session(conn, t.id, c.id, start)
 
         entries = engine.check_midnight_split(conn)
         assert len(entries) >= 1
@@ -121,8 +121,7 @@ class TestMidnightSplit:
         # Session should still be active but with today's date
         session = queries.get_active_session(conn)
         assert session is not None
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        assert session.start_time.startswith(today_str)
+        assert session.start_time.date() == date.today()
 
     def test_check_midnight_no_session(self, conn):
         entries = engine.check_midnight_split(conn)
@@ -136,7 +135,7 @@ class TestCrashRecovery:
         c = queries.list_categories(conn)[0]
 
         # Set session to yesterday to trigger a split
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+        yesterday = datetime.now() - timedelta(days=1)
         queries.set_active_session(conn, t.id, c.id, yesterday)
 
         entries = engine.recover_crashed_session(conn)
@@ -154,7 +153,7 @@ class TestCrashRecovery:
         c = queries.list_categories(conn)[0]
 
         # Session from 2 days ago
-        two_days_ago = (datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d") + " 22:00:00"
+        two_days_ago = datetime.combine(date.today() - timedelta(days=2), time(22, 0, 0))
         queries.set_active_session(conn, t.id, c.id, two_days_ago)
 
         entries = engine.recover_crashed_session(conn)
@@ -163,5 +162,94 @@ class TestCrashRecovery:
         # Session should be active with today's midnight
         session = queries.get_active_session(conn)
         assert session is not None
-        today_midnight = datetime.now().strftime("%Y-%m-%d") + " 00:00:00"
-        assert session.start_time == today_midnight
+        assert session.start_time == datetime.combine(date.today(), time.min)
+
+
+class TestTransactions:
+    def test_stop_timer_is_atomic(self, conn):
+        p = queries.create_project(conn, "TxP")
+        t = queries.create_task(conn, p.id, "TxT")
+        c = queries.list_categories(conn)[0]
+        start = datetime.now() - timedelta(days=2)
+        queries.set_active_session(conn, t.id, c.id, start)
+
+        with patch.object(queries, "clear_active_session", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                engine.stop_timer(conn)
+
+        # No day segment was persisted and the session is still running
+        count = conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0]
+        assert count == 0
+        assert queries.get_active_session(conn) is not None
+
+    def test_start_timer_commits_once(self, conn):
+        p = queries.create_project(conn, "TxP2")
+        t = queries.create_task(conn, p.id, "TxT2")
+        c = queries.list_categories(conn)[0]
+        engine.start_timer(conn, t.id, c.id)
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        engine.start_timer(conn, t.id, c.id)
+        conn.set_trace_callback(None)
+        assert statements.count("COMMIT") == 1
+
+
+class TestRecoveryPolicy:
+    def _orphan(self, conn, started):
+        p = queries.create_project(conn, "RPP")
+        t = queries.create_task(conn, p.id, "RPT")
+        c = queries.list_categories(conn)[0]
+        queries.set_active_session(conn, t.id, c.id, started)
+
+    def test_long_session_is_split_in_one_statement(self, conn):
+        started = datetime.now().replace(hour=9, minute=0, second=0) - timedelta(days=30)
+        self._orphan(conn, started)
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        with patch.object(queries, "create_time_entry", side_effect=AssertionError("per-row")):
+            entries = engine.recover_crashed_session(
+                conn, policy=engine.RecoveryPolicy(max_hours=None)
+            )
+        conn.set_trace_callback(None)
+
+        assert len(entries) == 30
+        assert statements.count("COMMIT") == 1
+        assert queries.check_daily_rollups(conn) == []
+        assert queries.get_active_session(conn) is not None
+
+    def test_session_over_the_cap_is_stopped_at_the_cap(self, conn):
+        started = datetime.now().replace(hour=22, minute=0, second=0, microsecond=0) - timedelta(days=20)
+        self._orphan(conn, started)
+
+        entries = engine.recover_crashed_session(conn, policy=engine.RecoveryPolicy(max_hours=27))
+
+        assert queries.get_active_session(conn) is None
+        assert [e.duration_seconds for e in entries] == [7199, 86399, 3600]
+        assert entries[-1].end == started + timedelta(hours=27)
+
+    def test_session_under_the_cap_keeps_running(self, conn):
+        self._orphan(conn, datetime.now() - timedelta(days=1))
+
+        entries = engine.recover_crashed_session(conn, policy=engine.RecoveryPolicy(max_hours=48))
+
+        assert len(entries) >= 1
+        assert queries.get_active_session(conn) is not None
+
+    def test_policy_from_environment(self, monkeypatch):
+        monkeypatch.delenv(engine.RECOVERY_MAX_HOURS_ENV_VAR, raising=False)
+        assert engine.RecoveryPolicy.from_env() == engine.RecoveryPolicy()
+        monkeypatch.setenv(engine.RECOVERY_MAX_HOURS_ENV_VAR, "12.5")
+        assert engine.RecoveryPolicy.from_env().max_hours == 12.5
+        monkeypatch.setenv(engine.RECOVERY_MAX_HOURS_ENV_VAR, "none")
+        assert engine.RecoveryPolicy.from_env().max_hours is None
+        monkeypatch.setenv(engine.RECOVERY_MAX_HOURS_ENV_VAR, "lots")
+        with pytest.raises(ValueError, match="number of hours"):
+            engine.RecoveryPolicy.from_env()
+
+    @pytest.mark.parametrize("value", ["0", "-3", "nan", "inf"])
+    def test_policy_rejects_caps_that_are_not_positive(self, monkeypatch, value):
+        monkeypatch.setenv(engine.RECOVERY_MAX_HOURS_ENV_VAR, value)
+        with pytest.raises(ValueError, match="positive number of hours"):
+            engine.RecoveryPolicy.from_env()
@@ -0,0 +1,158 @@
+"""Tests for the streaming CSV/JSONL export."""
+
+import csv
+import io
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from devflow import export
+from devflow.db import queries
+from devflow.db.connection import get_connection
+
+
+@pytest.fixture
+def entries(conn):
+    """Three entries: two for Alpha/Coding on the 15th, one for Beta/Calls on the 16th."""
+    alpha = queries.create_project(conn, "Alpha")
+    beta = queries.create_project(conn, "Beta")
+    alpha_task = queries.create_task(conn, alpha.id, "Build, test")
+    beta_task = queries.create_task(conn, beta.id, "Sync")
+    code = queries.create_category(conn, "Coding")
+    meeting = queries.create_category(conn, "Calls")
+    queries.create_time_entry(
+        conn, alpha_task.id, code.id, datetime(2024, 1, 15, 14), datetime(2024, 1, 15, 15)
+    )
+    queries.create_time_entry(
+        conn, alpha_task.id, code.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10, 30)
+    )
+    queries.create_time_entry(
+        conn, beta_task.id, meeting.id, datetime(2024, 1, 16, 9), datetime(2024, 1, 16, 9, 15)
+    )
+    return conn
+
+
+def _csv(conn, **filters):
+    out = io.StringIO()
+    count = export.export_entries(conn, out, "csv", **filters)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert count == len(rows)
+    return rows
+
+
+def test_csv_has_header_and_chronological_rows(entries):
+    rows = _csv(entries)
+    assert list(rows[0]) == list(export.COLUMNS)
+    assert [r["start"] for r in rows] == [
+        "2024-01-15 09:00:00", "2024-01-15 14:00:00", "2024-01-16 09:00:00",
+    ]
+    assert rows[0] == {
+        "id": "2",
+        "start": "2024-01-15 09:00:00",
+        "end": "2024-01-15 10:30:00",
+        "duration_seconds": "5400",
+        "project": "Alpha",
+        "task": "Build, test",
+        "category": "Coding",
+    }
+
+
+def test_jsonl_is_one_object_per_line(entries):
+    out = io.StringIO()
+    assert export.export_entries(entries, out, "jsonl") == 3
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 3
+    first = json.loads(lines[0])
+    assert first["duration_seconds"] == 5400
+    assert first["task"] == "Build, test"
+    assert list(first) == list(export.COLUMNS)
+
+
+def test_filters(entries):
+    assert len(_csv(entries, start=datetime(2024, 1, 16))) == 1
+    assert len(_csv(entries, end=datetime(2024, 1, 16))) == 2
+    assert [r["project"] for r in _csv(entries, project="Beta")] == ["Beta"]
+    assert len(_csv(entries, project="Alpha", category="Coding")) == 2
+    assert _csv(entries, project="Alpha", category="Calls") == []
+
+
+def test_empty_export_still_writes_header(conn):
+    out = io.StringIO()
+    assert export.export_entries(conn, out, "csv") == 0
+    assert out.getvalue() == ",".join(export.COLUMNS) + "\n"
+
+
+def test_unknown_format_rejected(conn):
+    with pytest.raises(ValueError, match="xml"):
+        export.export_entries(conn, io.StringIO(), "xml")
+
+
+def test_times_are_local_across_dst(conn, new_york):
+    project = queries.create_project(conn, "P")
+    task = queries.create_task(conn, project.id, "T")
+    category = queries.list_categories(conn)[0]
+    # Spans the 2024-03-10 spring-forward gap: 90 minutes on the wall clock, 30 elapsed.
+    queries.create_time_entry(
+        conn, task.id, category.id, datetime(2024, 3, 10, 1, 45), datetime(2024, 3, 10, 3, 15)
+    )
+    (row,) = _csv(conn)
+    assert (row["start"], row["end"], row["duration_seconds"]) == (
+        "2024-03-10 01:45:00", "2024-03-10 03:15:00", "1800",
+    )
+
+
+@pytest.mark.parametrize(
+    "path, fmt",
+    [("out.csv", "csv"), ("out.jsonl", "jsonl"), ("out.NDJSON", "jsonl"), ("-", "csv"), ("out", "csv")],
+)
+def test_format_for_path(path, fmt):
+    assert export.format_for_path(path) == fmt
+
+
+def test_export_command_runs_without_textual(tmp_path):
+    """``devflow export`` is headless: it must not import the TUI stack."""
+    db = tmp_path / "devflow.db"
+    get_connection(db).close()
+    code = (
+        "import sys\n"
+        "from devflow.__main__ import main\n"
+        f"sys.argv = ['devflow', 'export', '--db', {str(db)!r}, '-o', {str(tmp_path / 'out.csv')!r}]\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('\\n'.join(sorted(sys.modules)))\n"
+    )
+    src = Path(__file__).resolve().parent.parent / "src"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(src), "HOME": str(tmp_path)},
+    )
+    assert "devflow.export" in result.stdout.split()
+    assert not [m for m in result.stdout.split() if m.split(".")[0] == "textual"]
+    assert "Exported 0 entries as csv" in result.stderr
+    assert (tmp_path / "out.csv").read_text() == ",".join(export.COLUMNS) + "\n"
+
+
+def test_names_are_quoted_and_escaped(conn):
+    project = queries.create_project(conn, 'Say "hi", then\nleave')
+    task = queries.create_task(conn, project.id, "Ünïcode ✓")
+    category = queries.list_categories(conn)[0]
+    queries.create_time_entry(
+        conn, task.id, category.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10)
+    )
+
+    (row,) = _csv(conn)
+    assert (row["project"], row["task"]) == ('Say "hi", then\nleave', "Ünïcode ✓")
+
+    out = io.StringIO()
+    export.export_entries(conn, out, "jsonl")
+    record = json.loads(out.getvalue())
+    assert (record["project"], record["task"]) == ('Say "hi", then\nleave', "Ünïcode ✓")
@@ -0,0 +1,249 @@
+"""Tests for the iCalendar export and the change journal behind its incremental mode."""
+
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from devflow import ics
+from devflow.db import queries
+from devflow.db.connection import get_connection
+
+
+@pytest.fixture
+def task(conn):
+    project = queries.create_project(conn, "Alpha")
+    return queries.create_task(conn, project.id, "Build")
+
+
+@pytest.fixture
+def category(conn):
+    return queries.create_category(conn, "Coding")
+
+
+def _export(conn, **kwargs):
+    out = io.StringIO(newline="")
+    count, seq = ics.export_calendar(conn, out, **kwargs)
+    text = out.getvalue()
+    assert text.count("BEGIN:VEVENT") == count
+    return text, seq
+
+
+def _events(text):
+    """Each VEVENT as a dict of its (unfolded) properties."""
+    unfolded = text.replace("\r\n ", "")
+    events = []
+    for block in unfolded.split("BEGIN:VEVENT\r\n")[1:]:
+        lines = block.split("END:VEVENT")[0].split("\r\n")
+        events.append(dict(line.split(":", 1) for line in lines if line))
+    return events
+
+
+def _utc(moment):
+    return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _entry(conn, task, category, day, hour, minutes=60):
+    start = datetime(2024, 1, day, hour)
+    return queries.create_time_entry(
+        conn, task.id, category.id, start, start + timedelta(minutes=minutes)
+    )
+
+
+def test_full_export_is_a_calendar_in_utc(conn, task, category, new_york):
+    _entry(conn, task, category, 15, 9, 90)
+
+    text, _ = _export(conn)
+    assert text.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+    assert text.endswith("END:VEVENT\r\nEND:VCALENDAR\r\n")
+    assert "\n" not in text.replace("\r\n", "")
+    (event,) = _events(text)
+    assert event["UID"] == "entry-1@devflow"
+    assert (event["DTSTART"], event["DTEND"]) == ("20240115T140000Z", "20240115T153000Z")
+    assert (event["SUMMARY"], event["CATEGORIES"]) == ("Alpha > Build", "Coding")
+    assert event["SEQUENCE"] == "1"
+    assert event["DTSTAMP"].endswith("Z")
+
+
+def test_range_bounds_the_start_day(conn, task, category):
+    for day in (14, 15, 16):
+        _entry(conn, task, category, day, 23)
+    text, _ = _export(conn, start=datetime(2024, 1, 15), end=datetime(2024, 1, 16))
+    assert [e["UID"] for e in _events(text)] == ["entry-2@devflow"]
+
+
+def test_empty_export_is_still_a_calendar(conn):
+    text, seq = _export(conn)
+    assert text.endswith("X-WR-CALNAME:DevFlow\r\nEND:VCALENDAR\r\n")
+    assert seq == 0
+
+
+def test_text_is_escaped_and_long_lines_folded(conn, category):
+    project = queries.create_project(conn, "R&D; phase 2, again")
+    task = queries.create_task(conn, project.id, "Ünïcode ✓ " * 12)
+    _entry(conn, task, category, 15, 9)
+
+    text, _ = _export(conn)
+    lines = text.split("\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    (event,) = _events(text)
+    assert event["SUMMARY"] == "R&D\\; phase 2\\, again > " + "Ünïcode ✓ " * 12
+
+
+def test_incremental_export_sends_only_changes(conn, task, category):
+    first = _entry(conn, task, category, 15, 9)
+    edited = _entry(conn, task, category, 15, 11)
+    deleted = _entry(conn, task, category, 15, 13)
+    _, seq = _export(conn)
+
+    text, next_seq = _export(conn, after_seq=seq)
+    assert (_events(text), next_seq) == ([], seq)
+
+    queries.update_time_entry(conn, edited.id, end=datetime(2024, 1, 15, 12, 30))
+    queries.delete_time_entry(conn, deleted.id)
+    added = _entry(conn, task, category, 16, 9)
+
+    text, next_seq = _export(conn, after_seq=seq)
+    events = _events(text)
+    assert [e["UID"] for e in events] == [
+        f"entry-{edited.id}@devflow", f"entry-{deleted.id}@devflow", f"entry-{added.id}@devflow",
+    ]
+    assert events[0]["DTEND"] == _utc(datetime(2024, 1, 15, 12, 30))
+    assert int(events[0]["SEQUENCE"]) > seq
+    cancelled = events[1]
+    assert cancelled["STATUS"] == "CANCELLED"
+    assert cancelled["DTSTART"] == _utc(datetime(2024, 1, 15, 13))
+    assert "SUMMARY" not in cancelled
+    assert next_seq == queries.time_entry_change_seq(conn) > seq
+    assert f"entry-{first.id}@" not in text
+
+
+def test_renames_resend_the_entries_that_show_the_name(conn, task, category):
+    other_task = queries.create_task(conn, task.project_id, "Review")
+    _entry(conn, task, category, 15, 9)
+    _entry(conn, other_task, category, 15, 10)
+    _, seq = _export(conn)
+
+    queries.update_task(conn, task.id, "Build it")
+    text, seq = _export(conn, after_seq=seq)
+    assert [e["SUMMARY"] for e in _events(text)] == ["Alpha > Build it"]
+
+    queries.update_project(conn, task.project_id, "Beta")
+    text, seq = _export(conn, after_seq=seq)
+    assert sorted(e["SUMMARY"] for e in _events(text)) == ["Beta > Build it", "Beta > Review"]
+
+    queries.update_category(conn, category.id, "Programming")
+    text, seq = _export(conn, after_seq=seq)
+    assert len(_events(text)) == 2
+
+    queries.archive_task(conn, task.id)
+    text, _ = _export(conn, after_seq=seq)
+    assert _events(text) == []
+
+
+def test_incremental_export_rejects_a_range(conn):
+    with pytest.raises(ValueError):
+        _export(conn, start=datetime(2024, 1, 1), after_seq=0)
+
+
+def test_bulk_insert_is_journaled(conn, task, category):
+    _, seq = _export(conn)
+    start = int(datetime(2024, 1, 1).timestamp())
+    rows = [
+        (task.id, category.id, start + i * 3600, start + i * 3600 + 1800, 20240101)
+        for i in range(300)
+    ]
+    assert queries.create_time_entries(conn, rows) == 300
+
+    text, next_seq = _export(conn, after_seq=seq)
+    assert len(_events(text)) == 300
+    assert next_seq == seq + 1
+
+
+def test_changes_after_the_watermark_wait_for_the_next_export(conn, task, category):
+    _entry(conn, task, category, 15, 9)
+    seq = queries.time_entry_change_seq(conn)
+    _entry(conn, task, category, 15, 10)
+    rows = list(queries.iter_time_entries_for_calendar(conn, after_seq=0, up_to_seq=seq))
+    assert [row[0] for row in rows] == [1]
+
+
+def test_watermark_and_rows_come_from_one_snapshot(tmp_path, monkeypatch):
+    conn = get_connection(tmp_path / "devflow.db")
+    other = get_connection(tmp_path / "devflow.db")
+    project = queries.create_project(conn, "Alpha")
+    task = queries.create_task(conn, project.id, "Build")
+    category = queries.create_category(conn, "Coding")
+    _entry(conn, task, category, 15, 9)
+    change_seq = queries.time_entry_change_seq
+
+    def write_in_between(c):
+        seq = change_seq(c)
+        late = _entry(other, task, category, 15, 11)
+        write_in_between.late_id = late.id
+        return seq
+
+    monkeypatch.setattr(queries, "time_entry_change_seq", write_in_between)
+    text, seq = _export(conn)
+    monkeypatch.undo()
+
+    # The entry committed mid-export is left for the next export, not split across both.
+    assert [e["UID"] for e in _events(text)] == ["entry-1@devflow"]
+    text, _ = _export(conn, after_seq=seq)
+    assert [e["UID"] for e in _events(text)] == [f"entry-{write_in_between.late_id}@devflow"]
+    assert not conn.in_transaction
+    other.close()
+    conn.close()
+
+
+def _journaled(conn, entry_id):
+    return conn.execute(
+        "SELECT 1 FROM time_entry_changes WHERE entry_id = ?", (entry_id,)
+    ).fetchone() is not None
+
+
+def test_deleted_entries_leave_the_journal_once_every_export_has_them(conn, task, category):
+    gone = _entry(conn, task, category, 15, 9)
+    _entry(conn, task, category, 15, 10)
+    queries.set_export_watermark(conn, "phone", queries.time_entry_change_seq(conn))
+    queries.set_export_watermark(conn, "laptop", queries.time_entry_change_seq(conn))
+    queries.delete_time_entry(conn, gone.id)
+    _entry(conn, task, category, 15, 11)
+
+    queries.set_export_watermark(conn, "phone", queries.time_entry_change_seq(conn))
+    assert _journaled(conn, gone.id)  # the laptop has not been told yet
+
+    text, seq = _export(conn, after_seq=queries.get_export_watermark(conn, "laptop"))
+    assert f"entry-{gone.id}@" in text
+    queries.set_export_watermark(conn, "laptop", seq)
+    assert not _journaled(conn, gone.id)
+
+
+def test_pruning_catches_up_when_watermarks_arrive_out_of_order(conn, task, category):
+    _entry(conn, task, category, 15, 9)
+    stale = queries.time_entry_change_seq(conn)
+    gone = _entry(conn, task, category, 15, 10)
+    queries.delete_time_entry(conn, gone.id)
+    queries.set_export_watermark(conn, "phone", queries.time_entry_change_seq(conn))
+    # The laptop's export began before the deletion but finished after the phone's.
+    queries.set_export_watermark(conn, "laptop", stale)
+    assert _journaled(conn, gone.id)
+
+    _entry(conn, task, category, 16, 9)
+    queries.set_export_watermark(conn, "laptop", queries.time_entry_change_seq(conn))
+    assert not _journaled(conn, gone.id)
+
+
+def test_the_latest_change_survives_pruning(conn, task, category):
+    _entry(conn, task, category, 15, 9)
+    last = _entry(conn, task, category, 15, 10)
+    queries.delete_time_entry(conn, last.id)
+    seq = queries.time_entry_change_seq(conn)
+    queries.set_export_watermark(conn, "nightly", seq)
+    assert _journaled(conn, last.id)
+
+    added = _entry(conn, task, category, 16, 9)
+    text, _ = _export(conn, after_seq=seq)
+    assert [e["UID"] for e in _events(text)] == [f"entry-{added.id}@devflow"]
+    queries.set_export_watermark(conn, "nightly", queries.time_entry_change_seq(conn))
+    assert not _journaled(conn, last.id)
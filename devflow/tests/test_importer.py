@@ -0,0 +1,135 @@
+"""Tests for the bulk, idempotent CSV/JSONL import."""
+
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from devflow import export, importer
+from devflow.db import queries
+from devflow.db.connection import get_memory_connection
+
+HEADER = "start,end,project,task,category\n"
+
+
+def _import(conn, text, fmt="csv", **kwargs):
+    return importer.import_entries(conn, io.StringIO(text), fmt, **kwargs)
+
+
+def _entries(conn):
+    """(start, end, project, task, category) of every entry, as exported."""
+    return [row[1:3] + row[4:] for row in queries.iter_time_entries_for_export(conn)]
+
+
+def test_export_round_trips(conn):
+    project = queries.create_project(conn, "Alpha")
+    task = queries.create_task(conn, project.id, "Build, test")
+    category = queries.list_categories(conn)[0]
+    queries.create_time_entry(
+        conn, task.id, category.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10, 30)
+    )
+    queries.create_time_entry(
+        conn, task.id, category.id, datetime(2024, 1, 16, 14), datetime(2024, 1, 16, 15)
+    )
+    for fmt in export.FORMATS:
+        out = io.StringIO()
+        export.export_entries(conn, out, fmt)
+        fresh = get_memory_connection()
+        report = _import(fresh, out.getvalue(), fmt)
+        assert (report.read, report.inserted, report.rejected) == (2, 2, 0)
+        assert _entries(fresh) == _entries(conn)
+        fresh.close()
+
+
+def test_reimport_inserts_nothing(conn):
+    text = HEADER + (
+        "2024-01-15 09:00:00,2024-01-15 10:00:00,Alpha,Build,Code\n"
+        "2024-01-15 11:00:00,2024-01-15 12:00:00,Alpha,Build,Code\n"
+    )
+    assert _import(conn, text).inserted == 2
+    report = _import(conn, text)
+    assert (report.read, report.inserted, report.duplicates) == (2, 0, 2)
+    assert len(_entries(conn)) == 2
+    assert queries.check_daily_rollups(conn) == []
+
+
+def test_duplicates_within_one_file_are_inserted_once(conn):
+    row = "2024-01-15 09:00:00,2024-01-15 10:00:00,Alpha,Build,Code\n"
+    report = _import(conn, HEADER + row * 3)
+    assert (report.inserted, report.duplicates) == (1, 2)
+
+
+def test_missing_names_are_created_and_existing_ones_reused(conn):
+    existing = queries.create_project(conn, "Platform Ops")
+    archived = queries.create_task(conn, existing.id, "Old task")
+    queries.archive_task(conn, archived.id)
+    text = HEADER + (
+        "2024-01-15 09:00:00,2024-01-15 10:00:00,Platform Ops,Old task,Code\n"
+        "2024-01-15 10:00:00,2024-01-15 11:00:00,New project,New task,New category\n"
+        "2024-01-15 11:00:00,2024-01-15 12:00:00,New project,New task,New category\n"
+    )
+    assert _import(conn, text).inserted == 3
+    assert queries.get_time_entry(conn, 1).task_id == archived.id
+    (project,) = [p for p in queries.list_projects(conn) if p.name == "New project"]
+    assert [t.name for t in queries.list_tasks(conn, project.id)] == ["New task"]
+    assert "New category" in [c.name for c in queries.list_categories(conn)]
+
+
+def test_bad_records_are_rejected_with_line_numbers(conn):
+    text = HEADER + (
+        "2024-01-15 09:00:00,2024-01-15 10:00:00,Alpha,Build,Code\n"
+        "yesterday,2024-01-15 10:00:00,Alpha,Build,Code\n"
+        "2024-01-15 10:00:00,2024-01-15 09:00:00,Alpha,Build,Code\n"
+        "2024-01-15 11:00:00,2024-01-15 12:00:00,Alpha,,Code\n"
+    )
+    report = _import(conn, text)
+    assert (report.read, report.inserted, report.rejected) == (4, 1, 3)
+    assert report.errors == [
+        "line 3: start is not an ISO 8601 time: 'yesterday'",
+        "line 4: end is before start",
+        "line 5: missing task",
+    ]
+    assert "3 rejected" in report.summary()
+
+
+def test_jsonl_bad_lines(conn):
+    good = {
+        "start": "2024-01-15T09:00:00", "end": "2024-01-15T10:00:00",
+        "project": "Alpha", "task": "Build", "category": "Code",
+    }
+    text = "\n".join([json.dumps(good), "{oops", "[1, 2]", "", json.dumps({"start": 1})]) + "\n"
+    report = _import(conn, text, "jsonl")
+    assert (report.read, report.inserted, report.rejected) == (4, 1, 3)
+    assert [error.split(":")[0] for error in report.errors] == ["line 2", "line 3", "line 5"]
+
+
+def test_offsets_are_converted_to_local_time(conn, new_york):
+    text = HEADER + "2024-01-15T14:00:00+00:00,2024-01-15T15:00:00Z,Alpha,Build,Code\n"
+    assert _import(conn, text).inserted == 1
+    entry = queries.get_time_entry(conn, 1)
+    assert (entry.start, entry.end) == (datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+
+
+def test_csv_without_required_columns(conn):
+    with pytest.raises(ValueError, match="missing task, category"):
+        _import(conn, "start,end,project\n")
+
+
+def test_chunks_commit_separately(conn):
+    rows = "".join(
+        f"2024-01-{day:02d} 09:00:00,2024-01-{day:02d} 10:00:00,Alpha,Build,Code\n"
+        for day in range(1, 11)
+    )
+    report = _import(conn, HEADER + rows, chunk_size=3)
+    assert report.inserted == 10
+    assert queries.check_daily_rollups(conn) == []
+
+
+def test_content_hash_distinguishes_every_field():
+    base = (1_700_000_000, 1_700_003_600, "Alpha", "Build", "Code")
+    hashes = {importer.content_hash(*base)}
+    for i, value in enumerate((1, 2, "Beta", "Ship", "Meeting")):
+        hashes.add(importer.content_hash(*base[:i], value, *base[i + 1:]))
+    assert len(hashes) == 6
+    assert all(-(2**63) <= h < 2**63 for h in hashes)
@@ -1,6 +1,19 @@
 """Tests for data model dataclasses."""
 
-from devflow.db.models import ActiveSession, Category, Project, Task, TimeEntry
+from datetime import datetime
+
+import pytest
+
+from devflow.db.models import (
+    ActiveSession,
+    ActiveSessionDetail,
+    Category,
+    Project,
+    Task,
+    TimeEntry,
+    TimeEntryColumns,
+    TimeEntryDetail,
+)
 
 
 def test_project_defaults():
@@ -21,17 +34,34 @@ def test_category_defaults():
 def test_time_entry_fields():
     e = TimeEntry(
         id=1, task_id=1, category_id=1,
-        start="2024-01-01 09:00:00", end="2024-01-01 10:00:00",
+        start=datetime(2024, 1, 1, 9), end=datetime(2024, 1, 1, 10),
         duration_seconds=3600,
     )
     assert e.duration_seconds == 3600
 
 
 def test_active_session_fields():
-    s = ActiveSession(id=1, task_id=1, category_id=1, start_time="2024-01-01 09:00:00")
-    assert s.start_time == "2024-01-01 09:00:00"
+    s = ActiveSession(id=1, task_id=1, category_id=1, start_time=datetime(2024, 1, 1, 9))
+    assert s.start_time == datetime(2024, 1, 1, 9)
 
 
 def test_project_with_archived():
     p = Project(id=1, name="Test", archived_at="2024-01-01 12:00:00")
     assert p.archived_at == "2024-01-01 12:00:00"
+
+
+@pytest.mark.parametrize(
+    "model",
+    [Category, Project, Task, TimeEntry, ActiveSession, ActiveSessionDetail, TimeEntryDetail],
+)
+def test_models_are_slotted(model):
+    assert "__slots__" in vars(model)
+    assert not hasattr(model.__new__(model), "__dict__")
+
+
+def test_time_entry_columns_start_empty_and_unshared():
+    a, b = TimeEntryColumns(), TimeEntryColumns()
+    a.id.append(1)
+    assert len(a) == 1
+    assert len(b) == 0
+    assert a.start_ts.typecode == "q"
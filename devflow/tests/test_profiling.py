@@ -0,0 +1,148 @@
+"""Tests for the --profile section profiler."""
+
+import asyncio
+import threading
+import time
+
+from devflow.profiling import Profiler, instrument_app
+
+
+def _busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sections_nest_exclusively():
+    profiler = Profiler()
+
+    with profiler.section("outer"):
+        _busy(1)
+        with profiler.section("inner"):
+            _busy(1)
+
+    assert profiler.sections["outer"].calls == 1
+    # Wall time is inclusive, cProfile attribution is exclusive.
+    assert profiler.sections["outer"].total_ms >= profiler.sections["inner"].total_ms
+    # Each profile saw exactly one _busy call: the inner one is not double-counted.
+    for section in ("outer", "inner"):
+        stats = profiler.stats(section).stats
+        assert [s[1] for key, s in stats.items() if key[2] == "_busy"] == [1]
+
+
+def test_wrap_counts_calls_and_unwraps():
+    class Screen:
+        def _refresh(self, arg):
+            return arg * 2
+
+    original = Screen._refresh
+    profiler = Profiler()
+    profiler.wrap(Screen, "_refresh", "screen._refresh")
+
+    assert Screen()._refresh(2) == 4
+    assert Screen()._refresh(3) == 6
+    assert profiler.sections["screen._refresh"].calls == 2
+
+    profiler.unwrap_all()
+    assert Screen._refresh is original
+
+
+def test_instrument_app_covers_every_screen_refresh():
+    from devflow.app import DevFlowApp
+    from devflow.screens.daily import DailyReportScreen
+
+    profiler = Profiler()
+    instrument_app(profiler)
+    try:
+        wrapped = {f"{getattr(owner, '__name__', owner)}.{attr}" for owner, attr, _ in profiler._wrapped}
+        assert DailyReportScreen._refresh.__wrapped__ is not None
+        assert DevFlowApp.on_mount.__wrapped__ is not None
+    finally:
+        profiler.unwrap_all()
+
+    assert {
+        "DevFlowApp.on_mount",
+        "devflow.app.recover_crashed_session",
+        "DailyReportScreen._refresh",
+        "WeeklyReportScreen._refresh",
+        "ProjectsScreen._refresh_table",
+        "CategoriesScreen._refresh_table",
+        "TasksScreen._refresh_table",
+        "TimerScreen.on_mount",
+        "DatabaseWorker._call",
+        "devflow.screens.daily._fetch_day",
+        "devflow.screens.weekly._fetch_week",
+        "devflow.screens.timer._fetch_selectors",
+    } <= wrapped
+    assert not hasattr(DailyReportScreen._refresh, "__wrapped__")
+
+
+def test_sections_on_other_threads_are_profiled_and_sampled():
+    profiler = Profiler(sample_interval=0.001)
+    profiler.start_sampling()
+
+    def job():
+        with profiler.section("job"):
+            _busy(30)
+
+    with profiler.section("main"):
+        worker = threading.Thread(target=job, name="devflow-db_0")
+        worker.start()
+        _busy(10)
+        worker.join()
+    profiler.stop_sampling()
+
+    assert profiler.sections["job"].calls == 1
+    assert profiler.sections["job"].total_ms >= 30
+    # The worker's section did not leak onto the main thread's stack.
+    assert not any(
+        stack.startswith("job;") and not stack.startswith("job;thread:")
+        for stack in profiler.samples
+    )
+    assert any(
+        stack.startswith("job;thread:devflow-db_0;") and "_busy" in stack
+        for stack in profiler.samples
+    )
+
+
+def test_profiled_refresh_includes_the_worker_query(tmp_path, monkeypatch):
+    from devflow.app import DevFlowApp
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    profiler = Profiler()
+    instrument_app(profiler)
+    try:
+        app = DevFlowApp(db_path=tmp_path / "devflow.db")
+
+        async def main():
+            async with app.run_test(size=(120, 40)) as pilot:
+                await pilot.pause()
+                app._navigate_to("daily")
+                await pilot.pause()
+                await app.workers.wait_for_complete()
+
+        asyncio.run(main())
+    finally:
+        profiler.unwrap_all()
+
+    assert profiler.sections["daily._fetch_day"].calls >= 1
+    functions = {func for _, _, func in profiler.stats("daily._fetch_day").stats}
+    assert "_fetch_day" in functions
+    assert "list_time_entry_details_for_date" in functions
+
+
+def test_write_outputs(tmp_path):
+    profiler = Profiler(sample_interval=0.001)
+    profiler.start_sampling()
+    with profiler.section("work"):
+        _busy(30)
+    profiler.stop_sampling()
+
+    out = profiler.write(tmp_path / "profile")
+
+    assert (out / "work.pstats").exists()
+    summary = (out / "summary.txt").read_text()
+    assert summary.splitlines()[1].split()[:2] == ["work", "1"]
+    collapsed = (out / "profile.collapsed").read_text().splitlines()
+    assert any(line.startswith("work;") and "_busy" in line for line in collapsed)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
@@ -1,5 +1,8 @@
 """Tests for the data access layer (queries.py)."""
 
+import sqlite3
+from datetime import date, datetime, timedelta
+
 import pytest
 
 from devflow.db import queries
@@ -58,7 +61,7 @@ class TestProjectsCRUD:
         p = queries.create_project(conn, "SessionProject")
         task = queries.create_task(conn, p.id, "SessionTask")
         cat = queries.list_categories(conn)[0]
-        queries.set_active_session(conn, task.id, cat.id, "2024-01-01 09:00:00")
+        queries.set_active_session(conn, task.id, cat.id, datetime(2024, 1, 1, 9))
 
         queries.archive_project(conn, p.id)
         assert queries.get_active_session(conn) is None
@@ -123,7 +126,7 @@ class TestTasksCRUD:
         p = queries.create_project(conn, "P4")
         t = queries.create_task(conn, p.id, "T")
         cat = queries.list_categories(conn)[0]
-        queries.set_active_session(conn, t.id, cat.id, "2024-01-01 09:00:00")
+        queries.set_active_session(conn, t.id, cat.id, datetime(2024, 1, 1, 9))
 
         queries.archive_task(conn, t.id)
         assert queries.get_active_session(conn) is None
@@ -182,7 +185,7 @@ class TestCategoriesCRUD:
         p = queries.create_project(conn, "CatP")
         t = queries.create_task(conn, p.id, "CatT")
         c = queries.create_category(conn, "CatToArchive")
-        queries.set_active_session(conn, t.id, c.id, "2024-01-01 09:00:00")
+        queries.set_active_session(conn, t.id, c.id, datetime(2024, 1, 1, 9))
 
         queries.archive_category(conn, c.id)
         assert queries.get_active_session(conn) is None
@@ -209,53 +212,207 @@ class TestTimeEntries:
 
     def test_create_and_get_entry(self, conn):
         tid, cid = self._setup_entry(conn)
-        e = queries.create_time_entry(conn, tid, cid, "2024-01-15 09:00:00", "2024-01-15 10:00:00", 3600)
+        e = queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
         fetched = queries.get_time_entry(conn, e.id)
         assert fetched is not None
         assert fetched.duration_seconds == 3600
 
+    def test_times_are_stored_as_epoch_seconds(self, conn):
+        tid, cid = self._setup_entry(conn)
+        start, end = datetime(2024, 1, 15, 23, 30), datetime(2024, 1, 16, 0, 15)
+        e = queries.create_time_entry(conn, tid, cid, start, end)
+        row = conn.execute(
+            "SELECT start_ts, end_ts, day FROM time_entries WHERE id = ?", (e.id,)
+        ).fetchone()
+        assert tuple(row) == (int(start.timestamp()), int(end.timestamp()), 20240115)
+        assert (e.start, e.end, e.duration_seconds) == (start, end, 2700)
+
+    def test_durations_are_elapsed_time_across_dst(self, conn, new_york):
+        tid, cid = self._setup_entry(conn)
+        # Clocks jump from 02:00 to 03:00: one real hour passes.
+        e = queries.create_time_entry(conn, tid, cid, datetime(2024, 3, 10, 1), datetime(2024, 3, 10, 3))
+        assert e.duration_seconds == 3600
+        # The 23-hour day still holds an entry started at 23:30.
+        late = queries.create_time_entry(
+            conn, tid, cid, datetime(2024, 3, 10, 23, 30), datetime(2024, 3, 10, 23, 45)
+        )
+        day = queries.list_time_entries_for_date(conn, date(2024, 3, 10))
+        assert [entry.id for entry in day] == [e.id, late.id]
+        assert dict(queries.weekly_totals_by_day(conn, date(2024, 3, 10), date(2024, 3, 11))) == {
+            date(2024, 3, 10): 3600 + 900
+        }
+
+    def test_sub_seconds_are_dropped(self, conn):
+        tid, cid = self._setup_entry(conn)
+        start = datetime(2024, 1, 15, 9, 0, 0, 750_000)
+        e = queries.create_time_entry(conn, tid, cid, start, start + timedelta(minutes=1))
+        assert queries.get_time_entry(conn, e.id) == e
+        assert e.start == datetime(2024, 1, 15, 9)
+
     def test_get_entry_not_found(self, conn):
         assert queries.get_time_entry(conn, 99999) is None
 
     def test_list_entries_for_date(self, conn):
         tid, cid = self._setup_entry(conn)
-        queries.create_time_entry(conn, tid, cid, "2024-01-15 09:00:00", "2024-01-15 10:00:00", 3600)
-        queries.create_time_entry(conn, tid, cid, "2024-01-15 14:00:00", "2024-01-15 15:00:00", 3600)
-        queries.create_time_entry(conn, tid, cid, "2024-01-16 09:00:00", "2024-01-16 10:00:00", 3600)
+        queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 15, 14), datetime(2024, 1, 15, 15))
+        queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 16, 9), datetime(2024, 1, 16, 10))
 
-        entries = queries.list_time_entries_for_date(conn, "2024-01-15")
+        entries = queries.list_time_entries_for_date(conn, date(2024, 1, 15))
         assert len(entries) == 2
 
     def test_list_entries_for_range(self, conn):
         tid, cid = self._setup_entry(conn)
-        queries.create_time_entry(conn, tid, cid, "2024-01-15 09:00:00", "2024-01-15 10:00:00", 3600)
-        queries.create_time_entry(conn, tid, cid, "2024-01-17 09:00:00", "2024-01-17 10:00:00", 3600)
+        queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 17, 9), datetime(2024, 1, 17, 10))
 
-        entries = queries.list_time_entries_for_range(conn, "2024-01-15 00:00:00", "2024-01-16 00:00:00")
+        entries = queries.list_time_entries_for_range(conn, datetime(2024, 1, 15), datetime(2024, 1, 16))
         assert len(entries) == 1
 
+    def test_entry_columns_match_entries(self, conn, monkeypatch):
+        monkeypatch.setattr(queries, "_COLUMN_CHUNK", 2)  # several fetchmany rounds
+        tid, cid = self._setup_entry(conn)
+        for hour in (9, 11, 13, 15, 17):
+            queries.create_time_entry(
+                conn, tid, cid, datetime(2024, 1, 15, hour), datetime(2024, 1, 15, hour, 45)
+            )
+        start, end = datetime(2024, 1, 15), datetime(2024, 1, 16)
+
+        entries = queries.list_time_entries_for_range(conn, start, end)
+        columns = queries.list_time_entry_columns_for_range(conn, start, end)
+
+        assert len(columns) == 5
+        assert list(columns.id) == [e.id for e in entries]
+        assert list(columns.task_id) == [tid] * 5
+        assert list(columns.category_id) == [cid] * 5
+        assert list(columns.start_ts) == [int(e.start.timestamp()) for e in entries]
+        assert [b - a for a, b in zip(columns.start_ts, columns.end_ts)] == [2700] * 5
+
+    def test_entry_columns_empty_range(self, conn):
+        columns = queries.list_time_entry_columns_for_range(
+            conn, datetime(2024, 1, 15), datetime(2024, 1, 16)
+        )
+        assert len(columns) == 0
+
     def test_update_entry(self, conn):
         tid, cid = self._setup_entry(conn)
-        e = queries.create_time_entry(conn, tid, cid, "2024-01-15 09:00:00", "2024-01-15 10:00:00", 3600)
-        queries.update_time_entry(conn, e.id, start="2024-01-15 08:00:00", end="2024-01-15 10:00:00")
+        e = queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        queries.update_time_entry(conn, e.id, start=datetime(2024, 1, 15, 8), end=datetime(2024, 1, 15, 10))
         fetched = queries.get_time_entry(conn, e.id)
         assert fetched.duration_seconds == 7200
 
     def test_update_entry_not_found(self, conn):
         # Should not raise
-        queries.update_time_entry(conn, 99999, start="2024-01-01 00:00:00")
+        queries.update_time_entry(conn, 99999, start=datetime(2024, 1, 1))
 
     def test_delete_entry(self, conn):
         tid, cid = self._setup_entry(conn)
-        e = queries.create_time_entry(conn, tid, cid, "2024-01-15 09:00:00", "2024-01-15 10:00:00", 3600)
+        e = queries.create_time_entry(conn, tid, cid, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
         queries.delete_time_entry(conn, e.id)
         assert queries.get_time_entry(conn, e.id) is None
 
+    def test_list_entry_details_for_date(self, conn):
+        p = queries.create_project(conn, "DetailP")
+        t = queries.create_task(conn, p.id, "DetailT")
+        c = queries.create_category(conn, "DetailC")
+        queries.create_time_entry(conn, t.id, c.id, datetime(2024, 1, 15, 14), datetime(2024, 1, 15, 15))
+        queries.create_time_entry(conn, t.id, c.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        queries.create_time_entry(conn, t.id, c.id, datetime(2024, 1, 16, 9), datetime(2024, 1, 16, 10))
+
+        details = queries.list_time_entry_details_for_date(conn, date(2024, 1, 15))
+        assert [d.start for d in details] == [datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 14)]
+        assert details[0].project_name == "DetailP"
+        assert details[0].task_name == "DetailT"
+        assert details[0].category_name == "DetailC"
+
+    def test_list_entry_details_keeps_unresolved_entries(self, conn):
+        tid, cid = self._setup_entry(conn)
+        queries.create_time_entry(
+            conn, tid, cid, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10)
+        )
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute(
+            "INSERT INTO time_entries (task_id, category_id, start_ts, end_ts, day) "
+            "VALUES (9999, 9999, ?, ?, 20240115)",
+            (int(datetime(2024, 1, 15, 11).timestamp()), int(datetime(2024, 1, 15, 12).timestamp())),
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        details = queries.list_time_entry_details_for_date(conn, date(2024, 1, 15))
+        assert len(details) == 2
+        orphan = details[1]
+        assert (orphan.project_name, orphan.task_name, orphan.category_name) == ("?", "?", "?")
+        assert orphan.duration_seconds == 3600
+
+    def test_list_entry_details_is_one_query(self, conn):
+        tid, cid = self._setup_entry(conn)
+        for hour in range(9, 17):
+            queries.create_time_entry(
+                conn, tid, cid, datetime(2024, 1, 15, hour), datetime(2024, 1, 15, hour, 30)
+            )
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        details = queries.list_time_entry_details_for_date(conn, date(2024, 1, 15))
+        conn.set_trace_callback(None)
+        assert len(details) == 8
+        assert len(statements) == 1
+
     def test_entries_for_empty_date(self, conn):
-        entries = queries.list_time_entries_for_date(conn, "2099-01-01")
+        entries = queries.list_time_entries_for_date(conn, date(2099, 1, 1))
         assert entries == []
 
 
+class TestBulkTimeEntries:
+    def _rows(self, conn, count):
+        p = queries.create_project(conn, "BulkP")
+        t = queries.create_task(conn, p.id, "BulkT")
+        c = queries.list_categories(conn)[0]
+        return [
+            queries.new_time_entry(
+                t.id, c.id, datetime(2024, 1, 1 + i % 28, 9), datetime(2024, 1, 1 + i % 28, 10)
+            )
+            for i in range(count)
+        ]
+
+    def test_returns_count(self, conn):
+        rows = self._rows(conn, 25)
+        assert queries.create_time_entries(conn, iter(rows), chunk_size=7) == 25
+        assert conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0] == 25
+
+    def test_return_entries_match_rows(self, conn):
+        rows = self._rows(conn, 10)
+        created = queries.create_time_entries(conn, rows, chunk_size=4, return_entries=True)
+        assert len(created) == 10
+        for entry in created:
+            assert queries.get_time_entry(conn, entry.id) == entry
+
+    def test_keeps_rollups_exact_and_resets_the_switch(self, conn):
+        # Two chunks large enough to switch the triggers off, one small one that keeps them
+        (schema_version,) = conn.execute("PRAGMA schema_version").fetchone()
+        rows = self._rows(conn, 600)
+        queries.create_time_entries(conn, rows, chunk_size=256)
+        assert queries.check_daily_rollups(conn) == []
+        # No DDL, so other connections keep their prepared statements.
+        assert conn.execute("PRAGMA schema_version").fetchone()[0] == schema_version
+        assert conn.execute("SELECT active FROM bulk_insert").fetchone()[0] == 0
+
+        # Single-row inserts still go through the trigger
+        t_id, c_id = rows[0][0], rows[0][1]
+        queries.create_time_entry(conn, t_id, c_id, datetime(2024, 3, 1, 9), datetime(2024, 3, 1, 10))
+        assert queries.check_daily_rollups(conn) == []
+
+    def test_failed_chunk_rolls_back(self, conn):
+        rows = self._rows(conn, 300) + [
+            queries.new_time_entry(99999, 1, datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10))
+        ]
+        with pytest.raises(sqlite3.IntegrityError):
+            queries.create_time_entries(conn, rows)
+
+        assert conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0] == 0
+        assert conn.execute("SELECT active FROM bulk_insert").fetchone()[0] == 0
+
+
 # ---------------------------------------------------------------------------
 # Reporting
 # ---------------------------------------------------------------------------
@@ -269,13 +426,13 @@ class TestReporting:
         cats = queries.list_categories(conn)
         c1, c2 = cats[0], cats[1]
 
-        queries.create_time_entry(conn, t1.id, c1.id, "2024-01-15 09:00:00", "2024-01-15 11:00:00", 7200)
-        queries.create_time_entry(conn, t2.id, c2.id, "2024-01-15 13:00:00", "2024-01-15 14:00:00", 3600)
-        queries.create_time_entry(conn, t1.id, c1.id, "2024-01-16 09:00:00", "2024-01-16 10:00:00", 3600)
+        queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 11))
+        queries.create_time_entry(conn, t2.id, c2.id, datetime(2024, 1, 15, 13), datetime(2024, 1, 15, 14))
+        queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 16, 9), datetime(2024, 1, 16, 10))
 
     def test_daily_totals_by_project(self, conn):
         self._seed_entries(conn)
-        totals = queries.daily_totals_by_project(conn, "2024-01-15")
+        totals = queries.daily_totals_by_project(conn, date(2024, 1, 15))
         assert len(totals) == 2
         total_map = dict(totals)
         assert total_map["ReportP1"] == 7200
@@ -283,28 +440,28 @@ class TestReporting:
 
     def test_daily_totals_by_category(self, conn):
         self._seed_entries(conn)
-        totals = queries.daily_totals_by_category(conn, "2024-01-15")
+        totals = queries.daily_totals_by_category(conn, date(2024, 1, 15))
         assert len(totals) == 2
 
     def test_weekly_totals_by_day(self, conn):
         self._seed_entries(conn)
-        totals = queries.weekly_totals_by_day(conn, "2024-01-15 00:00:00", "2024-01-22 00:00:00")
+        totals = queries.weekly_totals_by_day(conn, date(2024, 1, 15), date(2024, 1, 22))
         day_map = dict(totals)
-        assert day_map["2024-01-15"] == 10800
-        assert day_map["2024-01-16"] == 3600
+        assert day_map[date(2024, 1, 15)] == 10800
+        assert day_map[date(2024, 1, 16)] == 3600
 
     def test_weekly_totals_by_project(self, conn):
         self._seed_entries(conn)
-        totals = queries.weekly_totals_by_project(conn, "2024-01-15 00:00:00", "2024-01-22 00:00:00")
+        totals = queries.weekly_totals_by_project(conn, date(2024, 1, 15), date(2024, 1, 22))
         assert len(totals) == 2
 
     def test_weekly_totals_by_category(self, conn):
         self._seed_entries(conn)
-        totals = queries.weekly_totals_by_category(conn, "2024-01-15 00:00:00", "2024-01-22 00:00:00")
+        totals = queries.weekly_totals_by_category(conn, date(2024, 1, 15), date(2024, 1, 22))
         assert len(totals) == 2
 
     def test_daily_totals_empty(self, conn):
-        totals = queries.daily_totals_by_project(conn, "2099-01-01")
+        totals = queries.daily_totals_by_project(conn, date(2099, 1, 1))
         assert totals == []
 
     def test_reports_include_archived_entities(self, conn):
@@ -312,16 +469,86 @@ class TestReporting:
         p = queries.create_project(conn, "ArchiveReportP")
         t = queries.create_task(conn, p.id, "ART")
         c = queries.create_category(conn, "ArchiveReportC")
-        queries.create_time_entry(conn, t.id, c.id, "2024-01-15 09:00:00", "2024-01-15 10:00:00", 3600)
+        queries.create_time_entry(conn, t.id, c.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
 
         queries.archive_project(conn, p.id)
         queries.archive_category(conn, c.id)
 
-        totals = queries.daily_totals_by_project(conn, "2024-01-15")
+        totals = queries.daily_totals_by_project(conn, date(2024, 1, 15))
         total_map = dict(totals)
         assert "ArchiveReportP" in total_map
 
 
+class TestDailyRollups:
+    def _setup(self, conn):
+        p1 = queries.create_project(conn, "RollupP1")
+        p2 = queries.create_project(conn, "RollupP2")
+        t1 = queries.create_task(conn, p1.id, "T1")
+        t2 = queries.create_task(conn, p2.id, "T2")
+        cats = queries.list_categories(conn)
+        return t1, t2, cats[0], cats[1]
+
+    def _rollups(self, conn):
+        return conn.execute(
+            "SELECT day, project_id, category_id, seconds, entries FROM daily_rollups "
+            "ORDER BY day, project_id, category_id"
+        ).fetchall()
+
+    def test_insert_accumulates(self, conn):
+        t1, _, c1, _ = self._setup(conn)
+        queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 11), datetime(2024, 1, 15, 11, 30))
+
+        rows = self._rollups(conn)
+        assert [tuple(r) for r in rows] == [(20240115, t1.project_id, c1.id, 5400, 2)]
+        assert queries.check_daily_rollups(conn) == []
+
+    def test_update_moves_between_keys(self, conn):
+        t1, t2, c1, c2 = self._setup(conn)
+        e = queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        queries.update_time_entry(
+            conn, e.id, task_id=t2.id, category_id=c2.id,
+            start=datetime(2024, 1, 16, 9), end=datetime(2024, 1, 16, 11),
+        )
+
+        rows = self._rollups(conn)
+        assert [tuple(r) for r in rows] == [(20240116, t2.project_id, c2.id, 7200, 1)]
+        assert queries.check_daily_rollups(conn) == []
+
+    def test_delete_removes_empty_rows(self, conn):
+        t1, _, c1, _ = self._setup(conn)
+        e1 = queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        e2 = queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 11), datetime(2024, 1, 15, 12))
+
+        queries.delete_time_entry(conn, e1.id)
+        assert self._rollups(conn)[0]["seconds"] == 3600
+        queries.delete_time_entry(conn, e2.id)
+        assert self._rollups(conn) == []
+
+    def test_check_reports_drift(self, conn):
+        t1, _, c1, _ = self._setup(conn)
+        queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        conn.execute("UPDATE daily_rollups SET seconds = 10")
+        conn.execute(
+            "INSERT INTO daily_rollups VALUES (20240201, ?, ?, 60, 1)", (t1.project_id, c1.id)
+        )
+
+        mismatches = queries.check_daily_rollups(conn)
+        assert mismatches == [
+            (date(2024, 1, 15), t1.project_id, c1.id, 3600, 10),
+            (date(2024, 2, 1), t1.project_id, c1.id, None, 60),
+        ]
+
+    def test_rebuild_restores_consistency(self, conn):
+        t1, t2, c1, c2 = self._setup(conn)
+        queries.create_time_entry(conn, t1.id, c1.id, datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 10))
+        queries.create_time_entry(conn, t2.id, c2.id, datetime(2024, 1, 16, 9), datetime(2024, 1, 16, 10))
+        conn.execute("DELETE FROM daily_rollups")
+
+        assert queries.rebuild_daily_rollups(conn) == 2
+        assert queries.check_daily_rollups(conn) == []
+
+
 # ---------------------------------------------------------------------------
 # Active Session
 # ---------------------------------------------------------------------------
@@ -334,7 +561,7 @@ class TestActiveSession:
         p = queries.create_project(conn, "SP")
         t = queries.create_task(conn, p.id, "ST")
         c = queries.list_categories(conn)[0]
-        session = queries.set_active_session(conn, t.id, c.id, "2024-01-15 09:00:00")
+        session = queries.set_active_session(conn, t.id, c.id, datetime(2024, 1, 15, 9))
         assert session.id == 1
 
         fetched = queries.get_active_session(conn)
@@ -347,8 +574,8 @@ class TestActiveSession:
         t2 = queries.create_task(conn, p.id, "ST2")
         c = queries.list_categories(conn)[0]
 
-        queries.set_active_session(conn, t1.id, c.id, "2024-01-15 09:00:00")
-        queries.set_active_session(conn, t2.id, c.id, "2024-01-15 10:00:00")
+        queries.set_active_session(conn, t1.id, c.id, datetime(2024, 1, 15, 9))
+        queries.set_active_session(conn, t2.id, c.id, datetime(2024, 1, 15, 10))
 
         session = queries.get_active_session(conn)
         assert session.task_id == t2.id
@@ -357,6 +584,21 @@ class TestActiveSession:
         p = queries.create_project(conn, "SP3")
         t = queries.create_task(conn, p.id, "ST3")
         c = queries.list_categories(conn)[0]
-        queries.set_active_session(conn, t.id, c.id, "2024-01-15 09:00:00")
+        queries.set_active_session(conn, t.id, c.id, datetime(2024, 1, 15, 9))
         queries.clear_active_session(conn)
         assert queries.get_active_session(conn) is None
+
+    def test_active_session_detail(self, conn):
+        p = queries.create_project(conn, "DetailP")
+        t = queries.create_task(conn, p.id, "DetailT")
+        c = queries.create_category(conn, "DetailC")
+        queries.set_active_session(conn, t.id, c.id, datetime(2024, 1, 15, 9))
+
+        detail = queries.get_active_session_detail(conn)
+        assert detail.project_name == "DetailP"
+        assert detail.task_name == "DetailT"
+        assert detail.category_name == "DetailC"
+        assert detail.start_time == datetime(2024, 1, 15, 9)
+
+    def test_active_session_detail_none(self, conn):
+        assert queries.get_active_session_detail(conn) is None
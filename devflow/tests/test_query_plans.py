@@ -0,0 +1,91 @@
+"""EXPLAIN QUERY PLAN guards: reporting queries must not full-scan big tables.
+
+Each reporting query is executed once with a trace callback to capture the
+exact SQL and bound parameters, then re-run under ``EXPLAIN QUERY PLAN``.
+Full scans are only tolerated on the small dimension tables.
+"""
+
+import inspect
+import re
+from datetime import date, datetime
+
+import pytest
+
+from devflow.db import queries
+
+# Dimension tables (and the aliases queries.py gives them) that stay small.
+_SCANNABLE = {"projects", "p", "tasks", "t", "categories", "c", "active_session", "s"}
+
+_DAY = date(2024, 1, 15)
+_WEEK = (date(2024, 1, 15), date(2024, 1, 22))
+
+REPORTING_QUERIES = {
+    "list_time_entries_for_date": (_DAY,),
+    "list_time_entry_details_for_date": (_DAY,),
+    "list_time_entries_for_range": (datetime(2024, 1, 15), datetime(2024, 1, 22)),
+    "list_time_entry_columns_for_range": (datetime(2024, 1, 15), datetime(2024, 1, 22)),
+    "iter_time_entries_for_export": (datetime(2024, 1, 15), datetime(2024, 1, 22)),
+    "iter_time_entries_for_calendar": (datetime(2024, 1, 15), datetime(2024, 1, 22)),
+    "daily_totals_by_project": (_DAY,),
+    "daily_totals_by_category": (_DAY,),
+    "weekly_totals_by_day": _WEEK,
+    "weekly_totals_by_project": _WEEK,
+    "weekly_totals_by_category": _WEEK,
+}
+
+
+def _captured_sql(conn, fn, args):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        fn(conn, *args)
+    finally:
+        conn.set_trace_callback(None)
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def _full_scans(conn, sql):
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    scans = []
+    for row in plan:
+        match = re.match(r"SCAN (\w+)", row["detail"])
+        if match and match.group(1) not in _SCANNABLE:
+            scans.append(row["detail"])
+    return scans
+
+
+def test_every_reporting_query_is_covered():
+    """New list_/iter_/daily_/weekly_ queries over time_entries must be added above."""
+    reporting = {
+        name
+        for name, fn in inspect.getmembers(queries, inspect.isfunction)
+        if fn.__module__ == queries.__name__
+        and name.startswith(("list_time_entr", "iter_time_entr", "daily_", "weekly_"))
+    }
+    assert reporting == set(REPORTING_QUERIES)
+
+
+@pytest.mark.parametrize("name", sorted(REPORTING_QUERIES))
+def test_reporting_query_uses_index(conn, name):
+    statements = _captured_sql(conn, getattr(queries, name), REPORTING_QUERIES[name])
+    assert statements, f"{name} ran no SELECT"
+    for sql in statements:
+        assert _full_scans(conn, sql) == [], sql
+
+
+def test_incremental_calendar_reads_the_seq_index(conn):
+    statements = _captured_sql(
+        conn,
+        lambda c: queries.iter_time_entries_for_calendar(c, after_seq=10, up_to_seq=20),
+        (),
+    )
+    (sql,) = statements
+    assert _full_scans(conn, sql) == [], sql
+    plan = " ".join(row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+    assert "idx_time_entry_changes_seq" in plan
+
+
+def test_date_function_predicate_is_detected(conn):
+    """Sanity check: a function of the indexed column is flagged as a scan."""
+    sql = "SELECT id FROM time_entries WHERE date(start_ts, 'unixepoch') = '2024-01-15'"
+    assert _full_scans(conn, sql)
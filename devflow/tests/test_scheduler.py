@@ -0,0 +1,141 @@
+"""Tests for the one-shot midnight scheduler."""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from devflow.timer.scheduler import MidnightScheduler, seconds_until_midnight
+
+
+class FakeTimers:
+    """Stands in for Widget.set_timer, keeping the armed timers."""
+
+    def __init__(self):
+        self.armed = []
+
+    def __call__(self, delay, callback):
+        timer = FakeTimer(delay, callback)
+        self.armed.append(timer)
+        return timer
+
+    @property
+    def live(self):
+        return [t for t in self.armed if not t.stopped]
+
+
+class FakeTimer:
+    def __init__(self, delay, callback):
+        self.delay = delay
+        self.callback = callback
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def berlin():
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    old = os.environ.get("TZ")
+    os.environ["TZ"] = "Europe/Berlin"
+    time.tzset()
+    yield
+    if old is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = old
+    time.tzset()
+
+
+def test_seconds_until_midnight():
+    assert seconds_until_midnight(datetime(2024, 1, 15, 23, 59, 30)) == 30
+    assert seconds_until_midnight(datetime(2024, 1, 15, 0, 0, 0)) == 86400
+
+
+def test_dst_days_are_not_24_hours(berlin):
+    # Clocks go forward on 2024-03-31 and back on 2024-10-27.
+    assert seconds_until_midnight(datetime(2024, 3, 31, 0, 0, 0)) == 23 * 3600
+    assert seconds_until_midnight(datetime(2024, 10, 27, 0, 0, 0)) == 25 * 3600
+
+
+def test_arms_one_timer_and_rearms_after_firing():
+    now = [datetime(2024, 1, 15, 23, 0, 0)]
+    timers = FakeTimers()
+    fired = []
+    sched = MidnightScheduler(timers, lambda: fired.append(now[0]), clock=lambda: now[0])
+
+    sched.start()
+    assert [t.delay for t in timers.live] == [3600]
+
+    now[0] = datetime(2024, 1, 16, 0, 0, 0)
+    timers.live[0].callback()
+
+    assert fired == [datetime(2024, 1, 16, 0, 0, 0)]
+    assert [t.delay for t in timers.live] == [86400]
+
+
+def test_rearms_even_if_the_split_fails():
+    timers = FakeTimers()
+
+    def boom():
+        raise RuntimeError("locked")
+
+    sched = MidnightScheduler(timers, boom, clock=lambda: datetime(2024, 1, 16, 0, 0, 0))
+    sched.start()
+    with pytest.raises(RuntimeError):
+        timers.live[0].callback()
+    assert len(timers.live) == 1
+
+
+def test_check_clock_fires_after_suspend():
+    now = [datetime(2024, 1, 15, 22, 0, 0)]
+    timers = FakeTimers()
+    fired = []
+    sched = MidnightScheduler(timers, lambda: fired.append(now[0]), clock=lambda: now[0])
+    sched.start()
+
+    sched.check_clock()
+    assert fired == []
+
+    # Monotonic time barely moves while suspended; the wall clock does.
+    now[0] += timedelta(hours=9)
+    sched.check_clock()
+
+    assert fired == [datetime(2024, 1, 16, 7, 0, 0)]
+    assert [t.delay for t in timers.live] == [17 * 3600]
+    sched.check_clock()
+    assert len(fired) == 1
+
+
+def test_check_clock_resyncs_on_a_same_day_resume():
+    now = [datetime(2024, 1, 15, 9, 0, 0)]
+    timers = FakeTimers()
+    calls = []
+    sched = MidnightScheduler(
+        timers,
+        lambda: calls.append("midnight"),
+        on_clock_jump=lambda: calls.append("jump"),
+        clock=lambda: now[0],
+    )
+    sched.start()
+
+    now[0] += timedelta(hours=1)
+    sched.check_clock()
+    assert calls == ["jump", "midnight"]
+
+    # An ordinary midnight is no clock jump.
+    now[0] = datetime(2024, 1, 16, 0, 0, 0)
+    timers.live[0].callback()
+    assert calls == ["jump", "midnight", "midnight"]
+
+
+def test_stop_disarms():
+    timers = FakeTimers()
+    sched = MidnightScheduler(timers, lambda: None)
+    sched.start()
+    sched.stop()
+    sched.check_clock()
+    assert timers.live == []
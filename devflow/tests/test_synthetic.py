@@ -0,0 +1,135 @@
+"""Tests for the synthetic history generator."""
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from devflow.db import queries
+from devflow.db.connection import get_memory_connection
+from devflow.db.timestamps import from_day_key, from_epoch
+from devflow.synthetic import SyntheticConfig, generate_history
+
+END = date(2024, 3, 10)  # a Sunday
+
+
+def _config(**overrides):
+    values = dict(days=14, end=END, projects=3, tasks_per_project=4, entries_per_day=6)
+    values.update(overrides)
+    return SyntheticConfig(**values)
+
+
+def _entries(conn):
+    return conn.execute(
+        "SELECT id, task_id, category_id, start_ts, end_ts, day FROM time_entries ORDER BY id"
+    ).fetchall()
+
+
+def _generate(config):
+    conn = get_memory_connection()
+    try:
+        generate_history(conn, config)
+        return [tuple(row) for row in _entries(conn)]
+    finally:
+        conn.close()
+
+
+def test_counts(conn):
+    summary = generate_history(conn, _config(midnight_ratio=0.0))
+
+    # 14 days ending on a Sunday: two weekends skipped.
+    assert summary.entries == 10 * 6
+    assert summary.projects == 3
+    assert summary.tasks == 12
+    assert conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0] == 60
+    assert conn.execute(
+        "SELECT COUNT(*) FROM projects WHERE name LIKE 'Synthetic%'"
+    ).fetchone()[0] == 3
+
+
+def test_weekends(conn):
+    summary = generate_history(conn, _config(weekends=True, midnight_ratio=0.0))
+    assert summary.entries == 14 * 6
+
+
+def test_seed_is_deterministic():
+    assert _generate(_config(seed=7)) == _generate(_config(seed=7))
+    assert _generate(_config(seed=7)) != _generate(_config(seed=8))
+
+
+def test_entries_are_well_formed(conn):
+    generate_history(conn, _config(days=60, entries_per_day=30))
+
+    previous_end = 0
+    for row in _entries(conn):
+        start, end = from_epoch(row["start_ts"]), from_epoch(row["end_ts"])
+        assert start.date() == end.date() == from_day_key(row["day"])
+        assert row["start_ts"] < row["end_ts"]
+        assert row["start_ts"] >= previous_end  # chronological, no overlaps
+        previous_end = row["end_ts"]
+    assert queries.check_daily_rollups(conn) == []
+
+
+def test_midnight_sessions_are_split(conn):
+    generate_history(conn, _config(midnight_ratio=1.0, weekends=True))
+
+    rows = _entries(conn)
+    late = [row for row in rows if from_epoch(row["end_ts"]).time() == time(23, 59, 59)]
+    # Every day but the last spills over into the next one.
+    assert len(late) == 13
+    by_id = {row["id"]: row for row in rows}
+    for row in late:
+        follow = by_id[row["id"] + 1]
+        next_day = from_day_key(row["day"]) + timedelta(days=1)
+        assert from_epoch(follow["start_ts"]) == datetime.combine(next_day, time.min)
+        assert from_day_key(follow["day"]) == next_day
+        assert (follow["task_id"], follow["category_id"]) == (
+            row["task_id"],
+            row["category_id"],
+        )
+
+
+def test_days_the_clocks_change_keep_local_times(conn, new_york):
+    # 2024-03-10 is 23 hours long in New York, 2024-11-03 is 25; both end
+    # with a session split at midnight.
+    for end in (date(2024, 3, 11), date(2024, 11, 4)):
+        generate_history(conn, _config(end=end, days=2, weekends=True, midnight_ratio=1.0))
+    late = 0
+    for row in _entries(conn):
+        start, end = from_epoch(row["start_ts"]), from_epoch(row["end_ts"])
+        assert start.date() == end.date() == from_day_key(row["day"])
+        late += end.time() == time(23, 59, 59)
+    assert late == 2
+    assert queries.check_daily_rollups(conn) == []
+
+
+def test_archive_ratio(conn):
+    generate_history(conn, _config(projects=8, tasks_per_project=5, archive_ratio=0.25))
+
+    archived_projects = conn.execute(
+        "SELECT COUNT(*) FROM projects WHERE name LIKE 'Synthetic%' AND archived_at IS NOT NULL"
+    ).fetchone()[0]
+    archived_tasks = conn.execute(
+        "SELECT COUNT(*) FROM tasks WHERE archived_at IS NOT NULL"
+    ).fetchone()[0]
+    assert archived_projects == 2
+    assert archived_tasks == 10
+
+
+def test_appends_to_existing_data(conn):
+    project = queries.create_project(conn, "Existing")
+    queries.create_task(conn, project.id, "Existing task")
+
+    generate_history(conn, _config())
+    generate_history(conn, _config())
+
+    assert queries.get_project(conn, project.id).name == "Existing"
+    assert queries.check_daily_rollups(conn) == []
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{"days": 0}, {"projects": 0}, {"entries_per_day": 0}, {"archive_ratio": 1.5}],
+)
+def test_rejects_invalid_config(conn, overrides):
+    with pytest.raises(ValueError):
+        generate_history(conn, _config(**overrides))
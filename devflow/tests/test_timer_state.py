@@ -0,0 +1,96 @@
+"""Tests for the in-process timer state used by the live display."""
+
+import time as time_module
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+from devflow.db import queries
+from devflow.timer import engine
+from devflow.timer.state import TimerState
+
+
+def _setup(conn):
+    p = queries.create_project(conn, "StateP")
+    t = queries.create_task(conn, p.id, "StateT")
+    c = queries.create_category(conn, "StateC")
+    return t.id, c.id
+
+
+def test_load_no_session(conn):
+    state = TimerState()
+    state.load(conn)
+    assert not state.running
+    assert state.elapsed_seconds() == 0
+    assert state.label() == ""
+
+
+def test_load_resolves_names_and_elapsed(conn):
+    tid, cid = _setup(conn)
+    queries.set_active_session(conn, tid, cid, datetime.now() - timedelta(minutes=5))
+
+    state = TimerState()
+    state.load(conn)
+    assert state.running
+    assert state.label() == "StateP | StateT | StateC"
+    assert 299 <= state.elapsed_seconds() <= 302
+
+
+def test_elapsed_needs_no_queries(conn):
+    tid, cid = _setup(conn)
+    started = datetime.now().replace(microsecond=0)
+    queries.set_active_session(conn, tid, cid, started)
+    state = TimerState()
+    state.load(conn)
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    with patch("devflow.timer.state.time.time", return_value=started.timestamp() + 90):
+        assert state.elapsed_seconds() == 90
+        state.label()
+    assert statements == []
+
+
+def test_elapsed_counts_time_spent_suspended(conn):
+    tid, cid = _setup(conn)
+    started = datetime.now().replace(microsecond=0)
+    queries.set_active_session(conn, tid, cid, started)
+    state = TimerState()
+    state.load(conn)
+
+    # An hour asleep: the wall clock moves on, the monotonic clock does not.
+    frozen = time_module.monotonic()
+    with patch("devflow.timer.state.time.monotonic", return_value=frozen), patch(
+        "devflow.timer.state.time.time", return_value=started.timestamp() + 3600
+    ):
+        assert state.elapsed_seconds() == 3600
+
+
+def test_elapsed_is_never_negative(conn):
+    tid, cid = _setup(conn)
+    queries.set_active_session(conn, tid, cid, datetime.now() + timedelta(minutes=5))
+    state = TimerState()
+    state.load(conn)
+    assert state.elapsed_seconds() == 0
+
+
+def test_engine_keeps_state_current(conn):
+    tid, cid = _setup(conn)
+    state = TimerState()
+
+    engine.start_timer(conn, tid, cid, state=state)
+    assert state.running
+    assert state.session.task_id == tid
+
+    engine.stop_timer(conn, state=state)
+    assert not state.running
+
+
+def test_midnight_split_reanchors_state(conn):
+    tid, cid = _setup(conn)
+    yesterday = datetime.combine(date.today() - timedelta(days=1), time(23, 0, 0))
+    queries.set_active_session(conn, tid, cid, yesterday)
+    state = TimerState()
+    state.load(conn)
+
+    engine.check_midnight_split(conn, state=state)
+    assert state.session.start_time == datetime.combine(date.today(), time.min)
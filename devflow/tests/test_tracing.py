@@ -0,0 +1,133 @@
+"""Tests for opt-in SQL tracing and the slow-query log."""
+
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+
+from devflow.db import queries, tracing
+from devflow.db.connection import get_connection
+
+
+@pytest.fixture
+def traced(tmp_path, monkeypatch):
+    """A file database opened with tracing on and a fresh tracer."""
+    monkeypatch.setenv(tracing.TRACE_ENV_VAR, "1")
+    monkeypatch.setenv(tracing.SLOW_LOG_ENV_VAR, str(tmp_path / "slow.log"))
+    monkeypatch.setenv(tracing.SLOW_MS_ENV_VAR, "1000")
+    tracing.reset_tracer()
+    conn = get_connection(tmp_path / "devflow.db")
+    yield conn
+    conn.close()
+    tracing.reset_tracer()
+
+
+def _stats(caller):
+    return {
+        key[1]: stats for key, stats in tracing.get_tracer().stats.items()
+    }[f"db.queries.{caller}"]
+
+
+def test_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv(tracing.TRACE_ENV_VAR, raising=False)
+    conn = get_connection(tmp_path / "devflow.db")
+    assert type(conn) is sqlite3.Connection
+    conn.close()
+
+
+def test_records_count_rows_and_caller(traced):
+    assert isinstance(traced, tracing.TracingConnection)
+    projects = queries.list_projects(traced)
+    for p in projects:
+        queries.get_project(traced, p.id)
+
+    assert _stats("list_projects").count == 1
+    assert _stats("list_projects").rows == len(projects)
+    # The N+1 shows up as one statement per project.
+    assert _stats("get_project").count == len(projects)
+    assert _stats("get_project").rows == len(projects)
+
+
+def test_iteration_and_dml_rows(traced):
+    p = queries.create_project(traced, "Traced")
+    t = queries.create_task(traced, p.id, "T")
+    c = queries.list_categories(traced)[0]
+    queries.create_time_entries(
+        traced,
+        [
+            queries.new_time_entry(t.id, c.id, datetime(2024, 1, 15, h), datetime(2024, 1, 15, h, 30))
+            for h in range(5)
+        ],
+    )
+    rows = list(traced.execute("SELECT id FROM time_entries"))
+
+    assert len(rows) == 5
+    assert _stats("create_time_entries").rows >= 5
+    # Called from outside devflow, so no caller or screen is attributed.
+    assert tracing.get_tracer().stats[("<no screen>", "<unknown>")].rows == 5
+
+
+def test_slow_queries_are_logged(traced, tmp_path):
+    tracer = tracing.get_tracer()
+    tracer.slow_ms = 0.0
+
+    queries.get_project(traced, 1)
+
+    log = (tmp_path / "slow.log").read_text()
+    assert "db.queries.get_project" in log
+    # Bound values come from set_trace_callback's expanded SQL.
+    assert "WHERE id = 1" in log
+    assert tracer.slow_count >= 1
+
+
+def test_summary_groups_by_screen():
+    tracer = tracing.SqlTracer(slow_ms=1000)
+    tracer.record(tracing._Statement("SELECT 1", "db.queries.get_task", "daily", elapsed_ms=1.0))
+    tracer.record(tracing._Statement("SELECT 1", "db.queries.get_task", "daily", elapsed_ms=1.0))
+    tracer.record(tracing._Statement("SELECT 2", "db.queries.list_projects", "timer", rows=4))
+
+    lines = tracer.summary().splitlines()
+
+    assert lines[0].startswith("SQL trace: 3 statements, 2.0 ms")
+    daily = next(i for i, line in enumerate(lines) if line.startswith("daily"))
+    assert lines[daily].split()[1] == "2"
+    assert lines[daily + 1].split() == ["db.queries.get_task", "2", "0", "2.0"]
+    assert daily < next(i for i, line in enumerate(lines) if line.startswith("timer"))
+
+
+def test_records_from_worker_threads_are_serialized():
+    tracer = tracing.SqlTracer(slow_ms=1000)
+    statement = tracing._Statement("SELECT 1", "db.queries.list_tasks", "timer", elapsed_ms=1.0)
+
+    with tracer._lock:
+        thread = threading.Thread(target=tracer.record, args=(statement,))
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive() and tracer.stats == {}
+    thread.join()
+
+    assert tracer.stats[("timer", "db.queries.list_tasks")].count == 1
+
+
+def test_worker_jobs_are_charged_to_the_submitting_screen(traced, tmp_path):
+    from devflow.db.connection import ConnectionPool
+    from devflow.db.worker import DatabaseWorker
+
+    worker = DatabaseWorker(ConnectionPool(tmp_path / "devflow.db", size=2))
+    # Runs as though from a screen module, as TimerScreen._load_tasks does.
+    namespace = {"__name__": "devflow.screens.timer", "queries": queries, "worker": worker}
+    exec(
+        "async def load(project_id):\n"
+        "    return await worker.run(queries.list_tasks, project_id)\n",
+        namespace,
+    )
+    try:
+        asyncio.run(namespace["load"](1))
+    finally:
+        worker.close()
+        worker.pool.close()
+
+    assert ("timer", "db.queries.list_tasks") in tracing.get_tracer().stats
+
@@ -0,0 +1,192 @@
+"""Tests for the background database worker and its read pool."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from devflow.db import queries
+from devflow.db.connection import ConnectionPool, get_connection
+from devflow.db.worker import DatabaseWorker
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """An initialized database file; pooled connections are read-only."""
+    path = tmp_path / "devflow.db"
+    get_connection(path).close()
+    return path
+
+
+def _worker(path, size=1):
+    return DatabaseWorker(ConnectionPool(path, size=size))
+
+
+def test_runs_queries_on_its_own_thread(db_path):
+    worker = _worker(db_path)
+    threads = []
+
+    def fetch(conn, name):
+        threads.append(threading.get_ident())
+        return [p.name for p in queries.list_projects(conn) if p.name == name]
+
+    async def main():
+        return await worker.run(fetch, "Platform")
+
+    try:
+        assert asyncio.run(main()) == ["Platform"]
+    finally:
+        worker.close()
+        worker.pool.close()
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_sees_writes_committed_on_the_writer(db_path):
+    conn = get_connection(db_path)
+    worker = _worker(db_path)
+
+    async def main():
+        queries.create_project(conn, "Written on the UI connection")
+        return await worker.run(queries.list_projects)
+
+    try:
+        names = [p.name for p in asyncio.run(main())]
+    finally:
+        worker.close()
+        worker.pool.close()
+        conn.close()
+    assert "Written on the UI connection" in names
+
+
+def test_slow_job_does_not_block_the_event_loop(db_path):
+    worker = _worker(db_path)
+
+    def slow(conn):
+        time.sleep(0.2)
+        return conn.execute("SELECT 1").fetchone()[0]
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await worker.run(slow)
+        task.cancel()
+        return result, ticks
+
+    try:
+        result, ticks = asyncio.run(main())
+    finally:
+        worker.close()
+        worker.pool.close()
+    assert result == 1
+    assert ticks >= 5
+
+
+def test_cancelled_jobs_never_run(db_path):
+    worker = _worker(db_path)
+    started = threading.Event()
+    release = threading.Event()
+    ran = []
+
+    def blocker(conn):
+        started.set()
+        release.wait(5)
+
+    def job(conn, day):
+        ran.append(day)
+        return day
+
+    async def main():
+        first = asyncio.ensure_future(worker.run(blocker))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        # h-h-h: each new day supersedes the previous, still-queued one.
+        stale = [asyncio.ensure_future(worker.run(job, day)) for day in ("14", "13")]
+        latest = asyncio.ensure_future(worker.run(job, "12"))
+        await asyncio.sleep(0)
+        for task in stale:
+            task.cancel()
+        await asyncio.gather(*stale, return_exceptions=True)
+        release.set()
+        await first
+        return await latest
+
+    try:
+        assert asyncio.run(main()) == "12"
+    finally:
+        worker.close()
+        worker.pool.close()
+    assert ran == ["12"]
+
+
+def test_readers_run_concurrently_with_a_writer(db_path):
+    writer = get_connection(db_path)
+    worker = _worker(db_path, size=2)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO projects (name) VALUES ('Uncommitted')")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def report(conn):
+        barrier.wait()  # both readers are inside a checkout at once
+        return [p.name for p in queries.list_projects(conn)]
+
+    async def main():
+        return await asyncio.gather(worker.run(report), worker.run(report))
+
+    try:
+        first, second = asyncio.run(main())
+    finally:
+        writer.rollback()
+        worker.close()
+        worker.pool.close()
+        writer.close()
+    assert first == second
+    assert "Uncommitted" not in first
+
+
+def test_pooled_connections_are_read_only(db_path):
+    import sqlite3
+
+    pool = ConnectionPool(db_path)
+    with pool.checkout() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO projects (name) VALUES ('Nope')")
+    pool.close()
+
+
+def test_pool_reuses_connections_and_records_waits(db_path):
+    pool = ConnectionPool(db_path, size=1)
+    with pool.checkout() as first:
+        pass
+    with pool.checkout() as second:
+        assert second is first
+
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.checkout():
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait(5)
+    with pytest.raises(TimeoutError):
+        with pool.checkout(timeout=0.01):
+            pass
+    threading.Timer(0.05, release.set).start()
+    with pool.checkout(timeout=5):
+        pass
+    thread.join()
+    pool.close()
+
+    assert pool.stats.checkouts == 4
+    assert pool.stats.waits == 1
+    assert pool.stats.max_wait_ms >= 40